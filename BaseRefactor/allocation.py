@@ -0,0 +1,165 @@
+import numpy as np
+
+
+def linear_assignment(cost):
+    """
+    Solve the rectangular linear assignment problem with the Hungarian method.
+
+    Uses the shortest-augmenting-path formulation with row and column potentials,
+    O(n^2 m) for an n x m matrix with n <= m, with the inner loop over columns
+    vectorized.
+
+    Args:
+        cost (array-like): A (n, m) matrix of finite costs.
+
+    Returns:
+        tuple: Arrays (rows, cols) of the assigned pairs, sorted by row, minimising the
+            total cost. min(n, m) pairs are returned.
+    """
+    cost = np.asarray(cost, dtype=float)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty
+
+    # 1-based as in the textbook formulation; column 0 is a virtual start column
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    owner = np.zeros(m + 1, dtype=np.intp)  # row assigned to each column, 0 if none
+    way = np.zeros(m + 1, dtype=np.intp)
+    for i in range(1, n + 1):
+        owner[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = owner[j0]
+            free = ~used
+            free[0] = False
+            reduced = cost[i0 - 1] - u[i0] - v[1:]
+            better = free[1:] & (reduced < minv[1:])
+            minv[1:][better] = reduced[better]
+            way[1:][better] = j0
+            candidates = np.where(free, minv, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+            u[owner[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if owner[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            owner[j0] = owner[j1]
+            j0 = j1
+
+    cols = np.flatnonzero(owner[1:])
+    rows = owner[1:][cols] - 1
+    if transposed:
+        rows, cols = cols, rows
+    order = np.argsort(rows)
+    return rows[order], cols[order]
+
+
+class TaskAllocator:
+    """Assigns dirty cells to the idle bots of a fleet so they do not chase the same cell.
+
+    Each round, every idle bot with enough battery is a row and every unclaimed dirty
+    cell is a column of a cost matrix: the path distance to the cell minus
+    `allocation_dirt_weight` moves per piece of dirt it holds. As in the per-bot rule,
+    a bot whose own cell holds more than `dirt_threshold` pieces prefers to stay. The
+    assignment minimising the total cost becomes the bots' targets, and each assigned
+    cell is claimed until its bot drops it as its target, i.e. once the cell is empty or
+    its remaining dirt proved unreachable. Cells a bot gave up on are not assigned to it again.
+    Bots of the baseline `a_star` strategy drop their target after every pickup, so the
+    claims pay off with `chase` bots, which keep a target until its cell is empty.
+    """
+
+    def __init__(self, dirt_field, planner, config, candidates_per_bot=4):
+        """
+        Args:
+            dirt_field (DirtField): The dirt still to be collected.
+            planner (Planner): Planner supplying path distances.
+            config (RuntimeConfig): Settings of the run.
+            candidates_per_bot (int): Only the dirtiest `candidates_per_bot * bots`
+                cells (at least 32) enter the cost matrix.
+        """
+        self.dirt_field = dirt_field
+        self.planner = planner
+        self.config = config
+        self.candidates_per_bot = candidates_per_bot
+        self.claims = {}  # bot index -> claimed (col, row)
+        self.rounds = 0
+
+    def release(self, bots):
+        """
+        Drop the claims of bots that no longer head for their claimed cell.
+
+        Args:
+            bots (list): The bots of the fleet.
+        """
+        for index, cell in list(self.claims.items()):
+            if bots[index].a_star_target != cell:
+                del self.claims[index]
+
+    def assign(self, bots):
+        """
+        Give every idle bot a target cell.
+
+        Args:
+            bots (list): The bots of the fleet, indexed like the fleet arrays.
+
+        Returns:
+            int: Number of bots that received a target.
+        """
+        self.release(bots)
+        idle = [bot for bot in bots
+                if bot.a_star_target is None and bot.battery >= self.config.low_battery]
+        if not idle:
+            return 0
+        cols, rows, counts = self.dirt_field.cell_counts.nonzero()
+        if self.claims:
+            claimed = set(self.claims.values())
+            free = np.array([cell not in claimed for cell in zip(cols.tolist(), rows.tolist())],
+                            dtype=bool)
+            cols, rows, counts = cols[free], rows[free], counts[free]
+        if len(cols) == 0:
+            return 0
+        limit = max(32, self.candidates_per_bot * len(idle))
+        if len(cols) > limit:
+            top = np.argpartition(-counts, limit - 1)[:limit]
+            cols, rows, counts = cols[top], rows[top], counts[top]
+        values = counts.astype(float)
+
+        cell_size = self.config.cell_size
+        weight = self.config.allocation_dirt_weight
+        stay = values > self.config.dirt_threshold
+        cost = np.empty((len(idle), len(cols)))
+        for i, bot in enumerate(idle):
+            start = (int(bot.x // cell_size), int(bot.y // cell_size))
+            distances = self.planner.distances_to(start, cols, rows)
+            # unreachable cells get a cost no reachable cell can exceed
+            distances = np.where(np.isfinite(distances), distances, 1e6)
+            cost[i] = distances - weight * values
+            cost[i, stay & (cols == start[0]) & (rows == start[1])] -= 1e6
+            if bot.a_star_done:
+                cost[i, [cell in bot.a_star_done for cell in zip(cols.tolist(), rows.tolist())]] += 1e6
+
+        self.rounds += 1
+        bot_rows, cell_cols = linear_assignment(cost)
+        assigned = 0
+        for i, j in zip(bot_rows, cell_cols):
+            bot = idle[i]
+            cell = (int(cols[j]), int(rows[j]))
+            if cell in bot.a_star_done:
+                continue  # only cells this bot gave up on were left for it
+            bot.a_star_target = cell
+            bot.a_star_path.clear()
+            self.claims[bot.index] = cell
+            assigned += 1
+        return assigned
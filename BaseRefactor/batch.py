@@ -0,0 +1,110 @@
+import csv
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+from simulation import Simulation
+
+
+@dataclass
+class RunResult:
+    """Outcome of one headless simulation run."""
+
+    run: int
+    seed: int
+    moves: int
+    dirt_collected: int
+    milestones: dict = field(default_factory=dict)  # move -> dirt collected by then
+    metrics: dict = field(default_factory=dict)  # series name -> sampled values
+    duration: float = 0.0  # wall-clock seconds
+
+
+def run_one(run, seed, config=None, moves_max=None, path_table_dir=None):
+    """
+    Run one headless simulation to completion.
+
+    Args:
+        run (int): Number of the run, copied into the result.
+        seed (int): Seed of the run; the same seed reproduces the same world and run.
+        config (RuntimeConfig, optional): Settings of the run. Defaults to the built-in ones.
+        moves_max (int, optional): Move budget. Defaults to `config.bot_moves_max`.
+        path_table_dir (str, optional): Directory of precomputed shortest-path tables.
+
+    Returns:
+        RunResult: The collection totals of the run.
+    """
+    start = time.perf_counter()
+    simulation = Simulation(config, moves_max=moves_max, path_table_dir=path_table_dir, seed=seed)
+    counter = simulation.run()
+    return RunResult(
+        run=run,
+        seed=seed,
+        moves=simulation.moves,
+        dirt_collected=counter.dirt_collected,
+        milestones=simulation.milestones(),
+        metrics=simulation.metrics.as_dict(),
+        duration=time.perf_counter() - start,
+    )
+
+
+def run_batch(runs, workers=None, config=None, moves_max=None, path_table_dir=None, seed=None,
+              progress=True):
+    """
+    Run many headless simulations in parallel worker processes.
+
+    Args:
+        runs (int): Number of runs.
+        workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        config (RuntimeConfig, optional): Settings shared by every run.
+        moves_max (int, optional): Move budget of every run.
+        path_table_dir (str, optional): Directory of precomputed shortest-path tables.
+        seed (int, optional): Base seed; run i uses `seed + i - 1`. Drawn at random if None.
+            Batches with the same base seed see the same sequence of worlds, so
+            strategies can be compared run by run.
+        progress (bool): Print a line as each run finishes.
+
+    Returns:
+        list: One `RunResult` per run, ordered by run number.
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_one, i + 1, seed + i, config, moves_max, path_table_dir)
+                   for i in range(runs)]
+        for future in futures:
+            result = future.result()
+            results.append(result)
+            if progress:
+                print(f"Run {result.run}/{runs}: collected {result.dirt_collected} dirt "
+                      f"in {result.duration:.2f}s")
+    return results
+
+
+def write_csv(results, path, milestones=None):
+    """
+    Write batch results to a CSV file, one row per run.
+
+    The columns are Run, Seed, Total Dirt Collected and one "Dirt at N moves"
+    column per milestone. The Seed column came in with process-pool batches, so
+    readers that index columns by position must skip it.
+
+    Args:
+        results (list): `RunResult` objects.
+        path (str): Output file; parent directories are created as needed.
+        milestones (list, optional): Milestone columns to write. Defaults to every
+            milestone recorded by any run. Missing values are written as -1.
+    """
+    if milestones is None:
+        milestones = sorted({m for result in results for m in result.milestones})
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, mode='w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Run", "Seed", "Total Dirt Collected"] + [f"Dirt at {m} moves" for m in milestones])
+        for result in results:
+            writer.writerow([result.run, result.seed, result.dirt_collected] +
+                            [result.milestones.get(m, -1) for m in milestones])
@@ -1,60 +1,116 @@
 import math
 import random
-from typing import Tuple
 
-import numpy as np
-import heapq
-
-from BaseRefactor.strategy import Strategy
+from strategy import DirtChase, Strategy
 from canvas_object import CanvasObject
 from charger import Charger
-from config import Config
-from dirt import Dirt
+from config import RuntimeConfig
 from cat import Cat
+from fleetmap import BitGrid
+from kinematics import Fleet, positions_of
+from obstacles import ObstacleMap
+
+
+def _fleet_field(field, cast):
+    """Expose this bot's element of a `Fleet` array as a read/write attribute."""
+    def getter(self):
+        return cast(getattr(self.fleet, field)[self.index])
+
+    def setter(self, value):
+        getattr(self.fleet, field)[self.index] = value
+
+    return property(getter, setter)
 
 
 class Bot(CanvasObject):
-    def __init__(self, name, canvas_p, dirt_list):
+    x = _fleet_field("x", float)
+    y = _fleet_field("y", float)
+    theta = _fleet_field("theta", float)
+    vl = _fleet_field("vl", float)
+    vr = _fleet_field("vr", float)
+    ll = _fleet_field("ll", float)
+    battery = _fleet_field("battery", int)
+    is_turning = _fleet_field("is_turning", bool)
+    boundary_turn_count = _fleet_field("boundary_turn_count", int)
+    boundary_buffer = _fleet_field("boundary_buffer", float)
+
+    def __init__(self, name, dirt_list, fleet=None, planner=None, rng=random, strategy_rng=None,
+                 config=None):
         """
-        Initialize the robot with its name, canvas, and list of dirt positions.
+        Initialize the robot with its name and list of dirt positions.
+
+        The robot's pose, wheel speeds and turn state live in a `Fleet`, so that all
+        robots of a simulation can be integrated together.
 
         Args:
             name (str): The name of the robot.
-            canvas_p: The canvas object for drawing or visualization.
             dirt_list (list): A list of dirt objects or positions the robot should clean.
+            fleet (Fleet, optional): The fleet to join. A private single-bot fleet is created if None.
+            planner (Planner, optional): Path planner shared by the robots of one world.
+            rng: Random number generator for the initial pose and walk. Defaults to the `random` module.
+            strategy_rng: Random number generator for stochastic strategies. Defaults to `rng`.
+            config (RuntimeConfig, optional): Settings of the run. Defaults to those of the fleet.
         """
-        super().__init__()
+        # CanvasObject.__init__ is not called: x and y are fleet-backed properties here.
         self.name = name
-        self.x, self.y = self.generate_random_position()
+        if config is None:
+            config = fleet.config if fleet is not None else RuntimeConfig()
+        self.config = config
+        x, y = self.generate_random_position(self.fleet_obstacles(fleet), rng, config)
         # self.x = random.randint(Config.BOT_X_MIN.value, Config.BOT_X_MAX.value)
         # self.y = random.randint(Config.BOT_Y_MIN.value, Config.BOT_Y_MAX.value)
-        self.canvas = canvas_p
-        self.map = np.zeros((Config.MAP_WIDTH.value, Config.MAP_HEIGHT.value))
-        self.sensor_positions = None
-        self.theta = random.uniform(Config.BOT_THETA_MIN.value, Config.BOT_THETA_MAX.value)
-        self.ll = 60
-        self.vl = 0.0
-        self.vr = 0.0
-        self.battery = Config.BOT_BATTERY_CAPACITY.value
+        theta = rng.uniform(config.bot_theta_min, config.bot_theta_max)
+        self.fleet = Fleet(config=config) if fleet is None else fleet
+        self.index = self.fleet.add(x, y, theta, config.bot_battery_capacity)
+
+        self.canvas_items = None  # canvas item ids, created by the first draw
+        self.drawn_battery = None
 
         self.turning = 0
-        self.moving = random.randrange(50, 100)
+        self.moving = rng.randrange(50, 100)
         self.currently_turning = False
 
-        self.is_turning = False
-        self.boundary_turn_count = 0
-        self.boundary_buffer = 20
-
         self.dirt_list = dirt_list
-        self.strategy = Strategy(dirt_list)  # 初始化策略类
-        self.brain_strategy = self.strategy.a_star_strategy  # 使用策略类的方法
+        self.strategy = Strategy(dirt_list, planner, rng if strategy_rng is None else strategy_rng,
+                                 config)  # 初始化策略类
+        self.brain_strategy = Strategy.by_name(config.strategy)  # 使用策略类的方法
         self.a_star_path = []
         self.a_star_target = None
+        # the baseline a_star strategy picks a new target after every pickup
+        self.a_star_keep_target = config.strategy != "a_star"
+        self.path_goal = None  # goal cell of Strategy.follow_path
+        self.path_ticks_left = None  # ticks follow_path has left to reach it
+        self.a_star_detour = None  # cell the bot crosses through its centre after a boundary turn
+        self.a_star_done = set()  # target cells whose remaining dirt this bot could not reach
+        self.chase = DirtChase()  # dirt being collected inside a target cell
+        self.explore_target = None  # cell explore_strategy is heading for
+        self.explore_skipped = BitGrid(config.map_width, config.map_height)  # unreachable cells
+        self.coverage = None  # CoverageCursor of coverage_strategy, created on first use
+        self.tour = None  # TourCursor of tour_strategy, created on first use
 
         # self.path_history = []  # 新增：存储轨迹坐标的列表
         # self.path_color = "#FF5722"  # 轨迹颜色（橙色）
         # self.path_max_length = 1000  # 轨迹最大长度（避免内存溢出）
 
+    @property
+    def map(self):
+        """BitGrid: This bot's visited cells, a view into the fleet's packed map."""
+        return self.fleet.map.view(self.index)
+
+    def find_nearest_unexplored(self, explored=None):
+        """
+        Find the free cell nearest to the robot that no robot of the fleet has visited.
+
+        Args:
+            explored (BitGrid, optional): Cells to treat as explored. Defaults to the
+                fleet's shared map.
+
+        Returns:
+            tuple: Grid coordinates (col, row), or None if the whole map is explored.
+        """
+        col, row = self.fleet.map.nearest_unexplored(self.x, self.y, explored)[0]
+        return None if col < 0 else (int(col), int(row))
+
     def brain(self, charger_l, charger_r):
         """
         Execute the robot's decision-making strategy.
@@ -70,25 +126,33 @@ class Bot(CanvasObject):
 
 
     @staticmethod
-    def generate_random_position() -> tuple[int, int] | None:
+    def fleet_obstacles(fleet):
+        """The obstacle map of `fleet`, or the configured one if there is no fleet yet."""
+        return fleet.obstacles if fleet is not None else ObstacleMap.from_config()
+
+    @staticmethod
+    def generate_random_position(obstacles=None, rng=random, config=None) -> tuple[int, int] | None:
         """
         生成一个不在任何障碍物范围内的随机位置
-        :return: (x, y) 坐标元组
-        :raises RuntimeError: 如果无法在尝试次数内找到有效位置
+        :param obstacles: 障碍物地图，默认使用配置中的障碍物
+        :param rng: 随机数生成器，默认使用 random 模块
+        :param config: 运行配置，默认使用内置配置
+        :return: (x, y) 坐标元组；1000 次尝试内找不到有效位置时返回 None
         """
-        def is_valid_position(x: int, y: int) -> bool:
-            """检查坐标是否在任何障碍物内"""
-            if ((280 <= x <= 420 and 280 <= y <= 520)
-            or (580 <= x <= 720 and 280 <= y <= 420)
-            or (480 <= x <= 620 and 680 <= y <= 820)):
-                    return False
-            return True
-
-        for _ in range(1000):
-            x = random.randint(Config.BOT_X_MIN.value, Config.BOT_X_MAX.value)
-            y = random.randint(Config.BOT_Y_MIN.value, Config.BOT_Y_MAX.value)
-            if is_valid_position(x, y):
-                return x, y
+        if config is None:
+            config = RuntimeConfig()
+        if obstacles is None:
+            obstacles = ObstacleMap.from_config(config)
+        points = obstacles.sample_free(
+            1,
+            (config.bot_x_min, config.bot_x_max),
+            (config.bot_y_min, config.bot_y_max),
+            margin=20,
+            rng=rng,
+            max_tries=1000,
+        )
+        if len(points):
+            return int(points[0, 0]), int(points[0, 1])
 
 
     def avoid_cats(self, cat_list):
@@ -96,94 +160,80 @@ class Bot(CanvasObject):
         Adjust wheel speeds to steer away from nearby cats by computing an escape angle
         perpendicular to the threat vector, ensuring safe avoidance behavior.
         """
-        base_speed = 8.0
-
-        for cat in cat_list:
-            print(f"cat: {cat}")
-            distance = self.distance_to(cat)
-            if distance < Config.CAT_AVOID_DISTANCE.value:
-                threat_vector = (cat.x - self.x, cat.y - self.y)
-                threat_angle = math.atan2(threat_vector[1], threat_vector[0])
-                current_angle = self.theta
-                escape_angle = threat_angle + math.pi / 2
-                angle_diff = (escape_angle - current_angle + math.pi) % (2 * math.pi) - math.pi
-                turn_ratio = np.clip(angle_diff / math.pi, -1, 1) * 1.5
-                self.vl = base_speed * (1 - turn_ratio)
-                self.vr = base_speed * (1 + turn_ratio)
+        self.fleet.avoid_cats(positions_of(cat_list, Cat), self.index)
 
-    def draw(self, canvas):
+    @property
+    def sensor_positions(self):
+        """list: Left and right sensor coordinates as [lx, ly, rx, ry]."""
+        return self.fleet.sensor_positions[self.index].tolist()
+
+    def update_sensor_positions(self):
         """
-        Render the robot on the canvas, including its body, wheels, sensors, and battery level.
-        Calculates positions based on the robot's current orientation (theta) and position (x, y).
+        Recompute the positions of the two light sensors from the robot's current pose.
+
+        The sensors sit on the front corners of the body, so they are needed by
+        `sense_charger` whether or not the robot is ever drawn.
         """
-        points = [
-            (self.x + 30 * math.sin(self.theta)) - 30 * math.sin((math.pi / 2.0) - self.theta),
-            (self.y - 30 * math.cos(self.theta)) - 30 * math.cos((math.pi / 2.0) - self.theta),
-            (self.x - 30 * math.sin(self.theta)) - 30 * math.sin((math.pi / 2.0) - self.theta),
-            (self.y + 30 * math.cos(self.theta)) - 30 * math.cos((math.pi / 2.0) - self.theta),
-            (self.x - 30 * math.sin(self.theta)) + 30 * math.sin((math.pi / 2.0) - self.theta),
-            (self.y + 30 * math.cos(self.theta)) + 30 * math.cos((math.pi / 2.0) - self.theta),
-            (self.x + 30 * math.sin(self.theta)) + 30 * math.sin((math.pi / 2.0) - self.theta),
-            (self.y - 30 * math.cos(self.theta)) + 30 * math.cos((math.pi / 2.0) - self.theta),
-        ]
-        canvas.create_polygon(points, fill="blue", tags=self.name)
+        self.fleet.update_sensor_positions(self.index)
 
-        self.sensor_positions = [
-            (self.x + 20 * math.sin(self.theta)) + 30 * math.sin((math.pi / 2.0) - self.theta),
-            (self.y - 20 * math.cos(self.theta)) + 30 * math.cos((math.pi / 2.0) - self.theta),
-            (self.x - 20 * math.sin(self.theta)) + 30 * math.sin((math.pi / 2.0) - self.theta),
-            (self.y + 20 * math.cos(self.theta)) + 30 * math.cos((math.pi / 2.0) - self.theta),
+    def _shape(self):
+        """
+        Compute the canvas coordinates of every part of the robot from its current pose.
+
+        Returns:
+            dict: Coordinates for the body polygon, the centre disc, the battery text,
+                both wheels and both sensors.
+        """
+        x, y, theta = self.x, self.y, self.theta
+        sin_t = math.sin(theta)
+        cos_t = math.cos(theta)
+        # sin(pi/2 - theta) == cos(theta) and cos(pi/2 - theta) == sin(theta)
+        points = [
+            (x + 30 * sin_t) - 30 * cos_t, (y - 30 * cos_t) - 30 * sin_t,
+            (x - 30 * sin_t) - 30 * cos_t, (y + 30 * cos_t) - 30 * sin_t,
+            (x - 30 * sin_t) + 30 * cos_t, (y + 30 * cos_t) + 30 * sin_t,
+            (x + 30 * sin_t) + 30 * cos_t, (y - 30 * cos_t) + 30 * sin_t,
         ]
+        wheel1_x, wheel1_y = x - 30 * sin_t, y + 30 * cos_t
+        wheel2_x, wheel2_y = x + 30 * sin_t, y - 30 * cos_t
+        sensor1_x, sensor1_y, sensor2_x, sensor2_y = self.sensor_positions
+        return {
+            "body": points,
+            "centre": (x - 15, y - 15, x + 15, y + 15),
+            "battery": (x, y),
+            "wheel1": (wheel1_x - 3, wheel1_y - 3, wheel1_x + 3, wheel1_y + 3),
+            "wheel2": (wheel2_x - 3, wheel2_y - 3, wheel2_x + 3, wheel2_y + 3),
+            "sensor1": (sensor1_x - 3, sensor1_y - 3, sensor1_x + 3, sensor1_y + 3),
+            "sensor2": (sensor2_x - 3, sensor2_y - 3, sensor2_x + 3, sensor2_y + 3),
+        }
 
-        centre1PosX = self.x
-        centre1PosY = self.y
-        canvas.create_oval(
-            centre1PosX - 15,
-            centre1PosY - 15,
-            centre1PosX + 15,
-            centre1PosY + 15,
-            fill="gold", tags=self.name
-        )
-        canvas.create_text(self.x, self.y, text=str(self.battery), tags=self.name)
-
-        wheel1PosX = self.x - 30 * math.sin(self.theta)
-        wheel1PosY = self.y + 30 * math.cos(self.theta)
-        canvas.create_oval(
-            wheel1PosX - 3,
-            wheel1PosY - 3,
-            wheel1PosX + 3,
-            wheel1PosY + 3,
-            fill="red", tags=self.name
-        )
+    def draw(self, canvas):
+        """
+        Render the robot on the canvas, including its body, wheels, sensors, and battery level.
+        Calculates positions based on the robot's current orientation (theta) and position (x, y).
 
-        wheel2PosX = self.x + 30 * math.sin(self.theta)
-        wheel2PosY = self.y - 30 * math.cos(self.theta)
-        canvas.create_oval(
-            wheel2PosX - 3,
-            wheel2PosY - 3,
-            wheel2PosX + 3,
-            wheel2PosY + 3,
-            fill="green", tags=self.name
-        )
+        The canvas items are created on the first call only. Later calls move them with
+        `canvas.coords`, and the battery text is only reconfigured when its value changes.
+        """
+        shape = self._shape()
+        if self.canvas_items is None:
+            self.canvas_items = {
+                "body": canvas.create_polygon(shape["body"], fill="blue", tags=self.name),
+                "centre": canvas.create_oval(*shape["centre"], fill="gold", tags=self.name),
+                "battery": canvas.create_text(*shape["battery"], text=str(self.battery), tags=self.name),
+                "wheel1": canvas.create_oval(*shape["wheel1"], fill="red", tags=self.name),
+                "wheel2": canvas.create_oval(*shape["wheel2"], fill="green", tags=self.name),
+                "sensor1": canvas.create_oval(*shape["sensor1"], fill="yellow", tags=self.name),
+                "sensor2": canvas.create_oval(*shape["sensor2"], fill="yellow", tags=self.name),
+            }
+            self.drawn_battery = self.battery
+            return
 
-        sensor1PosX = self.sensor_positions[0]
-        sensor1PosY = self.sensor_positions[1]
-        sensor2PosX = self.sensor_positions[2]
-        sensor2PosY = self.sensor_positions[3]
-        canvas.create_oval(
-            sensor1PosX - 3,
-            sensor1PosY - 3,
-            sensor1PosX + 3,
-            sensor1PosY + 3,
-            fill="yellow", tags=self.name
-        )
-        canvas.create_oval(
-            sensor2PosX - 3,
-            sensor2PosY - 3,
-            sensor2PosX + 3,
-            sensor2PosY + 3,
-            fill="yellow", tags=self.name
-        )
+        for part, item in self.canvas_items.items():
+            canvas.coords(item, *shape[part])
+        if self.battery != self.drawn_battery:
+            canvas.itemconfigure(self.canvas_items["battery"], text=str(self.battery))
+            self.drawn_battery = self.battery
 
     def angle_to(self, target):
         """
@@ -203,7 +253,7 @@ class Bot(CanvasObject):
         dy = target.y - self.y
         return math.atan2(dy, dx) - self.theta
 
-    def move(self, canvas, registry_passives, dt):
+    def move(self, registry_passives, dt):
         """
         Update the robot's position, velocity, and other states based on its current movement and interaction with the environment.
 
@@ -213,182 +263,25 @@ class Bot(CanvasObject):
         - Interacts with passive objects like chargers to recharge the battery when close enough.
         - Avoids cats if detected within a specific range.
         - Updates robot's position and orientation according to its wheel velocities and turn rates.
-        - Redraws the robot's updated position on the canvas.
-        """
-        # 更新机器人坐标后记录轨迹点
-        # if len(self.path_history) > self.path_max_length:
-        #     self.path_history.pop(0)  # 删除最旧的点，控制内存
-        # self.path_history.append((self.x, self.y))  # 记录当前坐标
-
-        if self.battery > 0:
-            self.battery -= 1
-        if self.battery == 0:
-            self.vl = 0
-            self.vr = 0
-
-        if not self.is_turning:
-            avg_speed = (self.vl + self.vr) / 2
-            lookahead = 5
-            temp_x = self.x + avg_speed * math.cos(self.theta) * dt * lookahead
-            temp_y = self.y + avg_speed * math.sin(self.theta) * dt * lookahead
-            dynamic_buffer = self.boundary_buffer + abs(avg_speed) * 2
-
-            if (temp_x < Config.BOT_X_MIN.value - dynamic_buffer or
-                    temp_x > Config.BOT_X_MAX.value + dynamic_buffer or
-                    temp_y < Config.BOT_Y_MIN.value - dynamic_buffer or
-                    temp_y > Config.BOT_Y_MAX.value + dynamic_buffer or
-
-                    ((300 - dynamic_buffer < temp_x < 400 + dynamic_buffer) and
-                     (300 - dynamic_buffer < temp_y < 500 + dynamic_buffer)) or
-                    ((600 - dynamic_buffer < temp_x < 700 + dynamic_buffer) and
-                     (300 - dynamic_buffer < temp_y < 400 + dynamic_buffer)) or
-                    ((500 - dynamic_buffer < temp_x < 600 + dynamic_buffer) and
-                     (700 - dynamic_buffer < temp_y < 800 + dynamic_buffer))
-
-            ):
-                self.init_boundary_turn()
-                return
-
-        if self.is_turning:
-            self.boundary_turn_count -= 1
-
-            decay = 0.95 if self.boundary_turn_count > 5 else 0.85
-            self.vl *= decay
-            self.vr *= decay
-
-            self.x = np.clip(self.x,
-                             Config.BOT_X_MIN.value + 30,
-                             Config.BOT_X_MAX.value - 30)
-            self.y = np.clip(self.y,
-                             Config.BOT_Y_MIN.value + 30,
-                             Config.BOT_Y_MAX.value - 30)
-
-            omega = (self.vl - self.vr) / self.ll
-            self.theta += omega * dt
-            self.theta %= 2 * math.pi
-
-            if self.boundary_turn_count <= 0 or abs(omega) < 0.1:
-                self.is_turning = False
-                self.vl, self.vr = 5.0, 5.0
-
-            canvas.delete(self.name)
-            self.draw(canvas)
-            return
 
-        for rr in registry_passives:
-            if isinstance(rr, Charger) and self.distance_to(
-                    rr) < Config.CHARGER_DISTANCE.value and self.battery < Config.BOT_BATTERY_CAPACITY.value:
-                self.battery += 10
-
-        cat_list = [rr for rr in registry_passives if isinstance(rr, Cat)]
-        self.avoid_cats(cat_list)
-
-        if self.vl == self.vr and not self.is_turning:
-            R = 0
-        else:
-            R = (self.ll / 2.0) * ((self.vr + self.vl) / (self.vl - self.vr))
-        omega = (self.vl - self.vr) / self.ll
-        ICCx = self.x - R * math.sin(self.theta)
-        ICCy = self.y + R * math.cos(self.theta)
-        m = np.matrix([
-            [math.cos(omega * dt), -math.sin(omega * dt), 0],
-            [math.sin(omega * dt), math.cos(omega * dt), 0],
-            [0, 0, 1],
-        ])
-        v1 = np.matrix([[self.x - ICCx], [self.y - ICCy], [self.theta]])
-        v2 = np.matrix([[ICCx], [ICCy], [omega * dt]])
-        new_v = np.add(np.dot(m, v1), v2)
-        newX = new_v.item(0)
-        newY = new_v.item(1)
-        newTheta = new_v.item(2)
-        newTheta = newTheta % (2.0 * math.pi)
-        self.x = newX
-        self.y = newY
-        self.theta = newTheta
-        if self.vl == self.vr:
-            self.x += self.vr * math.cos(self.theta)
-            self.y += self.vr * math.sin(self.theta)
-        self.update_map()
-        canvas.delete(self.name)
-        self.draw(canvas)
+        The kinematics are delegated to `Fleet.move` for this robot only; a `Simulation`
+        advances all robots in one call instead. Drawing is left to the renderer so that
+        the robot can be simulated headless.
+        """
+        chargers = positions_of(registry_passives, Charger)
+        cats = positions_of(registry_passives, Cat)
+        if len(self.fleet.move(chargers, cats, dt, self.index)):
+            self.update_map()
 
     def update_map(self):
         """
         Updates the robot's position on the occupancy grid map.
 
         This method calculates the robot's current grid cell based on its (x, y) coordinates,
-        then sets the corresponding cell in the map to 1, indicating the robot's presence.
-        After updating the map, it calls the draw_map method to visually reflect the change.
-
-        The grid cells are determined by dividing the robot's coordinates by the cell size (100 units).
-        The resulting indices are used to access and modify the appropriate cell in the map.
-        """
-        xMapPosition = int(math.floor(self.x / 100))
-        yMapPosition = int(math.floor(self.y / 100))
-        self.map[xMapPosition][yMapPosition] = 1
-        self.draw_map()
-
-    def draw_map(self):
-        """
-        Draws the current map on the canvas, displaying the robot's path and boundaries.
-
-        This method iterates through the 2D map and draws rectangles in areas where the robot
-        has passed, as indicated by the value of '1' in the map. It also draws red border lines
-        around the designated boundary of the map.
-
-        The rectangles are drawn in a grid pattern, and the border lines are drawn using specific
-        coordinates from the configuration.
-        """
-        self.canvas.delete("map")
-        for xx in range(10):
-            for yy in range(10):
-                if self.map[xx][yy] == 1:
-                    self.canvas.create_rectangle(
-                        100 * xx, 100 * yy,
-                        100 * xx + 100, 100 * yy + 100,
-                        fill="pink", width=0, tags="map"
-                    )
-        self.canvas.create_line(
-            Config.BOT_X_MIN.value, Config.BOT_Y_MIN.value,
-            Config.BOT_X_MAX.value, Config.BOT_Y_MIN.value,
-            fill="red", width=2, tags="border"
-        )
-        self.canvas.create_line(
-            Config.BOT_X_MIN.value, Config.BOT_Y_MAX.value,
-            Config.BOT_X_MAX.value, Config.BOT_Y_MAX.value,
-            fill="red", width=2, tags="border"
-        )
-        self.canvas.create_line(
-            Config.BOT_X_MIN.value, Config.BOT_Y_MIN.value,
-            Config.BOT_X_MIN.value, Config.BOT_Y_MAX.value,
-            fill="red", width=2, tags="border"
-        )
-
-        self.canvas.create_line(
-            Config.BOT_X_MAX.value, Config.BOT_Y_MIN.value,
-            Config.BOT_X_MAX.value, Config.BOT_Y_MAX.value,
-            fill="red", width=2, tags="border"
-        )
-        self.canvas.tag_lower("map")
-
-        # 删除旧轨迹
-        # self.canvas.delete("bot_path")
-
-        # if len(self.path_history) >= 2:
-        #     # 将轨迹点转换为画布坐标序列 [x1,y1, x2,y2,...]
-        #     path_points = []
-        #     for x, y in self.path_history:
-        #         path_points.extend([x, y])
-        #
-        #     # 绘制轨迹线（半透明橙色，宽度渐变）
-        #     self.canvas.create_line(
-        #         *path_points,
-        #         fill=self.path_color,
-        #         width=2,
-        #         tags="bot_path",
-        #         stipple="gray50",  # 可选：虚线样式
-        #         smooth=True  # 曲线平滑
-        #     )
+        then marks the corresponding cell as visited in the robot's map and in the fleet's
+        shared map. Simulations mark all robots that moved in one `Fleet.update_map` call.
+        """
+        self.fleet.update_map(self.index)
 
     def sense_charger(self, registry_passives):
         """
@@ -396,8 +289,8 @@ class Bot(CanvasObject):
 
         This method calculates the light intensity detected by the robot's left and right sensors
         based on the inverse square law, which states that light intensity decreases with the square
-        of the distance from the light source. The method iterates through all passive objects in the
-        registry, identifies chargers, and computes the light intensity received by each sensor.
+        of the distance from the light source. The chargers are picked out of the registry and the
+        intensities are computed by `Fleet.sense_chargers`; simulations sense the whole fleet at once.
 
         Args:
             registry_passives (list): A list of passive objects in the environment, such as chargers.
@@ -406,22 +299,9 @@ class Bot(CanvasObject):
             tuple: A tuple containing two float values representing the light intensity detected by
                 the left and right sensors, respectively.
         """
-        lightL = 0.0
-        lightR = 0.0
-        for pp in registry_passives:
-            if isinstance(pp, Charger):
-                lx, ly = pp.get_location()
-                distanceL = math.sqrt(
-                    (lx - self.sensor_positions[0]) ** 2 +
-                    (ly - self.sensor_positions[1]) ** 2
-                )
-                distanceR = math.sqrt(
-                    (lx - self.sensor_positions[2]) ** 2 +
-                    (ly - self.sensor_positions[3]) ** 2
-                )
-                lightL += 200000 / (distanceL * distanceL)
-                lightR += 200000 / (distanceR * distanceR)
-        return lightL, lightR
+        chargers = positions_of(registry_passives, Charger)
+        lightL, lightR = self.fleet.sense_chargers(chargers, self.config.charger_gain, self.index)[0]
+        return float(lightL), float(lightR)
 
     def distance_to(self, obj):
         """
@@ -441,37 +321,33 @@ class Bot(CanvasObject):
         xx, yy = obj.get_location()
         return math.sqrt((self.x - xx) ** 2 + (self.y - yy) ** 2)
 
-    def collect_dirt(self, canvas, registry_passives, counter):
+    def collect_dirt(self, dirt_field, counter):
         """
-        Collects nearby dirt objects within a specified radius and updates the canvas and registry.
+        Collects nearby dirt within a specified radius and removes it from the dirt field.
 
-        This method checks for dirt objects in the registry that are within a certain distance from
-        the robot. If a dirt object is within range, it is removed from the canvas, deleted from the
-        registry, and the collection counter is updated. Additionally, if the dirt is part of the robot's
-        internal dirt list, it is removed, and the robot's A* path is cleared.
+        Only the rows of the field whose index buckets overlap the pickup radius are checked.
+        Each piece of dirt within range is marked as collected and the collection counter is
+        updated. If the dirt is part of the robot's own dirt list, the robot's A* target and
+        path are cleared, or only once the target cell is empty when the strategy keeps
+        its targets (every strategy but `a_star`).
 
         Args:
-            canvas (tkinter.Canvas): The canvas on which the robot and dirt objects are drawn.
-            registry_passives (list): A list of passive objects in the environment, such as dirt and chargers.
+            dirt_field (DirtField): The dirt still lying in the world. Collected dirt is
+                removed from it in place.
             counter (Counter): An object responsible for tracking the number of collected items.
 
         Returns:
-            list: The updated registry of passive objects after the collection process.
+            numpy.ndarray: The ids of the dirt collected during this call, so a renderer can erase them.
         """
-        to_delete = []
-        for idx, rr in enumerate(registry_passives):
-            if isinstance(rr, Dirt):
-                if self.distance_to(rr) < 30:
-                    canvas.delete(rr.name)
-                    to_delete.append(idx)
-                    counter.item_collected()
-                    if rr in self.dirt_list:
-                        self.dirt_list.remove(rr)
-                        self.a_star_target = None
-                        self.a_star_path.clear()
-        for ii in sorted(to_delete, reverse=True):
-            del registry_passives[ii]
-        return registry_passives
+        collected = dirt_field.collect(self.x, self.y, 30)
+        for _ in collected:
+            counter.item_collected()
+        if len(collected) and dirt_field is self.dirt_list and (
+                not self.a_star_keep_target or self.a_star_target is None
+                or dirt_field.cell_counts.get(self.a_star_target) == 0):
+            self.a_star_target = None
+            self.a_star_path.clear()
+        return collected
 
     def _check_battery(self):
         """
@@ -492,8 +368,8 @@ class Bot(CanvasObject):
         """
         if self.battery < 0:
             self.battery = 0
-        elif self.battery > Config.BOT_BATTERY_CAPACITY.value:
-            self.battery = Config.BOT_BATTERY_CAPACITY.value
+        elif self.battery > self.config.bot_battery_capacity:
+            self.battery = self.config.bot_battery_capacity
 
 
     def init_boundary_turn(self):
@@ -513,23 +389,4 @@ class Bot(CanvasObject):
         Returns:
             None
         """
-        self.is_turning = True
-        turn_speed = 15.0
-        current_angle = self.theta % (2 * math.pi)
-        if current_angle < math.pi / 2 or current_angle > 3 * math.pi / 2:
-            self.vl = turn_speed
-            self.vr = -turn_speed
-        else:
-            self.vl = -turn_speed
-            self.vr = turn_speed
-
-        omega = abs((self.vl - self.vr) / self.ll)
-        required_frames = math.ceil(math.pi / omega)
-        self.boundary_turn_count = required_frames + 3
-
-        self.x = np.clip(self.x,
-                         Config.BOT_X_MIN.value + 50,
-                         Config.BOT_X_MAX.value - 50)
-        self.y = np.clip(self.y,
-                         Config.BOT_Y_MIN.value + 50,
-                         Config.BOT_Y_MAX.value - 50)
+        self.fleet.init_boundary_turn(self.index)
@@ -1,61 +1,47 @@
 import tkinter as tk
 import sys
 from bot import Bot
-from charger import Charger
-from config import Config
-from counter import Counter
-from dirt import Dirt
-from wifihub import WiFiHub
-from cat import Cat
-from strategy import Strategy
-from collections import defaultdict
+from config import RuntimeConfig
+from obstacles import ObstacleMap
+from simulation import Simulation
 import numpy as np
 import matplotlib.pyplot as plt
 import time
 
 
-def initialize(window):
+def initialize(window, config=None):
     """Initialize window and canvas
 
     Args:
         window: tkinter window object
+        config: Settings of the run (optional)
 
     Returns:
         tkinter.Canvas: The created canvas object
     """
+    if config is None:
+        config = RuntimeConfig()
     window.resizable(True, True)
     canvas = tk.Canvas(
         window,
-        width=Config.CANVAS_WIDTH.value,
-        height=Config.CANVAS_HEIGHT.value,
+        width=config.canvas_width,
+        height=config.canvas_height,
     )
     canvas.pack()
-    canvas.create_rectangle(
-        300, 300,
-        400, 500,
-        fill="green", width=0, tags="item1"
-    )
-    canvas.create_rectangle(
-        600, 300,
-        700, 400,
-        fill="green", width=0, tags="item2"
-    )
-    canvas.create_rectangle(
-        500, 700,
-        600, 800,
-        fill="green", width=0, tags="item3"
-    )
+    ObstacleMap.from_config(config).draw(canvas)
 
     return canvas
 
 
 millis_log_time = int(round(time.time() * 1000))
 
-def plot_dirt_distribution(dirt_list):
+def plot_dirt_distribution(dirt_field, config=None):
     # 网格参数
-    GRID_SIZE = 100
-    CANVAS_WIDTH = Config.CANVAS_WIDTH.value
-    CANVAS_HEIGHT = Config.CANVAS_HEIGHT.value
+    if config is None:
+        config = RuntimeConfig()
+    GRID_SIZE = config.cell_size
+    CANVAS_WIDTH = config.canvas_width
+    CANVAS_HEIGHT = config.canvas_height
     NUM_GRIDS_X = CANVAS_WIDTH // GRID_SIZE
     NUM_GRIDS_Y = CANVAS_HEIGHT // GRID_SIZE
 
@@ -64,10 +50,10 @@ def plot_dirt_distribution(dirt_list):
     print(f"grid_counts\n{grid_counts}")
 
     # 统计每个网格的 dirt 数量
-    for dirt in dirt_list:
-        grid_x = min(int(dirt.x // GRID_SIZE), NUM_GRIDS_X - 1)
-        grid_y = min(int((dirt.y) // GRID_SIZE), NUM_GRIDS_Y - 1)  # 关键转换
-        grid_counts[grid_y, grid_x] += 1
+    alive = dirt_field.alive
+    grid_x = np.minimum((dirt_field.x[alive] // GRID_SIZE).astype(int), NUM_GRIDS_X - 1)
+    grid_y = np.minimum((dirt_field.y[alive] // GRID_SIZE).astype(int), NUM_GRIDS_Y - 1)  # 关键转换
+    np.add.at(grid_counts, (grid_y, grid_x), 1)
     print(f"grid_counts\n{grid_counts}")
 
     # 绘制热力图
@@ -88,141 +74,266 @@ def plot_dirt_distribution(dirt_list):
     plt.show()
 
 
-def register(canvas):
-    """Register all simulation objects
+class MapLayer:
+    """Occupancy-map layer drawn incrementally on the canvas
 
-    Create and register robots, chargers, WiFi hubs, and dirt
+    Only cells that became visited since the last update get a new rectangle, and
+    the red arena border is created once, so an update costs a handful of canvas
+    items instead of redrawing every visited cell.
+    """
 
-    Args:
-        canvas: Drawing canvas object
+    def __init__(self, canvas, tag="map", fill="pink", config=None):
+        """Create the layer and draw the arena border
 
-    Returns:
-        tuple: Contains active objects list, passive objects list, and counter
+        Args:
+            canvas: Drawing canvas object
+            tag: Canvas tag shared by the layer's rectangles
+            fill: Fill colour of visited cells
+            config: Settings of the run (optional)
+        """
+        self.canvas = canvas
+        self.tag = tag
+        self.fill = fill
+        self.config = config if config is not None else RuntimeConfig()
+        self.drawn = np.zeros((self.config.map_width, self.config.map_height), dtype=bool)
+        if not canvas.find_withtag("border"):
+            self.draw_border(canvas, self.config)
+
+    @staticmethod
+    def draw_border(canvas, config):
+        """Draw the red border lines around the robots' allowed area
+
+        Args:
+            canvas: Drawing canvas object
+            config: Settings of the run
+        """
+        x_min, x_max = config.bot_x_min, config.bot_x_max
+        y_min, y_max = config.bot_y_min, config.bot_y_max
+        for x0, y0, x1, y1 in ((x_min, y_min, x_max, y_min), (x_min, y_max, x_max, y_max),
+                               (x_min, y_min, x_min, y_max), (x_max, y_min, x_max, y_max)):
+            canvas.create_line(x0, y0, x1, y1, fill="red", width=2, tags="border")
+
+    def update(self, visited):
+        """Draw the cells of `visited` that are not drawn yet
+
+        Args:
+            visited: Occupancy grid indexed [col, row], e.g. a `BitGrid`; non-zero
+                cells are visited
+        """
+        new_cells = np.argwhere(np.asarray(visited, dtype=bool) & ~self.drawn)
+        if len(new_cells) == 0:
+            return
+        size = self.config.cell_size
+        for xx, yy in new_cells:
+            self.canvas.create_rectangle(
+                size * xx, size * yy,
+                size * xx + size, size * yy + size,
+                fill=self.fill, width=0, tags=self.tag
+            )
+        self.drawn[new_cells[:, 0], new_cells[:, 1]] = True
+        self.canvas.tag_lower(self.tag)
+
+
+class TkRenderer:
+    """Draws a `Simulation` onto a tkinter canvas.
+
+    The renderer is registered as an observer of the simulation, so the engine
+    itself never touches tkinter and can run headless.
     """
-    registry_actives = []
-    registry_passives = []
-
-    num_dirt = Config.DIRT_NUM.value
-    for i in range(0, num_dirt):
-        dirt = Dirt("Dirt" + str(i))
-        registry_passives.append(dirt)
-        dirt.draw(canvas)
-
-    dirt_list = [item for item in registry_passives if isinstance(item, Dirt)]
-    plot_dirt_distribution(dirt_list)
-    # for i, dirt in enumerate(dirt_list, start=1):
-    #     print(f"name: {dirt.name}: ({dirt.x}, {dirt.y})")
-
-    # def get_grid_index(x, y):
-    #     """返回 (x, y) 所在的网格索引 (grid_x, grid_y)"""
-    #     grid_x = x // Config.CELL_SIZE.value
-    #     grid_y = y // Config.CELL_SIZE.value
-    #     return (grid_x, grid_y)
-
-    # grid_dict = defaultdict(list)
-    # # 将 dirt 分配到网格
-    # for dirt in dirt_list:
-    #     grid_x, grid_y = get_grid_index(dirt.x, dirt.y)
-    #     grid_dict[(grid_x, grid_y)].append(dirt)
-
-    # 打印结果
-    # for (grid_x, grid_y), dirts in grid_dict.items():
-    #     print(f"\nGrid ({grid_x}, {grid_y}) has {len(dirts)} dirts:")
-    # for dirt in dirts:
-    #     print(f"  - {dirt.name}: ({dirt.x}, {dirt.y})")
-
-    num_bots = Config.BOT_NUM.value
-    for i in range(0, num_bots):
-        bot = Bot("Bot" + str(i), canvas, dirt_list)
-        registry_actives.append(bot)
-        bot.draw(canvas)
-
-    charger = Charger("Charger")
-    registry_passives.append(charger)
-    charger.draw(canvas)
-
-    hub1 = WiFiHub("Hub1", 950, 50)
-    registry_passives.append(hub1)
-    hub1.draw(canvas)
-    hub2 = WiFiHub("Hub2", 50, 500)
-    registry_passives.append(hub2)
-    hub2.draw(canvas)
-
-    num_cats = Config.CAT_NUM.value
-    if num_cats > 0:
-        for i in range(num_cats):
-            cat = Cat("Cat" + str(i))
-            registry_passives.append(cat)
-            cat.draw(canvas)
-
-    count = Counter(canvas)
-
-    def handle_button_clicked(x, y, actives):
-        """Handle mouse click event, move robot to clicked position
+
+    MAP_COLOURS = ("pink", "lightblue", "lightgreen", "khaki", "plum", "lightsalmon")
+
+    def __init__(self, canvas, simulation, shared_map=True):
+        """
+        Draw the initial world and bind mouse interaction.
 
         Args:
-            x: Clicked x-coordinate
-            y: Clicked y-coordinate
-            actives: Active objects list
+            canvas: Drawing canvas object
+            simulation (Simulation): The simulation to render
+            shared_map (bool): Draw one map layer with the union of all robots' visited
+                cells, or one coloured layer per robot if False
         """
-        for rr in actives:
-            if isinstance(rr, Bot):
-                rr.x = x
-                rr.y = y
-
-    canvas.bind(
-        "<Button-1>",
-        lambda event: handle_button_clicked(event.x, event.y, registry_actives),
-    )
+        self.canvas = canvas
+        self.shared_map = shared_map
+        self.pending_dirt = []  # ids of dirt collected since the last frame
+        if shared_map:
+            self.map_layers = [MapLayer(canvas, config=simulation.config)]
+        else:
+            self.map_layers = [
+                MapLayer(canvas, "map_" + bot.name, self.MAP_COLOURS[i % len(self.MAP_COLOURS)],
+                         simulation.config)
+                for i, bot in enumerate(simulation.registry_actives)
+            ]
+        self.dirt_items = simulation.dirt_field.draw(canvas)
+        for item in simulation.registry_passives:
+            item.draw(canvas)
+        for bot in simulation.registry_actives:
+            bot.draw(canvas)
+        simulation.counter.attach(canvas)
+
+        def handle_button_clicked(x, y, actives):
+            """Handle mouse click event, move robot to clicked position
+
+            Args:
+                x: Clicked x-coordinate
+                y: Clicked y-coordinate
+                actives: Active objects list
+            """
+            for rr in actives:
+                if isinstance(rr, Bot):
+                    rr.x = x
+                    rr.y = y
+
+        canvas.bind(
+            "<Button-1>",
+            lambda event: handle_button_clicked(event.x, event.y, simulation.registry_actives),
+        )
+
+    def on_step(self, simulation):
+        """Remember what the last step changed until the next frame is rendered
 
-    return registry_actives, registry_passives, count
+        Args:
+            simulation (Simulation): The simulation that has just stepped
+        """
+        self.pending_dirt.extend(simulation.collected)
 
+    def render(self, simulation):
+        """Redraw the parts of the world changed since the previous frame
 
-def move_it(canvas, registry_actives, registry_passives, counter, moves=0):
-    """Update simulation state, move robots and handle interactions
+        Args:
+            simulation (Simulation): The simulation to draw
+        """
+        for dirt_id in self.pending_dirt:
+            self.canvas.delete(self.dirt_items[dirt_id])
+        self.pending_dirt.clear()
+        bots = simulation.registry_actives
+        if self.shared_map:
+            self.map_layers[0].update(simulation.fleet.map.shared)
+        else:
+            for layer, bot in zip(self.map_layers, bots):
+                layer.update(bot.map)
+        for bot in bots:
+            bot.draw(self.canvas)
+
+
+def register(canvas, path_table_dir=None, seed=None, config=None):
+    """Create a simulation and attach a renderer to the canvas
 
     Args:
         canvas: Drawing canvas object
-        registry_actives: Active objects list
-        registry_passives: Passive objects list
-        counter: Counter object
-        moves: Current move count
+        path_table_dir: Directory for precomputed shortest-path tables (optional)
+        seed: Seed of the run (optional)
+        config: Settings of the run (optional)
+
+    Returns:
+        tuple: The simulation holding the active objects, passive objects, and counter,
+            and the renderer drawing it
     """
-    moves += 1
+    simulation = Simulation(config, path_table_dir=path_table_dir, seed=seed)
+    plot_dirt_distribution(simulation.dirt_field, simulation.config)
+    renderer = TkRenderer(canvas, simulation)
+    simulation.add_observer(renderer)
+    return simulation, renderer
+
 
-    # 检查里程碑
-    milestone_data = counter.check_milestone(moves)
-    if milestone_data:  # 如果达到里程碑点
-        print(f"Move {moves}: Collected {counter.dirt_collected} dirt")
+class TkRunner:
+    """Drives a simulation from the tkinter event loop with frames decoupled from ticks
 
+    Between two frames the simulation runs as many ticks as are due. By default a
+    frame is drawn at most `max_fps` times per second and the number of ticks per
+    frame follows the real-time factor. With `render_every` set, every frame runs
+    exactly that many ticks instead.
+    """
 
-    for rr in registry_actives:
-        chargerIntensityL, chargerIntensityR = rr.sense_charger(registry_passives)
+    TICK_RATE = 20  # ticks per second at real-time factor 1, the pace of the old 50 ms timer
 
-        rr.brain(chargerIntensityL, chargerIntensityR)
-        rr.move(canvas, registry_passives, 1.0)
-        registry_passives = rr.collect_dirt(canvas, registry_passives, counter)
+    def __init__(self, canvas, simulation, renderer, max_fps=30, render_every=None,
+                 real_time_factor=1.0):
+        """Set up the runner
 
-        if moves >= Config.BOT_MOVES_MAX.value:
-            print("\nFinal results:")
-            for milestone in sorted(counter.milestone_data.keys()):
-                print(f"Move {milestone}: Collected {counter.milestone_data[milestone]} dirt")
-            print(f"Total dirt collected in {moves} moves is {counter.dirt_collected}")
+        Args:
+            canvas: Drawing canvas object
+            simulation (Simulation): The simulation to advance
+            renderer (TkRenderer): The renderer drawing the simulation
+            max_fps: Upper bound on frames drawn per second
+            render_every: Draw one frame every this many ticks (optional)
+            real_time_factor: Simulated ticks per second as a multiple of TICK_RATE;
+                None runs as many ticks as fit between frames
+        """
+        self.canvas = canvas
+        self.simulation = simulation
+        self.renderer = renderer
+        self.max_fps = max_fps
+        self.render_every = render_every
+        self.real_time_factor = real_time_factor
+        self.tick_debt = 0.0
+        self.last_frame = None
+
+    def start(self):
+        """Draw the first frame and schedule the following ones"""
+        self.last_frame = time.perf_counter()
+        self.frame()
+
+    def _ticks_due(self, elapsed):
+        if self.render_every is not None:
+            return self.render_every
+        if self.real_time_factor is None:
+            return None
+        self.tick_debt += elapsed * self.TICK_RATE * self.real_time_factor
+        ticks = int(self.tick_debt)
+        self.tick_debt -= ticks
+        return ticks
+
+    def frame(self):
+        """Run the ticks due since the previous frame, then render one frame"""
+        now = time.perf_counter()
+        frame_budget = 1.0 / self.max_fps
+        ticks = self._ticks_due(now - self.last_frame)
+        self.last_frame = now
+
+        deadline = now + frame_budget
+        done = 0
+        while not self.simulation.finished and (ticks is None or done < ticks):
+            self.simulation.step()
+            done += 1
+            # an unlimited run yields to Tk once the frame budget is spent
+            if ticks is None and time.perf_counter() >= deadline:
+                break
+        if ticks is not None and done < ticks and not self.simulation.finished:
+            self.tick_debt = 0.0  # cannot keep up; do not let the backlog grow
+
+        self.renderer.render(self.simulation)
+
+        if self.simulation.finished:
+            self.simulation.print_results()
             sys.exit()
 
-        # # Check if maximum number of moves (1000) is reached
-        # num_moves = Config.BOT_MOVES_MAX.value
-        # if moves > num_moves:
-        #     print(
-        #         "total dirt collected in",
-        #         num_moves,
-        #         "moves is",
-        #         counter.dirt_collected,
-        #     )
-        #     sys.exit()  # End program
-
-        # if counter.dirt_collected >= 600:
-        #     print(f"Have collected {counter.dirt_collected} dirt，cost：{moves}")
-        #     sys.exit()
-
-    canvas.after(50, move_it, canvas, registry_actives, registry_passives, counter, moves)
+        delay = frame_budget
+        if self.render_every is not None and self.real_time_factor:
+            delay = max(delay, self.render_every / (self.TICK_RATE * self.real_time_factor))
+        elapsed = time.perf_counter() - now
+        self.canvas.after(max(1, int((delay - elapsed) * 1000)), self.frame)
+
+
+def add_speed_control(window, runner, max_factor=250):
+    """Add a real-time-factor slider and an unlimited-speed switch below the canvas
+
+    Args:
+        window: tkinter window object
+        runner (TkRunner): The runner whose speed is controlled
+        max_factor: Largest real-time factor offered by the slider
+    """
+    controls = tk.Frame(window)
+    controls.pack(fill="x")
+    factor = tk.DoubleVar(value=runner.real_time_factor or 1.0)
+    unlimited = tk.BooleanVar(value=runner.real_time_factor is None)
+
+    def apply(*_):
+        runner.real_time_factor = None if unlimited.get() else factor.get()
+        runner.tick_debt = 0.0
+
+    tk.Scale(
+        controls, from_=1, to=max_factor, orient="horizontal", resolution=1,
+        label="Real-time factor (x)", variable=factor, command=apply,
+    ).pack(side="left", fill="x", expand=True)
+    tk.Checkbutton(controls, text="Unlimited", variable=unlimited, command=apply).pack(side="right")
@@ -1,20 +1,27 @@
 import random
-import tkinter as tk
 import os
-from config import Config
-from PIL import Image, ImageTk
+
+import numpy as np
+
+from config import RuntimeConfig
+from spatial import GridIndex
 
 class Cat:
-    def __init__(self, name):
+    def __init__(self, name, rng=random, config=None):
         """
         Initialize a Cat object with a given name and random position.
 
         Args:
             name (str): The name of the cat.
+            rng: Random number generator for the position. Defaults to the `random` module.
+            config (RuntimeConfig, optional): Settings of the run; the cat is placed on a
+                50 px lattice covering the arena. Defaults to the built-in ones.
         """
+        if config is None:
+            config = RuntimeConfig()
         self.name = name
-        self.x = random.randint(0, 19) * 50
-        self.y = random.randint(0, 11) * 50
+        self.x = rng.randint(0, config.canvas_width // 50 - 1) * 50
+        self.y = rng.randint(0, config.canvas_height // 50 - 1) * 50
         self.size = 40
         self.image = None
 
@@ -36,6 +43,8 @@ class Cat:
             canvas (tk.Canvas): The canvas on which to draw the cat.
         """
         try:
+            # Imported lazily so headless simulations do not need Pillow or a display.
+            from PIL import Image, ImageTk
             path = os.path.join("assets", "cat.png")
             img = Image.open(path).resize((50, 50))
             self.image = ImageTk.PhotoImage(img)
@@ -46,3 +55,64 @@ class Cat:
                 self.x, self.y, self.x + self.size, self.y + self.size,
                 fill="gray"
             )
+
+
+class CatRegistry:
+    """Array-backed positions of all cats, with a spatial index for proximity queries.
+
+    Positions are held in an (k, 2) array and bucketed by a `GridIndex` whose bucket
+    size is the avoidance distance, so finding the cats near every bot only looks at
+    the neighbouring buckets instead of all cats. Call `refresh` after cats move.
+    """
+
+    def __init__(self, positions, bucket_size, cats=()):
+        """
+        Args:
+            positions (array-like): A (k, 2) array of cat locations.
+            bucket_size (float): Bucket size of the index, ideally the avoidance distance.
+            cats (iterable): The `Cat` objects the positions belong to, if any.
+        """
+        self.cats = list(cats)
+        self.bucket_size = bucket_size
+        self._build(positions)
+
+    def _build(self, positions):
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        self.index = GridIndex(self.positions[:, 0], self.positions[:, 1], self.bucket_size)
+
+    @classmethod
+    def from_objects(cls, registry, bucket_size):
+        """
+        Args:
+            registry (list): Passive objects; only `Cat` instances are kept.
+            bucket_size (float): Bucket size of the index.
+
+        Returns:
+            CatRegistry: A registry of the cats in `registry`, in registry order.
+        """
+        cats = [item for item in registry if isinstance(item, Cat)]
+        return cls([cat.get_location() for cat in cats], bucket_size, cats)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __iter__(self):
+        return iter(self.positions)
+
+    def refresh(self):
+        """Re-read the positions of the cat objects and rebuild the index."""
+        self._build([cat.get_location() for cat in self.cats])
+
+    def near(self, x, y, radius):
+        """
+        Find the cats closer than `radius` to each of many points.
+
+        Args:
+            x (numpy.ndarray): x-coordinates of the points, e.g. bot positions.
+            y (numpy.ndarray): y-coordinates of the points.
+            radius (float): Search radius.
+
+        Returns:
+            tuple: Arrays (point_indices, cat_indices) of every close pair.
+        """
+        return self.index.pairs(x, y, radius)
@@ -1,20 +1,24 @@
 from canvas_object import CanvasObject
 import random
 
-from config import Config
+from config import RuntimeConfig
 
 
 class Charger(CanvasObject):
-    def __init__(self, name: str):
+    def __init__(self, name: str, rng=random, config=None):
         """
         Initialize a Charger object with a given name and random position.
 
         Args:
             name (str): The name of the charger.
+            rng: Random number generator for the position. Defaults to the `random` module.
+            config (RuntimeConfig, optional): Settings of the run. Defaults to the built-in ones.
         """
         super().__init__()
-        self.x = random.randint(Config.CHARGER_X_MIN.value, Config.CHARGER_X_MAX.value)
-        self.y = random.randint(Config.CHARGER_Y_MIN.value, Config.CHARGER_Y_MAX.value)
+        if config is None:
+            config = RuntimeConfig()
+        self.x = rng.randint(config.charger_x_min, config.charger_x_max)
+        self.y = rng.randint(config.charger_y_min, config.charger_y_max)
         self.name = name
 
     def draw(self, canvas):
@@ -1,4 +1,6 @@
+from dataclasses import asdict, dataclass, replace
 from enum import Enum
+import json
 import math
 
 
@@ -42,3 +44,199 @@ class Config(Enum):
 
     CAT_NUM = 0
     CAT_AVOID_DISTANCE = 125 
+
+    # Obstacle rectangles as (x_min, y_min, x_max, y_max)
+    OBSTACLES = (
+        (300, 300, 400, 500),
+        (600, 300, 700, 400),
+        (500, 700, 600, 800),
+    )
+
+
+# Python types accepted for each field type of `RuntimeConfig`; ints are valid floats
+_ACCEPTED = {bool: bool, int: int, float: (int, float), str: str, tuple: tuple}
+
+
+@dataclass(frozen=True, slots=True)
+class RuntimeConfig:
+    """Immutable per-run settings, defaulting to the values of `Config`.
+
+    Unlike the `Config` Enum, a `RuntimeConfig` is an ordinary object: it can be
+    built from a TOML/JSON file or command-line overrides, passed into a simulation
+    and sent to worker processes, and its fields are plain attributes, so hot loops
+    read `config.cell_size` instead of `Config.CELL_SIZE.value`.
+    """
+
+    canvas_width: int = Config.CANVAS_WIDTH.value
+    canvas_height: int = Config.CANVAS_HEIGHT.value
+    cell_size: int = Config.CELL_SIZE.value
+
+    map_width: int = Config.MAP_WIDTH.value
+    map_height: int = Config.MAP_HEIGHT.value
+
+    bot_num: int = Config.BOT_NUM.value
+    bot_battery_capacity: int = Config.BOT_BATTERY_CAPACITY.value
+    bot_v_positive_max: float = Config.BOT_V_POSITIVE_MAX.value
+    bot_x_min: int = Config.BOT_X_MIN.value
+    bot_x_max: int = Config.BOT_X_MAX.value
+    bot_y_min: int = Config.BOT_Y_MIN.value
+    bot_y_max: int = Config.BOT_Y_MAX.value
+    bot_theta_min: float = 0.0
+    bot_theta_max: float = Config.BOT_THETA_MAX.value
+    bot_moves_max: int = Config.BOT_MOVES_MAX.value
+
+    charger_x_min: int = Config.CHARGER_X_MIN.value
+    charger_x_max: int = Config.CHARGER_X_MAX.value
+    charger_y_min: int = Config.CHARGER_Y_MIN.value
+    charger_y_max: int = Config.CHARGER_Y_MAX.value
+    charger_distance: float = Config.CHARGER_DISTANCE.value
+
+    wifi_hub_x_min: int = Config.WIFI_HUB_X_MIN.value
+    wifi_hub_x_max: int = Config.WIFI_HUB_X_MAX.value
+    wifi_hub_y_min: int = Config.WIFI_HUB_Y_MIN.value
+    wifi_hub_y_max: int = Config.WIFI_HUB_Y_MAX.value
+
+    dirt_num: int = Config.DIRT_NUM.value
+    dirt_x_min: int = Config.DIRT_X_MIN.value
+    dirt_x_max: int = Config.DIRT_X_MAX.value
+    dirt_y_min: int = Config.DIRT_Y_MIN.value
+    dirt_y_max: int = Config.DIRT_Y_MAX.value
+
+    cat_num: int = 0  # Config.CAT_NUM is an alias of BOT_THETA_MIN (0.0) in the Enum
+    cat_avoid_distance: float = Config.CAT_AVOID_DISTANCE.value
+
+    obstacles: tuple = Config.OBSTACLES.value
+
+    # Strategy knobs
+    charger_gain: float = 200000  # light intensity of a charger at unit distance
+    charger_field_resolution: float = 0  # raster spacing of precomputed charger light; 0 senses exactly
+    low_battery: int = 800  # below this battery level the bot heads for a charger
+    dirt_threshold: int = 10  # a_star_strategy stays in cells holding more dirt than this
+    allocate_tasks: bool = False  # assign target cells fleet-wide; chase bots keep them until emptied
+    allocation_dirt_weight: float = 3.0  # moves of travel one piece of dirt is worth to the allocator
+    strategy: str = "a_star"  # brain of the bots: a_star, chase, random_walk, coverage, tour or explore
+    coverage_lane_spacing: float = 50  # distance between boustrophedon lanes; the pickup diameter is 60
+    coverage_clearance: float = 45  # distance the coverage and tour strategies keep from obstacles
+    tour_time_budget: float = 0.005  # seconds of 2-opt/Or-opt per tour re-optimisation
+    incremental_planning: bool = False  # each bot repairs its own D* Lite search instead of replanning
+
+    def with_overrides(self, **overrides):
+        """
+        Args:
+            **overrides: New values by field name. Strings given for non-string fields
+                are parsed: ``true``/``false`` in any case for booleans, JSON for numbers
+                and tuples such as the obstacle list.
+
+        Returns:
+            RuntimeConfig: A copy of this config with the given fields replaced.
+
+        Raises:
+            ValueError: If a name is not a config field, or a value does not parse or
+                does not match the type of its field.
+        """
+        values = {}
+        for name, value in overrides.items():
+            if name not in self.__dataclass_fields__:
+                raise ValueError(f"Unknown config field: {name}")
+            values[name] = self._coerce(name, value)
+        return replace(self, **values)
+
+    def _coerce(self, name, value):
+        kind = self.__dataclass_fields__[name].type
+        if isinstance(value, str) and kind is not str:
+            text = value.strip()
+            if kind is bool and text.lower() in ("true", "false"):
+                value = text.lower() == "true"  # Python and TOML spellings alike
+            else:
+                try:
+                    value = json.loads(text)  # numbers and obstacle lists given on the command line
+                except json.JSONDecodeError:
+                    raise ValueError(f"Config field {name} expects {kind.__name__}, "
+                                     f"got unparsable {value!r}") from None
+        if kind is int and isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if kind is tuple and isinstance(value, list):
+            value = tuple(tuple(item) if isinstance(item, list) else item for item in value)
+        if isinstance(value, bool) != (kind is bool) or not isinstance(value, _ACCEPTED[kind]):
+            raise ValueError(f"Config field {name} expects {kind.__name__}, "
+                             f"got {type(value).__name__} {value!r}")
+        return value
+
+    @classmethod
+    def for_arena(cls, width, height, cell_size=Config.CELL_SIZE.value, margin=None, **overrides):
+        """
+        Size the arena, the grid and every spawn range consistently.
+
+        Args:
+            width (int): Width of the arena in pixels.
+            height (int): Height of the arena in pixels.
+            cell_size (int): Side length of a grid cell in pixels.
+            margin (int, optional): Distance of the spawn ranges from the walls.
+                Defaults to one cell.
+            **overrides: Further field values, as in `with_overrides`.
+
+        Returns:
+            RuntimeConfig: The config; ``for_arena(1000, 1000)`` equals the defaults.
+        """
+        margin = cell_size if margin is None else margin
+        ranges = {}
+        for prefix in ("bot", "charger", "wifi_hub", "dirt"):
+            ranges.update({f"{prefix}_x_min": margin, f"{prefix}_x_max": width - margin,
+                           f"{prefix}_y_min": margin, f"{prefix}_y_max": height - margin})
+        arena = cls(canvas_width=width, canvas_height=height, cell_size=cell_size,
+                    map_width=-(-width // cell_size), map_height=-(-height // cell_size), **ranges)
+        return arena.with_overrides(**overrides)
+
+    @classmethod
+    def from_file(cls, path, base=None):
+        """
+        Load a config from a TOML or JSON file of field values.
+
+        Args:
+            path (str): A ``.toml`` or ``.json`` file; keys are field names.
+            base (RuntimeConfig, optional): Config supplying values missing from the
+                file. Defaults to the built-in defaults.
+
+        Returns:
+            RuntimeConfig: The loaded config.
+        """
+        if path.endswith(".toml"):
+            import tomllib
+            with open(path, "rb") as file:
+                values = tomllib.load(file)
+        else:
+            with open(path, encoding="utf-8") as file:
+                values = json.load(file)
+        return (base if base is not None else cls()).with_overrides(**values)
+
+    @classmethod
+    def from_args(cls, path=None, overrides=()):
+        """
+        Build a config the way the command-line tools do: defaults, then an optional
+        file, then ``name=value`` overrides.
+
+        Args:
+            path (str, optional): Config file passed to `from_file`.
+            overrides (iterable): Strings of the form ``name=value``.
+
+        Returns:
+            RuntimeConfig: The resulting config.
+
+        Raises:
+            ValueError: If an override is not of the form ``name=value``.
+        """
+        config = cls.from_file(path) if path else cls()
+        values = {}
+        for override in overrides:
+            name, sep, value = override.partition("=")
+            if not sep:
+                raise ValueError(f"Expected name=value, got: {override}")
+            values[name.strip()] = value.strip()
+        return config.with_overrides(**values)
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Field values by name, suitable for JSON.
+        """
+        return asdict(self)
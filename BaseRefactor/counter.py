@@ -1,23 +1,33 @@
 class Counter:
     """A counter class to track the amount of dirt collected."""
 
-    def __init__(self, canvas):
+    def __init__(self, canvas=None):
         """
         Initializes the counter.
 
         Args:
             canvas: The tkinter canvas object where the counter display will be rendered.
+                If None, the counter runs headless until `attach` is called.
         """
         self.dirt_collected = 0
-        self.milestone_data = {}  # 记录关键点的数据
-        self.milestones = [100, 200, 300, 400, 500]  # 需要记录的移动次数
 
-        self.canvas = canvas  
+        self.canvas = None
+        if canvas is not None:
+            self.attach(canvas)
+
+    def attach(self, canvas):
+        """
+        Attach a canvas and draw the counter display on it.
+
+        Args:
+            canvas: The tkinter canvas object where the counter display will be rendered.
+        """
+        self.canvas = canvas
         self.canvas.create_text(
-            70,  
-            50,  
-            text="Dirt collected: " + str(self.dirt_collected),  
-            tags="counter",  
+            70,
+            50,
+            text="Dirt collected: " + str(self.dirt_collected),
+            tags="counter",
         )
 
     def item_collected(self):
@@ -26,14 +36,8 @@ class Counter:
 
         This method should be called whenever a piece of dirt is collected.
         """
-        self.dirt_collected += 1  
-        self.canvas.itemconfigure(
-            "counter", text="Dirt collected: " + str(self.dirt_collected)
-        )
-
-
-    def check_milestone(self, current_moves):
-        for milestone in self.milestones:
-            if current_moves == milestone:
-                self.milestone_data[milestone] = self.dirt_collected
-        return self.milestone_data
+        self.dirt_collected += 1
+        if self.canvas is not None:
+            self.canvas.itemconfigure(
+                "counter", text="Dirt collected: " + str(self.dirt_collected)
+            )
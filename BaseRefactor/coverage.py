@@ -0,0 +1,291 @@
+from collections import deque
+import itertools
+import math
+
+from obstacles import ObstacleMap
+
+
+class CoveragePlan:
+    """Boustrophedon coverage route over the free space of a scenario.
+
+    The arena minus the obstacles (inflated by a safety clearance) is split by a
+    vertical sweep line stopping at every obstacle edge. Each free interval of a
+    slab between two stops is a rectangular cell; slabs continuing the same
+    interval are merged. Cells are ordered by a depth-first walk of their
+    adjacency graph starting at the leftmost cell, and each cell is covered with
+    back-and-forth vertical lanes. Moving between cells only crosses shared cell
+    boundaries, so every leg of the route stays in obstacle-free rectangles.
+
+    A plan depends only on the scenario, so it is built once and shared; bots
+    take contiguous shares of its lanes with `waypoints`.
+    """
+
+    _cache = {}
+
+    def __init__(self, obstacles, x_range, y_range, lane_spacing, clearance):
+        """
+        Args:
+            obstacles (ObstacleMap): The obstacles of the scenario.
+            x_range (tuple): (min, max) x of the area to cover.
+            y_range (tuple): (min, max) y of the area to cover.
+            lane_spacing (float): Maximum distance between neighbouring lanes.
+            clearance (float): Distance kept from every obstacle.
+        """
+        self.x_range = x_range
+        self.y_range = y_range
+        self.lane_spacing = lane_spacing
+        self.clearance = clearance
+        self.cells = []  # (x0, x1, y0, y1) rectangles
+        self.neighbours = {}  # cell -> {neighbour: (boundary x, overlap low, overlap high)}
+        self._decompose(obstacles.inflated(clearance).rects.tolist())
+        self.order = self._sweep_order()
+        self.lanes = self._lanes()  # (cell, x, y_start, y_end) in route order
+        self._paths = {}
+
+    @classmethod
+    def for_config(cls, config):
+        """
+        The plan of a scenario, built on first use and cached for the process.
+
+        Args:
+            config (RuntimeConfig): Settings of the run; the obstacles, the bots'
+                allowed area and the coverage knobs define the plan.
+
+        Returns:
+            CoveragePlan: The shared plan.
+        """
+        key = (config.obstacles, config.bot_x_min, config.bot_x_max, config.bot_y_min,
+               config.bot_y_max, config.coverage_lane_spacing, config.coverage_clearance)
+        if key not in cls._cache:
+            cls._cache[key] = cls(ObstacleMap.from_config(config),
+                                  (config.bot_x_min, config.bot_x_max),
+                                  (config.bot_y_min, config.bot_y_max),
+                                  config.coverage_lane_spacing, config.coverage_clearance)
+        return cls._cache[key]
+
+    def _decompose(self, rects):
+        x_min, x_max = self.x_range
+        y_min, y_max = self.y_range
+        stops = sorted({x_min, x_max} | {x for r in rects for x in (r[0], r[2]) if x_min < x < x_max})
+        previous = []  # (cell, low, high) of the last slab
+        for a, b in zip(stops, stops[1:]):
+            # every rectangle overlapping the slab spans it, since its edges are stops
+            spans = sorted((r[1], r[3]) for r in rects if r[0] <= a and r[2] >= b)
+            intervals, low = [], y_min
+            for top, bottom in spans:
+                if top > low:
+                    intervals.append((low, min(top, y_max)))
+                low = max(low, bottom)
+            if low < y_max:
+                intervals.append((low, y_max))
+
+            current = []
+            for low, high in intervals:
+                if high <= low:
+                    continue
+                same = [cell for cell, lo, hi in previous if (lo, hi) == (low, high)]
+                if same:
+                    cell = same[0]
+                    x0, _, y0, y1 = self.cells[cell]
+                    self.cells[cell] = (x0, b, y0, y1)
+                else:
+                    cell = len(self.cells)
+                    self.cells.append((a, b, low, high))
+                    self.neighbours[cell] = {}
+                    for other, lo, hi in previous:
+                        if min(hi, high) > max(lo, low):
+                            edge = (a, max(lo, low), min(hi, high))
+                            self.neighbours[cell][other] = edge
+                            self.neighbours[other][cell] = edge
+                current.append((cell, low, high))
+            previous = current
+
+    def _sweep_order(self):
+        if not self.cells:
+            return []
+        start = min(range(len(self.cells)), key=lambda c: (self.cells[c][0], self.cells[c][2]))
+        order, seen, stack = [], set(), [start]
+        while stack:
+            cell = stack.pop()
+            if cell in seen:
+                continue
+            seen.add(cell)
+            order.append(cell)
+            # leftmost, then topmost neighbour first
+            nxt = sorted(self.neighbours[cell], key=lambda c: (self.cells[c][0], self.cells[c][2]))
+            stack.extend(reversed([c for c in nxt if c not in seen]))
+        return order
+
+    def _lanes(self):
+        lanes = []
+        x, y = self.x_range[0], self.y_range[0]
+        for cell in self.order:
+            x0, x1, y0, y1 = self.cells[cell]
+            count = max(1, math.ceil((x1 - x0) / self.lane_spacing))
+            width = (x1 - x0) / count
+            xs = [x0 + (k + 0.5) * width for k in range(count)]
+            if abs(xs[-1] - x) < abs(xs[0] - x):
+                xs.reverse()
+            down = abs(y0 - y) <= abs(y1 - y)
+            for lane_x in xs:
+                start, end = (y0, y1) if down else (y1, y0)
+                lanes.append((cell, lane_x, start, end))
+                down = not down
+            x, y = xs[-1], lanes[-1][3]
+        return lanes
+
+    def locate(self, x, y):
+        """
+        Args:
+            x (float): x-coordinate.
+            y (float): y-coordinate.
+
+        Returns:
+            tuple: The cell containing (x, y), or the nearest one, and the nearest
+                point of that cell.
+        """
+        best = None
+        for cell, (x0, x1, y0, y1) in enumerate(self.cells):
+            px, py = min(max(x, x0), x1), min(max(y, y0), y1)
+            d2 = (px - x) ** 2 + (py - y) ** 2
+            if best is None or d2 < best[0]:
+                best = (d2, cell, (px, py))
+        return best[1], best[2]
+
+    def _cell_path(self, source, target):
+        key = (source, target)
+        if key not in self._paths:
+            parent = {source: None}
+            queue = deque([source])
+            while queue and target not in parent:
+                cell = queue.popleft()
+                for other in self.neighbours[cell]:
+                    if other not in parent:
+                        parent[other] = cell
+                        queue.append(other)
+            path = []
+            cell = target if target in parent else None
+            while cell is not None:
+                path.append(cell)
+                cell = parent[cell]
+            self._paths[key] = path[::-1]
+        return self._paths[key]
+
+    def _transit(self, cell, point, target_cell):
+        """Waypoints from `point` in `cell` into `target_cell` through shared boundaries."""
+        y = point[1]
+        path = self._cell_path(cell, target_cell)
+        for a, b in zip(path, path[1:]):
+            boundary, low, high = self.neighbours[a][b]
+            y = min(max(y, low), high)
+            yield boundary, y
+
+    def shares(self, count):
+        """
+        Split the lanes into contiguous shares of similar length.
+
+        Args:
+            count (int): Number of shares, e.g. bots.
+
+        Returns:
+            list: (first, stop) lane index ranges, one per share.
+        """
+        lengths = [abs(end - start) + self.lane_spacing for _, _, start, end in self.lanes]
+        total = sum(lengths)
+        bounds, walked, share = [0], 0.0, 1
+        for i, length in enumerate(lengths):
+            walked += length
+            while share < count and walked >= total * share / count:
+                bounds.append(i + 1)
+                share += 1
+        bounds += [len(self.lanes)] * (count + 1 - len(bounds))
+        return list(zip(bounds, bounds[1:]))
+
+    def waypoints(self, x, y, first=0, stop=None):
+        """
+        Stream the waypoints that cover lanes ``first`` to ``stop`` from a start position.
+
+        Args:
+            x (float): x-coordinate of the start.
+            y (float): y-coordinate of the start.
+            first (int): Index of the first lane.
+            stop (int, optional): Index past the last lane. Defaults to all lanes.
+
+        Yields:
+            tuple: (x, y) waypoints.
+        """
+        lanes = self.lanes[first:stop]
+        if not lanes:
+            return
+        cell, point = self.locate(x, y)
+        yield point
+        for lane_cell, lane_x, start, end in lanes:
+            for boundary in self._transit(cell, point, lane_cell):
+                yield boundary
+                point = boundary
+            cell = lane_cell
+            yield lane_x, start
+            yield lane_x, end
+            point = (lane_x, end)
+
+
+class CoverageCursor:
+    """A bot's position along its share of a `CoveragePlan`."""
+
+    def __init__(self, waypoints):
+        """
+        Args:
+            waypoints (iterator): Waypoints still to visit.
+        """
+        self.waypoints = waypoints
+        self.target = None
+        self.ticks_left = 0  # ticks before an unreachable target is skipped
+        self.rejoin = None  # target to get back to after a detour
+
+    def advance(self, x, y, speed):
+        """
+        Move on to the next waypoint.
+
+        Args:
+            x (float): x-coordinate of the bot.
+            y (float): y-coordinate of the bot.
+            speed (float): Cruising speed, used to budget the ticks to the waypoint.
+
+        Returns:
+            tuple: The new target, or None when the route is finished.
+        """
+        if self.target == self.rejoin:
+            self.rejoin = None
+        self.target = next(self.waypoints, None)
+        if self.target is not None:
+            self._budget(x, y, speed)
+        return self.target
+
+    def detour(self, plan, x, y, speed):
+        """
+        Go round to the target through the free cells of the plan.
+
+        For a bot pushed off its route, e.g. by a cat, whose straight leg to the target
+        now runs into an obstacle. The bot heads for the nearest point of the free cells
+        and crosses into the target's cell through shared boundaries. A bot already on
+        a detour keeps to it.
+
+        Args:
+            plan (CoveragePlan): The plan the waypoints come from.
+            x (float): x-coordinate of the bot.
+            y (float): y-coordinate of the bot.
+            speed (float): Cruising speed, used to budget the ticks to the waypoint.
+        """
+        if self.target is None or self.rejoin is not None:
+            return
+        cell, point = plan.locate(x, y)
+        target_cell, _ = plan.locate(*self.target)
+        self.rejoin = self.target
+        self.waypoints = itertools.chain(plan._transit(cell, point, target_cell), [self.target],
+                                         self.waypoints)
+        self.target = point
+        self._budget(x, y, speed)
+
+    def _budget(self, x, y, speed):
+        distance = math.hypot(self.target[0] - x, self.target[1] - y)
+        self.ticks_left = int(3 * distance / speed) + 60
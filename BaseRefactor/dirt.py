@@ -1,7 +1,12 @@
 from canvas_object import CanvasObject
+import heapq
 import random
 
-from config import Config
+import numpy as np
+
+from config import RuntimeConfig
+from obstacles import ObstacleMap
+from spatial import GridIndex
 
 
 class Dirt(CanvasObject):
@@ -16,15 +21,44 @@ class Dirt(CanvasObject):
         """
         super().__init__()
         self.name = name
-        while True:
-            self.x = random.randint(Config.DIRT_X_MIN.value, Config.DIRT_X_MAX.value)
-            self.y = random.randint(Config.DIRT_Y_MIN.value, Config.DIRT_Y_MAX.value)
+        self.x, self.y = self.random_position()
+
+    @staticmethod
+    def random_positions(num, obstacles=None, rng=random, config=None):
+        """
+        Draw random positions for dirt, keeping clear of the obstacle areas.
+
+        Args:
+            num (int): Number of positions.
+            obstacles (ObstacleMap, optional): Obstacles to avoid. Defaults to the configured ones.
+            rng: Random number generator. Defaults to the `random` module.
+            config (RuntimeConfig, optional): Settings of the run. Defaults to the built-in ones.
+
+        Returns:
+            numpy.ndarray: A (num, 2) array of (x, y) coordinates.
+        """
+        if config is None:
+            config = RuntimeConfig()
+        if obstacles is None:
+            obstacles = ObstacleMap.from_config(config)
+        return obstacles.sample_free(
+            num,
+            (config.dirt_x_min, config.dirt_x_max),
+            (config.dirt_y_min, config.dirt_y_max),
+            margin=10,
+            rng=rng,
+        )
+
+    @staticmethod
+    def random_position():
+        """
+        Draw a random position for a piece of dirt outside the obstacle areas.
 
-            # 如果生成的位置不在障碍区域内，就跳出循环
-            if not ((290 <= self.x <= 410 and 290 <= self.y <= 510)
-            or (590 <= self.x <= 710 and 290 <= self.y <= 410)
-            or (490 <= self.x <= 610 and 690 <= self.y <= 810)):
-                break
+        Returns:
+            tuple: The (x, y) coordinates.
+        """
+        x, y = Dirt.random_positions(1)[0]
+        return int(x), int(y)
 
     def draw(self, canvas):
         """
@@ -41,3 +75,301 @@ class Dirt(CanvasObject):
             fill="grey",
             tags=self.name,
         )
+
+
+class DirtView:
+    """Read-only object view of one row of a `DirtField`, for code that expects `Dirt` objects."""
+
+    __slots__ = ("field", "id")
+
+    def __init__(self, field, dirt_id):
+        self.field = field
+        self.id = dirt_id
+
+    @property
+    def name(self):
+        return "Dirt" + str(self.id)
+
+    @property
+    def x(self):
+        return float(self.field.x[self.id])
+
+    @property
+    def y(self):
+        return float(self.field.y[self.id])
+
+    def get_location(self):
+        return self.x, self.y
+
+    def __eq__(self, other):
+        return isinstance(other, DirtView) and other.field is self.field and other.id == self.id
+
+    def __hash__(self):
+        return hash((id(self.field), self.id))
+
+
+class CellCounts:
+    """Dirt count per grid cell, maintained incrementally.
+
+    Counts live in a NumPy grid indexed [col, row] and are decremented in O(1) per
+    collected piece of dirt. If that grid would exceed `DENSE_MAX_CELLS` cells, as
+    on very large arenas, only the cells that held dirt at the start are stored:
+    their (col, row) keys are kept sorted next to their counts, so memory grows
+    with the amount of dirt rather than the arena, and lookups take O(log n). The
+    dirtiest cells are served from a max-heap that is invalidated lazily: every
+    count change pushes a fresh entry, and stale entries are discarded when they
+    reach the top.
+    """
+
+    DENSE_MAX_CELLS = 1 << 22  # 32 MB of counts
+
+    def __init__(self, cols, rows):
+        """
+        Args:
+            cols (numpy.ndarray): Grid column of every piece of dirt.
+            rows (numpy.ndarray): Grid row of every piece of dirt; cells are non-negative.
+        """
+        keys, counts = np.unique(self._key(cols, rows), return_counts=True)
+        # cells that held dirt at the start, in column-major order
+        self.cols = keys >> 32
+        self.rows = keys & 0xFFFFFFFF
+        width = int(self.cols.max()) + 1 if len(keys) else 0
+        height = int(self.rows.max()) + 1 if len(keys) else 0
+        if width * height <= self.DENSE_MAX_CELLS:
+            self.keys = self.counts = None
+            self.grid = np.zeros((width, height), dtype=np.int64)
+            self.grid[self.cols, self.rows] = counts
+        else:
+            self.keys = keys
+            self.counts = counts.astype(np.int64)
+            self.grid = None
+        self.heap = [(-count, col, row) for count, col, row in
+                     zip(counts.tolist(), self.cols.tolist(), self.rows.tolist())]
+        heapq.heapify(self.heap)
+
+    @staticmethod
+    def _key(cols, rows):
+        return (np.asarray(cols, dtype=np.int64) << 32) | np.asarray(rows, dtype=np.int64)
+
+    def _slots(self, cols, rows):
+        """Indices of the given cells in the sparse `keys`, or -1 for cells never holding dirt."""
+        keys = self._key(cols, rows)
+        if len(self.keys) == 0:
+            return np.full(keys.shape, -1, dtype=np.intp)
+        slots = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return np.where(self.keys[slots] == keys, slots, -1)
+
+    def get(self, cell, default=0):
+        """
+        Args:
+            cell (tuple): Grid coordinates (col, row).
+            default (int): Value returned for cells that never held dirt.
+
+        Returns:
+            int: The number of pieces of dirt left in the cell.
+        """
+        col, row = cell
+        if self.grid is not None:
+            if 0 <= col < self.grid.shape[0] and 0 <= row < self.grid.shape[1]:
+                return int(self.grid[col, row])
+            return default
+        slot = int(self._slots(col, row))
+        return int(self.counts[slot]) if slot >= 0 else default
+
+    def nonzero(self):
+        """
+        Returns:
+            tuple: Arrays (cols, rows, counts) of the cells with dirt left, in
+                column-major order.
+        """
+        counts = self.grid[self.cols, self.rows] if self.grid is not None else self.counts
+        left = counts > 0
+        return self.cols[left], self.rows[left], counts[left]
+
+    def decrement(self, cols, rows):
+        """
+        Remove one piece of dirt from each of the given cells.
+
+        Args:
+            cols (numpy.ndarray): Grid columns of the collected dirt.
+            rows (numpy.ndarray): Grid rows of the collected dirt.
+        """
+        if self.grid is not None:
+            np.subtract.at(self.grid, (cols, rows), 1)
+            cells = set(zip(np.asarray(cols).tolist(), np.asarray(rows).tolist()))
+            counts = [int(self.grid[col, row]) for col, row in cells]
+        else:
+            slots = self._slots(cols, rows)
+            np.subtract.at(self.counts, slots, 1)
+            slots = set(slots.tolist())
+            cells = [(int(self.cols[slot]), int(self.rows[slot])) for slot in slots]
+            counts = [int(self.counts[slot]) for slot in slots]
+        for (col, row), count in zip(cells, counts):
+            if count > 0:
+                heapq.heappush(self.heap, (-count, col, row))
+
+    def _is_stale(self, entry):
+        count, col, row = entry
+        return -count != self.get((col, row))
+
+    def most_dirty(self):
+        """
+        Find the cells holding the most dirt.
+
+        Returns:
+            tuple: The maximum count and the list of (col, row) cells holding it,
+                or (0, []) if no dirt is left.
+        """
+        heap = self.heap
+        while heap and self._is_stale(heap[0]):
+            heapq.heappop(heap)
+        if not heap:
+            return 0, []
+        top = heap[0][0]
+        tied = []
+        while heap and heap[0][0] == top:
+            entry = heapq.heappop(heap)
+            if not self._is_stale(entry):
+                tied.append(entry)
+        for entry in tied:
+            heapq.heappush(heap, entry)
+        return -top, [(col, row) for _, col, row in tied]
+
+
+class DirtField:
+    """Columnar store of all the dirt in a world.
+
+    Positions live in `x`/`y` arrays and collection flips a bit in `alive`. The row
+    index of each piece of dirt is its stable integer id. A static `GridIndex` over
+    the positions serves pickup queries, so collection only looks at nearby rows,
+    and `cell_counts` keeps the per-cell totals up to date as dirt is removed.
+    Iterating the field yields `DirtView` objects for the dirt still alive.
+    """
+
+    def __init__(self, x, y, bucket_size=None, config=None):
+        """
+        Args:
+            x (array-like): x-coordinates of the dirt.
+            y (array-like): y-coordinates of the dirt.
+            bucket_size (float, optional): Bucket size of the pickup index. Defaults to half a cell.
+            config (RuntimeConfig, optional): Settings of the run. Defaults to the built-in ones.
+        """
+        if config is None:
+            config = RuntimeConfig()
+        self.cell_size = config.cell_size
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.alive = np.ones(len(self.x), dtype=bool)
+        self.count = len(self.x)
+        if bucket_size is None:
+            bucket_size = self.cell_size // 2
+        self.index = GridIndex(self.x, self.y, bucket_size)
+        self.cols = (self.x // self.cell_size).astype(np.int64)
+        self.rows = (self.y // self.cell_size).astype(np.int64)
+        self.cell_counts = CellCounts(self.cols, self.rows)
+
+    @classmethod
+    def scatter(cls, num, obstacles=None, rng=random, config=None):
+        """
+        Create a field of randomly placed dirt outside the obstacle areas.
+
+        Args:
+            num (int): Number of pieces of dirt.
+            obstacles (ObstacleMap, optional): Obstacles to avoid. Defaults to the configured ones.
+            rng: Random number generator. Defaults to the `random` module.
+            config (RuntimeConfig, optional): Settings of the run. Defaults to the built-in ones.
+
+        Returns:
+            DirtField: The new field.
+        """
+        xy = Dirt.random_positions(num, obstacles, rng, config)
+        return cls(xy[:, 0], xy[:, 1], config=config)
+
+    def __len__(self):
+        return self.count
+
+    def __bool__(self):
+        return self.count > 0
+
+    def __iter__(self):
+        return (DirtView(self, int(i)) for i in self.alive_ids())
+
+    def __getitem__(self, dirt_id):
+        return DirtView(self, dirt_id)
+
+    def __contains__(self, item):
+        return isinstance(item, DirtView) and item.field is self and bool(self.alive[item.id])
+
+    def alive_ids(self):
+        """numpy.ndarray: Ids of the dirt not yet collected, in ascending order."""
+        return np.flatnonzero(self.alive)
+
+    def cells(self, cell_size):
+        """
+        Grid cells of the dirt not yet collected.
+
+        Args:
+            cell_size (float): Side length of a cell in pixels.
+
+        Returns:
+            tuple: Arrays (cols, rows), one entry per living piece of dirt in id order.
+        """
+        alive = self.alive
+        return ((self.x[alive] // cell_size).astype(np.int64),
+                (self.y[alive] // cell_size).astype(np.int64))
+
+    def remove(self, dirt_id):
+        """
+        Mark one piece of dirt as collected.
+
+        Args:
+            dirt_id (int): The id of the dirt.
+        """
+        if self.alive[dirt_id]:
+            self.alive[dirt_id] = False
+            self.count -= 1
+            self.cell_counts.decrement(self.cols[[dirt_id]], self.rows[[dirt_id]])
+
+    def collect(self, x, y, radius):
+        """
+        Collect all living dirt strictly closer than `radius` to (x, y).
+
+        Args:
+            x (float): x-coordinate of the collector.
+            y (float): y-coordinate of the collector.
+            radius (float): Pickup radius.
+
+        Returns:
+            numpy.ndarray: The ids of the dirt collected, in ascending order.
+        """
+        ids = self.index.candidates(x, y, radius)
+        ids = ids[self.alive[ids]]
+        near = (self.x[ids] - x) ** 2 + (self.y[ids] - y) ** 2 < radius * radius
+        ids = np.sort(ids[near])
+        self.alive[ids] = False
+        self.count -= len(ids)
+        if len(ids):
+            self.cell_counts.decrement(self.cols[ids], self.rows[ids])
+        return ids
+
+    def draw(self, canvas):
+        """
+        Draw every living piece of dirt on the canvas.
+
+        Args:
+            canvas (tkinter.Canvas): The canvas on which to draw the dirt.
+
+        Returns:
+            numpy.ndarray: Canvas item ids indexed by dirt id (0 for dirt not drawn).
+        """
+        items = np.zeros(len(self.x), dtype=np.int64)
+        for i in self.alive_ids():
+            items[i] = canvas.create_oval(
+                self.x[i] - 5,
+                self.y[i] - 5,
+                self.x[i] + 5,
+                self.y[i] + 5,
+                fill="grey",
+                tags="dirt",
+            )
+        return items
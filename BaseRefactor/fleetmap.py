@@ -0,0 +1,284 @@
+import numpy as np
+
+# Number of set bits of every byte value
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1).astype(np.uint8)
+
+
+class BitGrid:
+    """A (cols, rows) boolean grid packed eight cells to a byte.
+
+    Each column is a run of ``ceil(rows / 8)`` bytes with row ``r`` in bit ``r % 8``
+    of byte ``r // 8``, so a 10,000 x 10,000 grid takes 12.5 MB instead of the
+    100 MB of a boolean array. Bits past the last row are kept clear. Set
+    operations work on whole bytes, and `window` unpacks only the block a query
+    needs. ``np.asarray(grid)`` gives the dense boolean array.
+    """
+
+    def __init__(self, cols, rows, bits=None):
+        """
+        Args:
+            cols (int): Number of grid columns.
+            rows (int): Number of grid rows.
+            bits (numpy.ndarray, optional): A (cols, ceil(rows / 8)) uint8 array to wrap
+                without copying. Defaults to an empty grid.
+        """
+        self.cols = cols
+        self.rows = rows
+        self.bits = np.zeros((cols, (rows + 7) // 8), dtype=np.uint8) if bits is None else bits
+
+    @classmethod
+    def from_mask(cls, mask):
+        """
+        Args:
+            mask (array-like): A dense (cols, rows) boolean array.
+
+        Returns:
+            BitGrid: The packed grid.
+        """
+        mask = np.asarray(mask, dtype=bool)
+        return cls(mask.shape[0], mask.shape[1], np.packbits(mask, axis=1, bitorder="little"))
+
+    @property
+    def shape(self):
+        """tuple: The (cols, rows) shape of the grid."""
+        return self.cols, self.rows
+
+    def set(self, cols, rows):
+        """
+        Set the given cells; repeated cells are fine.
+
+        Args:
+            cols (numpy.ndarray): Columns of the cells.
+            rows (numpy.ndarray): Rows of the cells.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        np.bitwise_or.at(self.bits, (cols, rows >> 3), (1 << (rows & 7)).astype(np.uint8))
+
+    def get(self, cols, rows):
+        """
+        Args:
+            cols (int or numpy.ndarray): Columns of the cells.
+            rows (int or numpy.ndarray): Rows of the cells.
+
+        Returns:
+            bool or numpy.ndarray: Whether each cell is set.
+        """
+        rows = np.asarray(rows, dtype=np.intp)
+        result = ((self.bits[cols, rows >> 3] >> (rows & 7)) & 1).astype(bool)
+        return bool(result) if result.ndim == 0 else result
+
+    def __getitem__(self, cell):
+        col, row = cell
+        return self.get(col, row)
+
+    def window(self, c0, c1, r0, r1):
+        """
+        Unpack a rectangular block of the grid.
+
+        Args:
+            c0 (int): First column.
+            c1 (int): Column past the last.
+            r0 (int): First row.
+            r1 (int): Row past the last.
+
+        Returns:
+            numpy.ndarray: A dense (c1 - c0, r1 - r0) boolean array.
+        """
+        b0 = r0 >> 3
+        block = np.unpackbits(self.bits[c0:c1, b0:(r1 + 7) >> 3], axis=1, bitorder="little")
+        return block[:, r0 - 8 * b0:r1 - 8 * b0].astype(bool)
+
+    def to_dense(self):
+        """
+        Returns:
+            numpy.ndarray: The whole grid as a (cols, rows) boolean array.
+        """
+        return self.window(0, self.cols, 0, self.rows)
+
+    def __array__(self, dtype=None, copy=None):
+        dense = self.to_dense()
+        return dense if dtype is None else dense.astype(dtype)
+
+    def count(self):
+        """
+        Returns:
+            int: Number of set cells.
+        """
+        return int(_POPCOUNT[self.bits].sum(dtype=np.int64))
+
+    def _tail_mask(self):
+        # clears the padding bits past the last row
+        mask = np.full(self.bits.shape[1], 0xFF, dtype=np.uint8)
+        if self.rows % 8:
+            mask[-1] = (1 << (self.rows % 8)) - 1
+        return mask
+
+    def __or__(self, other):
+        return BitGrid(self.cols, self.rows, self.bits | other.bits)
+
+    def __and__(self, other):
+        return BitGrid(self.cols, self.rows, self.bits & other.bits)
+
+    def __invert__(self):
+        return BitGrid(self.cols, self.rows, ~self.bits & self._tail_mask())
+
+
+class FleetMap:
+    """Occupancy grid shared by a fleet, with one view per bot.
+
+    Visited cells are kept per bot as packed bitsets in a (bots, cols, rows / 8)
+    uint8 array, and the fleet-wide map is their bitwise OR, maintained as cells
+    are marked. A bot's map is a `BitGrid` over its slice, so reads need no
+    copying and merging any set of bot maps is a single `np.bitwise_or.reduce`.
+    At one bit per cell per bot, warehouse-sized grids fit in memory; frontier
+    queries only unpack a window around the query point.
+    """
+
+    def __init__(self, cols, rows, cell_size, blocked=None):
+        """
+        Args:
+            cols (int): Number of grid columns.
+            rows (int): Number of grid rows.
+            cell_size (float): Side length of a cell in pixels.
+            blocked (array-like or BitGrid, optional): A (cols, rows) mask of cells that
+                cannot be explored, e.g. obstacles; they are never chosen as targets.
+        """
+        self.cols = cols
+        self.rows = rows
+        self.cell_size = cell_size
+        self.per_bot = np.zeros((0, cols, (rows + 7) // 8), dtype=np.uint8)
+        self.shared = BitGrid(cols, rows)
+        if blocked is None:
+            self.blocked = BitGrid(cols, rows)
+        else:
+            self.blocked = blocked if isinstance(blocked, BitGrid) else BitGrid.from_mask(blocked)
+        centres = (np.arange(max(cols, rows)) + 0.5) * cell_size
+        self.centre_x = centres[:cols]
+        self.centre_y = centres[:rows]
+
+    def add_bot(self):
+        """
+        Append an empty map for a new bot.
+
+        Returns:
+            int: The index of the bot's map.
+        """
+        empty = np.zeros((1,) + self.per_bot.shape[1:], dtype=np.uint8)
+        self.per_bot = np.concatenate([self.per_bot, empty])
+        return len(self.per_bot) - 1
+
+    def view(self, index):
+        """
+        Args:
+            index (int): Index of the bot.
+
+        Returns:
+            BitGrid: The bot's (cols, rows) map, sharing memory with the fleet's.
+                Use `mark` for writes so the shared map stays in sync.
+        """
+        return BitGrid(self.cols, self.rows, self.per_bot[index])
+
+    def cells_of(self, x, y):
+        """
+        Args:
+            x (numpy.ndarray): x-coordinates.
+            y (numpy.ndarray): y-coordinates.
+
+        Returns:
+            tuple: Arrays (cols, rows) of the cells holding the points, clamped to the grid.
+        """
+        cols = np.clip((np.asarray(x) // self.cell_size).astype(np.intp), 0, self.cols - 1)
+        rows = np.clip((np.asarray(y) // self.cell_size).astype(np.intp), 0, self.rows - 1)
+        return cols, rows
+
+    def mark(self, index, x, y):
+        """
+        Mark the cells under the given bots as visited.
+
+        Args:
+            index (array-like): Bot indices.
+            x (numpy.ndarray): x-coordinates of the bots.
+            y (numpy.ndarray): y-coordinates of the bots.
+        """
+        cols, rows = self.cells_of(x, y)
+        bit = (1 << (rows & 7)).astype(np.uint8)
+        np.bitwise_or.at(self.per_bot, (index, cols, rows >> 3), bit)
+        self.shared.set(cols, rows)
+
+    def merged(self, index=None):
+        """
+        Args:
+            index (array-like, optional): Bots whose maps to merge. Defaults to the whole fleet.
+
+        Returns:
+            BitGrid: The union of the selected maps.
+        """
+        if index is None:
+            return self.shared
+        bits = np.bitwise_or.reduce(self.per_bot[np.atleast_1d(index)], axis=0)
+        return BitGrid(self.cols, self.rows, bits)
+
+    def _explored(self, explored):
+        if explored is None:
+            return self.shared
+        return explored if isinstance(explored, BitGrid) else BitGrid.from_mask(explored)
+
+    def frontier(self, explored=None):
+        """
+        Args:
+            explored (array-like or BitGrid, optional): Explored mask. Defaults to the shared map.
+
+        Returns:
+            BitGrid: The free cells not explored yet.
+        """
+        return ~(self._explored(explored) | self.blocked)
+
+    def nearest_unexplored(self, x, y, explored=None):
+        """
+        Find the unexplored cell with the nearest centre for each of many points.
+
+        Each point searches a square window around its cell that doubles until the
+        best candidate found is provably nearer than any cell outside it, so the
+        cost depends on how far the frontier is, not on the size of the grid.
+
+        Args:
+            x (float or numpy.ndarray): x-coordinates, e.g. bot positions.
+            y (float or numpy.ndarray): y-coordinates.
+            explored (array-like or BitGrid, optional): Explored mask. Defaults to the shared map.
+
+        Returns:
+            numpy.ndarray: A (n, 2) array of (col, row) cells, -1 where nothing is left.
+        """
+        x = np.atleast_1d(np.asarray(x, dtype=float))
+        y = np.atleast_1d(np.asarray(y, dtype=float))
+        explored = self._explored(explored)
+        result = np.full((len(x), 2), -1, dtype=np.intp)
+        for i, (col, row) in enumerate(zip(*self.cells_of(x, y))):
+            radius = 4
+            while True:
+                c0, c1 = max(col - radius, 0), min(col + radius + 1, self.cols)
+                r0, r1 = max(row - radius, 0), min(row + radius + 1, self.rows)
+                whole = c0 == 0 and r0 == 0 and c1 == self.cols and r1 == self.rows
+                free = ~explored.window(c0, c1, r0, r1) & ~self.blocked.window(c0, c1, r0, r1)
+                cols, rows = np.nonzero(free)
+                if len(cols):
+                    cols += c0
+                    rows += r0
+                    d2 = (self.centre_x[cols] - x[i]) ** 2 + (self.centre_y[rows] - y[i]) ** 2
+                    best = np.argmin(d2)
+                    # cells outside the window are more than `radius` cells away on some
+                    # axis, so their centres are at least `radius + 0.5` cells off
+                    if whole or d2[best] < ((radius + 0.5) * self.cell_size) ** 2:
+                        result[i] = cols[best], rows[best]
+                        break
+                elif whole:
+                    break
+                radius *= 2
+        return result
+
+    def coverage(self):
+        """
+        Returns:
+            float: Fraction of the grid visited by at least one bot.
+        """
+        return self.shared.count() / (self.cols * self.rows)
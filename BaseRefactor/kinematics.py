@@ -0,0 +1,358 @@
+import math
+
+import numpy as np
+
+from cat import CatRegistry
+from config import RuntimeConfig
+from fleetmap import FleetMap
+from obstacles import ObstacleMap
+
+
+def positions_of(registry, cls):
+    """
+    Collect the locations of all objects of a given type into an array.
+
+    Args:
+        registry (list): A list of passive objects, such as chargers and cats.
+        cls (type): The type of object to collect.
+
+    Returns:
+        numpy.ndarray: A (k, 2) array of (x, y) locations.
+    """
+    points = [item.get_location() for item in registry if isinstance(item, cls)]
+    return np.array(points, dtype=float).reshape(-1, 2)
+
+
+class Fleet:
+    """Struct-of-arrays state for every differential-drive robot in a world.
+
+    Poses, wheel speeds, battery and boundary-turn state are held in NumPy arrays
+    indexed by bot, so a whole fleet is integrated in one vectorized step instead of
+    one small matrix product per bot. `Bot` objects are thin views onto one index.
+    """
+
+    # The obstacle look-ahead tests the point this many ticks ahead at the current speed...
+    LOOKAHEAD_TICKS = 5
+    # ...against obstacles inflated by the boundary buffer plus this much per unit of speed
+    BUFFER_PER_SPEED = 2
+
+    def __init__(self, obstacles=None, config=None):
+        """
+        Args:
+            obstacles (ObstacleMap, optional): Obstacles the robots steer clear of.
+                Defaults to the configured ones.
+            config (RuntimeConfig, optional): Settings of the run. Defaults to the built-in ones.
+        """
+        self.config = config if config is not None else RuntimeConfig()
+        self.obstacles = obstacles if obstacles is not None else ObstacleMap.from_config(self.config)
+        config = self.config
+        self.map = FleetMap(config.map_width, config.map_height, config.cell_size,
+                            self.obstacles.rasterize(config.cell_size, config.map_width, config.map_height))
+        self.x = np.zeros(0)
+        self.y = np.zeros(0)
+        self.theta = np.zeros(0)
+        self.vl = np.zeros(0)
+        self.vr = np.zeros(0)
+        self.ll = np.zeros(0)
+        self.battery = np.zeros(0, dtype=np.int64)
+        self.is_turning = np.zeros(0, dtype=bool)
+        self.boundary_turn_count = np.zeros(0, dtype=np.int64)
+        self.boundary_buffer = np.zeros(0)
+        self.sensor_positions = np.zeros((0, 4))
+
+    def __len__(self):
+        return len(self.x)
+
+    def add(self, x, y, theta, battery, ll=60, boundary_buffer=20):
+        """
+        Append a new robot to the fleet.
+
+        Args:
+            x (float): Initial x-coordinate.
+            y (float): Initial y-coordinate.
+            theta (float): Initial heading in radians.
+            battery (int): Initial battery level.
+            ll (float): Axle width.
+            boundary_buffer (float): Base safety margin used by the boundary look-ahead.
+
+        Returns:
+            int: The index of the new robot.
+        """
+        self.x = np.append(self.x, float(x))
+        self.y = np.append(self.y, float(y))
+        self.theta = np.append(self.theta, float(theta))
+        self.vl = np.append(self.vl, 0.0)
+        self.vr = np.append(self.vr, 0.0)
+        self.ll = np.append(self.ll, float(ll))
+        self.battery = np.append(self.battery, int(battery))
+        self.is_turning = np.append(self.is_turning, False)
+        self.boundary_turn_count = np.append(self.boundary_turn_count, 0)
+        self.boundary_buffer = np.append(self.boundary_buffer, float(boundary_buffer))
+        self.sensor_positions = np.vstack([self.sensor_positions, np.zeros((1, 4))])
+        self.map.add_bot()
+        index = len(self.x) - 1
+        self.update_sensor_positions(np.array([index]))
+        return index
+
+    def update_map(self, index=None):
+        """
+        Mark the map cells under the selected robots as visited.
+
+        Args:
+            index (array-like, optional): Robot indices. Defaults to the whole fleet.
+        """
+        idx = self._select(index)
+        self.map.mark(idx, self.x[idx], self.y[idx])
+
+    def _select(self, index):
+        if index is None:
+            return np.arange(len(self.x))
+        return np.atleast_1d(np.asarray(index, dtype=np.intp))
+
+    def update_sensor_positions(self, index=None):
+        """
+        Recompute the two light sensor positions of the selected robots from their poses.
+
+        Args:
+            index (array-like, optional): Robot indices to update. Defaults to the whole fleet.
+        """
+        idx = self._select(index)
+        x, y, theta = self.x[idx], self.y[idx], self.theta[idx]
+        sin_t = np.sin(theta)
+        cos_t = np.cos(theta)
+        # sin(pi/2 - theta) == cos(theta) and cos(pi/2 - theta) == sin(theta)
+        self.sensor_positions[idx, 0] = x + 20 * sin_t + 30 * cos_t
+        self.sensor_positions[idx, 1] = y - 20 * cos_t + 30 * sin_t
+        self.sensor_positions[idx, 2] = x - 20 * sin_t + 30 * cos_t
+        self.sensor_positions[idx, 3] = y + 20 * cos_t + 30 * sin_t
+
+    def sense_chargers(self, chargers, gain, index=None):
+        """
+        Light intensity measured by the left and right sensors of the selected robots.
+
+        Every charger contributes `gain / d**2` to each sensor, where d is the
+        sensor-charger distance. All robots and chargers are handled in one broadcast
+        on squared distances, so no square roots are taken.
+
+        Args:
+            chargers (numpy.ndarray): A (k, 2) array of charger locations.
+            gain (float): Intensity of a charger at unit distance.
+            index (array-like, optional): Robot indices to sense for. Defaults to the whole fleet.
+
+        Returns:
+            numpy.ndarray: A (n, 2) array of (left, right) intensities.
+        """
+        idx = self._select(index)
+        sensors = self.sensor_positions[idx].reshape(-1, 2, 1, 2)  # bot, side, charger, xy
+        d2 = ((chargers[None, None, :, :] - sensors) ** 2).sum(axis=-1)
+        return (gain / d2).sum(axis=-1)
+
+    def init_boundary_turn(self, index):
+        """
+        Start a boundary turn for the selected robots.
+
+        The turn direction is chosen from each robot's heading so that it turns back
+        toward the centre of the arena, and the turn lasts long enough for a half turn.
+        Positions are clamped inside the allowed area.
+
+        Args:
+            index (array-like): Robot indices that should start turning.
+        """
+        idx = self._select(index)
+        if len(idx) == 0:
+            return
+        turn_speed = 15.0
+        current_angle = self.theta[idx] % (2 * math.pi)
+        forward = (current_angle < math.pi / 2) | (current_angle > 3 * math.pi / 2)
+        self.is_turning[idx] = True
+        self.vl[idx] = np.where(forward, turn_speed, -turn_speed)
+        self.vr[idx] = -self.vl[idx]
+
+        omega = np.abs((self.vl[idx] - self.vr[idx]) / self.ll[idx])
+        self.boundary_turn_count[idx] = np.ceil(math.pi / omega).astype(np.int64) + 3
+
+        config = self.config
+        self.x[idx] = np.clip(self.x[idx], config.bot_x_min + 50, config.bot_x_max - 50)
+        self.y[idx] = np.clip(self.y[idx], config.bot_y_min + 50, config.bot_y_max - 50)
+
+    def avoid_cats(self, cats, index=None):
+        """
+        Steer the selected robots away from nearby cats.
+
+        For a cat within `cat_avoid_distance` the wheel speeds are set to turn the
+        robot perpendicular to the threat vector. When several cats are close, the last
+        one in `cats` wins, as with the original per-bot loop. Close pairs come from the
+        registry's spatial index, and the steering of all robots is computed at once.
+
+        Args:
+            cats (CatRegistry or numpy.ndarray): The cats, or a (k, 2) array of their locations.
+            index (array-like, optional): Robot indices to steer. Defaults to the whole fleet.
+        """
+        if len(cats) == 0:
+            return
+        avoid_distance = self.config.cat_avoid_distance
+        if not isinstance(cats, CatRegistry):
+            cats = CatRegistry(cats, avoid_distance)
+        idx = self._select(index)
+        bot_i, cat_i = cats.near(self.x[idx], self.y[idx], avoid_distance)
+        if len(bot_i) == 0:
+            return
+        threat = np.full(len(idx), -1, dtype=np.intp)
+        np.maximum.at(threat, bot_i, cat_i)
+        near = threat >= 0
+        sel = idx[near]
+        cat_xy = cats.positions[threat[near]]
+        base_speed = 8.0
+        escape_angle = np.arctan2(cat_xy[:, 1] - self.y[sel], cat_xy[:, 0] - self.x[sel]) + math.pi / 2
+        angle_diff = (escape_angle - self.theta[sel] + math.pi) % (2 * math.pi) - math.pi
+        turn_ratio = np.clip(angle_diff / math.pi, -1, 1) * 1.5
+        self.vl[sel] = base_speed * (1 - turn_ratio)
+        self.vr[sel] = base_speed * (1 + turn_ratio)
+
+    def _blocked(self, x, y, buffer):
+        """Whether points lie outside the arena or inside an obstacle inflated by `buffer`."""
+        config = self.config
+        out = ((x < config.bot_x_min - buffer) | (x > config.bot_x_max + buffer) |
+               (y < config.bot_y_min - buffer) | (y > config.bot_y_max + buffer))
+        return out | self.obstacles.contains(x, y, buffer, inclusive=False)
+
+    def _look_ahead(self, idx, dt):
+        """Whether the robots would get too close to the edge or an obstacle at their speeds."""
+        avg_speed = (self.vl[idx] + self.vr[idx]) / 2
+        lookahead = self.LOOKAHEAD_TICKS
+        temp_x = self.x[idx] + avg_speed * np.cos(self.theta[idx]) * dt * lookahead
+        temp_y = self.y[idx] + avg_speed * np.sin(self.theta[idx]) * dt * lookahead
+        dynamic_buffer = self.boundary_buffer[idx] + np.abs(avg_speed) * self.BUFFER_PER_SPEED
+        # a turn on the spot stays where it is, so it cannot run into anything
+        return self._blocked(temp_x, temp_y, dynamic_buffer) & (avg_speed != 0)
+
+    def clear_speed(self, index, limit, dt=1.0, steps=20):
+        """
+        The fastest speed along a robot's heading at which the look-ahead stays quiet.
+
+        Args:
+            index (int): Index of the robot.
+            limit (float): Largest average wheel speed to consider; negative to reverse.
+            dt (float): Time step of the kinematics.
+            steps (int): Number of speeds tried between 0 and `limit`.
+
+        Returns:
+            float: The largest of the tried speeds, in `limit`'s direction, up to which
+                the look-ahead does not fire; 0 if it fires even at the slowest.
+        """
+        speeds = np.linspace(0.0, limit, steps + 1)[1:]
+        reach = speeds * dt * self.LOOKAHEAD_TICKS
+        blocked = self._blocked(self.x[index] + reach * math.cos(self.theta[index]),
+                                self.y[index] + reach * math.sin(self.theta[index]),
+                                self.boundary_buffer[index] + np.abs(speeds) * self.BUFFER_PER_SPEED)
+        if not blocked.any():
+            return float(limit)
+        first = int(np.argmax(blocked))
+        return float(speeds[first - 1]) if first else 0.0
+
+    def move(self, chargers, cats, dt, index=None):
+        """
+        Advance the selected robots by one tick.
+
+        - Decreases battery and stops robots whose battery is empty.
+        - Steers robots away from nearby cats, unless that would take them into an
+          obstacle or they have already strayed out of the area.
+        - Starts a boundary turn for robots about to leave the arena or hit an obstacle;
+          robots turning on the spot are left alone.
+        - Continues boundary turns, decaying wheel speeds until the turn completes.
+        - Recharges robots close to a charger.
+        - Integrates the differential-drive kinematics for all remaining robots at once.
+
+        Args:
+            chargers (numpy.ndarray): A (k, 2) array of charger locations.
+            cats (CatRegistry or numpy.ndarray): The cats, or a (k, 2) array of their locations.
+            dt (float): Time step.
+            index (array-like, optional): Robot indices to advance. Defaults to the whole fleet.
+
+        Returns:
+            numpy.ndarray: Indices of the robots that drove (rather than turned) this tick.
+        """
+        idx = self._select(index)
+
+        battery = self.battery[idx]
+        battery[battery > 0] -= 1
+        self.battery[idx] = battery
+        empty = idx[battery == 0]
+        self.vl[empty] = 0
+        self.vr[empty] = 0
+
+        turning = self.is_turning[idx]
+        free = idx[~turning]
+        # steer away from cats before the look-ahead, so it checks the speeds actually
+        # driven; a cat is not worth running into an obstacle or out of the area, so
+        # such steering is dropped for the speeds the strategy chose
+        vl, vr = self.vl[free], self.vr[free]
+        self.avoid_cats(cats, free)
+        hit = self._look_ahead(free, dt)
+        strayed = self._blocked(self.x[free], self.y[free], 0.0)
+        veto = (hit | strayed) & ((self.vl[free] != vl) | (self.vr[free] != vr))
+        self.vl[free[veto]] = vl[veto]
+        self.vr[free[veto]] = vr[veto]
+        hit[veto] = self._look_ahead(free[veto], dt)
+        self.init_boundary_turn(free[hit])
+        moving = free[~hit]
+
+        self._continue_boundary_turn(idx[turning], dt)
+
+        charger_distance = self.config.charger_distance
+        capacity = self.config.bot_battery_capacity
+        for charger_x, charger_y in chargers:
+            near = ((np.hypot(self.x[moving] - charger_x, self.y[moving] - charger_y) <
+                     charger_distance) &
+                    (self.battery[moving] < capacity))
+            self.battery[moving[near]] += 10
+
+        self._integrate(moving, dt)
+        self.update_sensor_positions(idx)
+        return moving
+
+    def _continue_boundary_turn(self, idx, dt):
+        if len(idx) == 0:
+            return
+        self.boundary_turn_count[idx] -= 1
+
+        decay = np.where(self.boundary_turn_count[idx] > 5, 0.95, 0.85)
+        self.vl[idx] *= decay
+        self.vr[idx] *= decay
+
+        config = self.config
+        self.x[idx] = np.clip(self.x[idx], config.bot_x_min + 30, config.bot_x_max - 30)
+        self.y[idx] = np.clip(self.y[idx], config.bot_y_min + 30, config.bot_y_max - 30)
+
+        omega = (self.vl[idx] - self.vr[idx]) / self.ll[idx]
+        self.theta[idx] = (self.theta[idx] + omega * dt) % (2 * math.pi)
+
+        done = idx[(self.boundary_turn_count[idx] <= 0) | (np.abs(omega) < 0.1)]
+        self.is_turning[done] = False
+        self.vl[done] = 5.0
+        self.vr[done] = 5.0
+
+    def _integrate(self, idx, dt):
+        """Rotate each robot about its instantaneous centre of curvature."""
+        if len(idx) == 0:
+            return
+        x, y, theta = self.x[idx], self.y[idx], self.theta[idx]
+        vl, vr, ll = self.vl[idx], self.vr[idx], self.ll[idx]
+
+        straight = vl == vr
+        denominator = np.where(straight, 1.0, vl - vr)
+        R = np.where(straight, 0.0, (ll / 2.0) * ((vr + vl) / denominator))
+        omega = (vl - vr) / ll
+        icc_x = x - R * np.sin(theta)
+        icc_y = y + R * np.cos(theta)
+        cos_w = np.cos(omega * dt)
+        sin_w = np.sin(omega * dt)
+        new_x = cos_w * (x - icc_x) - sin_w * (y - icc_y) + icc_x
+        new_y = sin_w * (x - icc_x) + cos_w * (y - icc_y) + icc_y
+        new_theta = (theta + omega * dt) % (2.0 * math.pi)
+
+        new_x = np.where(straight, new_x + vr * np.cos(new_theta), new_x)
+        new_y = np.where(straight, new_y + vr * np.sin(new_theta), new_y)
+        self.x[idx] = new_x
+        self.y[idx] = new_y
+        self.theta[idx] = new_theta
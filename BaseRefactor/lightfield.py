@@ -0,0 +1,110 @@
+import numpy as np
+
+
+class ChargerField:
+    """Precomputed charger light intensity and its gradient over the arena.
+
+    Intensity follows the inverse-square law used by the light sensors: every
+    charger contributes `gain / d**2`. The field is sampled on a regular raster once
+    and looked up with bilinear interpolation, so sensing costs the same whatever
+    the number of chargers. The raster is rebuilt only when the chargers move.
+    """
+
+    def __init__(self, width, height, resolution, gain):
+        """
+        Args:
+            width (float): Width of the rastered area in pixels, starting at x = 0.
+            height (float): Height of the rastered area in pixels, starting at y = 0.
+            resolution (float): Distance between raster samples in pixels.
+            gain (float): Intensity of a charger at unit distance.
+        """
+        self.resolution = float(resolution)
+        self.gain = gain
+        self.cols = int(np.ceil(width / self.resolution)) + 1
+        self.rows = int(np.ceil(height / self.resolution)) + 1
+        self.chargers = np.zeros((0, 2))
+        self.intensity = np.zeros((self.cols, self.rows))
+        self.grad_x = np.zeros((self.cols, self.rows))
+        self.grad_y = np.zeros((self.cols, self.rows))
+
+    def update(self, chargers):
+        """
+        Rebuild the raster if the chargers have moved.
+
+        Args:
+            chargers (numpy.ndarray): A (k, 2) array of charger locations.
+
+        Returns:
+            bool: Whether the raster was rebuilt.
+        """
+        chargers = np.asarray(chargers, dtype=float).reshape(-1, 2)
+        if np.array_equal(chargers, self.chargers):
+            return False
+        self.chargers = chargers.copy()
+        xs = np.arange(self.cols) * self.resolution
+        ys = np.arange(self.rows) * self.resolution
+        px, py = np.meshgrid(xs, ys, indexing="ij")
+        self.intensity[:] = 0.0
+        self.grad_x[:] = 0.0
+        self.grad_y[:] = 0.0
+        # samples closer than half a cell would be dominated by the singularity
+        min_d2 = (self.resolution / 2) ** 2
+        for cx, cy in self.chargers:
+            dx = px - cx
+            dy = py - cy
+            d2 = np.maximum(dx * dx + dy * dy, min_d2)
+            self.intensity += self.gain / d2
+            # d/dp (gain / |p - c|^2) = -2 gain (p - c) / |p - c|^4
+            scale = -2.0 * self.gain / (d2 * d2)
+            self.grad_x += scale * dx
+            self.grad_y += scale * dy
+        return True
+
+    def _bilinear(self, raster, x, y):
+        fx = np.clip(np.asarray(x, dtype=float) / self.resolution, 0, self.cols - 1)
+        fy = np.clip(np.asarray(y, dtype=float) / self.resolution, 0, self.rows - 1)
+        i0 = np.minimum(fx.astype(np.intp), self.cols - 2)
+        j0 = np.minimum(fy.astype(np.intp), self.rows - 2)
+        tx = fx - i0
+        ty = fy - j0
+        return ((1 - tx) * (1 - ty) * raster[i0, j0] + tx * (1 - ty) * raster[i0 + 1, j0] +
+                (1 - tx) * ty * raster[i0, j0 + 1] + tx * ty * raster[i0 + 1, j0 + 1])
+
+    def sample(self, x, y):
+        """
+        Args:
+            x (float or numpy.ndarray): x-coordinates.
+            y (float or numpy.ndarray): y-coordinates.
+
+        Returns:
+            numpy.ndarray: Interpolated intensity, shaped like `x`.
+        """
+        return self._bilinear(self.intensity, x, y)
+
+    def gradient(self, x, y):
+        """
+        Interpolated intensity gradient; it points towards the nearest bright charger,
+        so strategies can home by following it.
+
+        Args:
+            x (float or numpy.ndarray): x-coordinates.
+            y (float or numpy.ndarray): y-coordinates.
+
+        Returns:
+            tuple: Arrays (dI/dx, dI/dy), shaped like `x`.
+        """
+        return self._bilinear(self.grad_x, x, y), self._bilinear(self.grad_y, x, y)
+
+    def sense(self, sensor_positions):
+        """
+        Light intensity at the two sensors of every robot.
+
+        Args:
+            sensor_positions (numpy.ndarray): A (n, 4) array of (left x, left y, right x, right y).
+
+        Returns:
+            numpy.ndarray: A (n, 2) array of (left, right) intensities.
+        """
+        xs = sensor_positions[:, 0::2]
+        ys = sensor_positions[:, 1::2]
+        return self.sample(xs, ys)
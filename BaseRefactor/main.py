@@ -1,16 +1,60 @@
-from canvas import initialize, move_it, register
-import tkinter as tk
+import argparse
 import time  # 新增时间模块
 
 
+parser = argparse.ArgumentParser(description="Cleaning robot simulation")
+parser.add_argument("--headless", action="store_true",
+                    help="run without a window, as fast as the CPU allows")
+parser.add_argument("--path-tables", metavar="DIR",
+                    help="precompute shortest-path tables for the planning grid, cached in DIR; "
+                         "grids up to 2500 cells (19 MB and a few seconds at 50x50)")
+parser.add_argument("--config", metavar="FILE", help="TOML or JSON file of config fields")
+parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                    help="override a config field, e.g. --set dirt_num=1000")
+parser.add_argument("--seed", type=int,
+                    help="seed of the run; the same seed reproduces the same world")
+parser.add_argument("--metrics", metavar="FILE",
+                    help="export the per-tick metrics of a headless run (.csv or .npz)")
+parser.add_argument("--metrics-stride", type=int, default=100,
+                    help="sample the metrics every N moves")
+parser.add_argument("--speed", type=float, default=1.0,
+                    help="real-time factor of the windowed run; 0 runs as fast as frames allow")
+parser.add_argument("--max-fps", type=float, default=30,
+                    help="upper bound on frames drawn per second")
+parser.add_argument("--render-every", type=int, metavar="N",
+                    help="draw one frame every N ticks instead of pacing by time")
+args = parser.parse_args()
+
 start_time = time.time()
 
-window = tk.Tk()  # Create the main window
-canvas = initialize(window)  # Initialize the canvas
-registry_actives, registry_passives, counter = register(canvas)  # Register simulation objects
-moves = 0  # Initialize move count
-move_it(canvas, registry_actives, registry_passives, counter, moves)  # Start the simulation loop
-window.mainloop()  # Start the Tkinter event loop
+from config import RuntimeConfig
+
+config = RuntimeConfig.from_args(args.config, args.set)
+
+if args.headless:
+    from simulation import Simulation
+
+    simulation = Simulation(config, path_table_dir=args.path_tables, seed=args.seed,
+                            metrics_stride=args.metrics_stride)
+    simulation.run()
+    simulation.print_results()
+    if args.metrics:
+        if args.metrics.endswith(".npz"):
+            simulation.metrics.to_npz(args.metrics)
+        else:
+            simulation.metrics.to_csv(args.metrics)
+else:
+    import tkinter as tk
+    from canvas import TkRunner, add_speed_control, initialize, register
+
+    window = tk.Tk()  # Create the main window
+    canvas = initialize(window, config)  # Initialize the canvas
+    simulation, renderer = register(canvas, args.path_tables, args.seed, config)  # Register simulation objects
+    runner = TkRunner(canvas, simulation, renderer, max_fps=args.max_fps,
+                      render_every=args.render_every, real_time_factor=args.speed or None)
+    add_speed_control(window, runner)
+    runner.start()  # Start the simulation loop
+    window.mainloop()  # Start the Tkinter event loop
 
 end_time = time.time()
 duration = end_time - start_time
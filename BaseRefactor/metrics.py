@@ -0,0 +1,174 @@
+import csv
+import os
+
+import numpy as np
+
+
+class MetricsRecorder:
+    """Samples per-tick series of a simulation into preallocated NumPy buffers.
+
+    A series is a name plus a function of the simulation returning a scalar or a
+    fixed-width array (e.g. one value per bot). Series are sampled at every tick that
+    is a multiple of `stride`; on all other ticks `sample` returns after a single
+    comparison, so sparse sampling costs next to nothing.
+    """
+
+    def __init__(self, capacity, stride=1):
+        """
+        Args:
+            capacity (int): Number of samples to preallocate; buffers grow if exceeded.
+            stride (int): Sample every `stride` ticks.
+        """
+        self.stride = stride
+        self.capacity = max(1, capacity)
+        self.size = 0
+        self.next_tick = stride
+        self.ticks = np.zeros(self.capacity, dtype=np.int64)
+        self.probes = {}
+        self.buffers = {}
+
+    @classmethod
+    def for_simulation(cls, simulation, stride=1):
+        """
+        Create a recorder with the standard series of a simulation:
+
+        - ``dirt_collected``: total dirt collected so far.
+        - ``battery``: battery level of every bot.
+        - ``coverage``: fraction of map cells visited by any bot.
+        - ``planner_calls``: total path queries made to the planner.
+        - ``tick_time``: mean wall-clock seconds per tick since the previous sample.
+
+        Args:
+            simulation (Simulation): The simulation to record; must already be populated.
+            stride (int): Sample every `stride` ticks.
+
+        Returns:
+            MetricsRecorder: The new recorder.
+        """
+        recorder = cls(simulation.moves_max // stride, stride)
+        recorder.add_series("dirt_collected", lambda sim: sim.counter.dirt_collected, dtype=np.int64)
+        recorder.add_series("battery", lambda sim: sim.fleet.battery,
+                            width=len(simulation.fleet), dtype=np.int64)
+        recorder.add_series("coverage", lambda sim: sim.fleet.map.coverage())
+        recorder.add_series("planner_calls", lambda sim: sim.planner.calls, dtype=np.int64)
+        last = {"tick": 0, "time": 0.0}
+
+        def tick_time(sim):
+            ticks = sim.moves - last["tick"]
+            elapsed = sim.step_time - last["time"]
+            last["tick"], last["time"] = sim.moves, sim.step_time
+            return elapsed / ticks if ticks else 0.0
+
+        recorder.add_series("tick_time", tick_time)
+        return recorder
+
+    def add_series(self, name, probe, width=None, dtype=float):
+        """
+        Register a series to sample.
+
+        Args:
+            name (str): Name of the series.
+            probe (callable): Function of the simulation returning the value to record.
+            width (int, optional): Length of the array returned by `probe`; None for scalars.
+            dtype: NumPy dtype of the buffer.
+        """
+        shape = (self.capacity,) if width is None else (self.capacity, width)
+        self.probes[name] = probe
+        self.buffers[name] = np.zeros(shape, dtype=dtype)
+
+    def sample(self, simulation):
+        """
+        Record every series if the current tick is due.
+
+        Args:
+            simulation (Simulation): The simulation that has just stepped.
+        """
+        if simulation.moves < self.next_tick:
+            return
+        self.next_tick = simulation.moves - simulation.moves % self.stride + self.stride
+        if self.size == self.capacity:
+            self._grow()
+        i = self.size
+        self.ticks[i] = simulation.moves
+        for name, probe in self.probes.items():
+            self.buffers[name][i] = probe(simulation)
+        self.size = i + 1
+
+    def _grow(self):
+        self.capacity *= 2
+        self.ticks = np.resize(self.ticks, self.capacity)
+        for name, buffer in self.buffers.items():
+            grown = np.zeros((self.capacity,) + buffer.shape[1:], dtype=buffer.dtype)
+            grown[:len(buffer)] = buffer
+            self.buffers[name] = grown
+
+    def series(self, name):
+        """
+        Args:
+            name (str): Name of the series.
+
+        Returns:
+            numpy.ndarray: The recorded samples, one row per sampled tick.
+        """
+        return self.buffers[name][:self.size]
+
+    def at(self, name, tick, default=None):
+        """
+        Args:
+            name (str): Name of the series.
+            tick (int): A sampled tick.
+            default: Value returned if `tick` was not sampled.
+
+        Returns:
+            The value of the series at `tick`.
+        """
+        i = np.searchsorted(self.ticks[:self.size], tick)
+        if i < self.size and self.ticks[i] == tick:
+            return self.buffers[name][i]
+        return default
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: ``tick`` and every series as arrays trimmed to the recorded samples.
+        """
+        data = {"tick": self.ticks[:self.size]}
+        for name in self.buffers:
+            data[name] = self.series(name)
+        return data
+
+    def to_npz(self, path):
+        """
+        Export all series to a compressed ``.npz`` archive.
+
+        Args:
+            path (str): Output file.
+        """
+        np.savez_compressed(path, **self.as_dict())
+
+    def to_csv(self, path):
+        """
+        Export all series to a CSV file, one row per sampled tick. Array series are
+        expanded to one column per element, named ``<series>_<i>``.
+
+        Args:
+            path (str): Output file; parent directories are created as needed.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        columns = [self.ticks[:self.size, None]]
+        header = ["tick"]
+        for name in self.buffers:
+            values = self.series(name)
+            if values.ndim == 1:
+                columns.append(values[:, None])
+                header.append(name)
+            else:
+                columns.append(values)
+                header.extend(f"{name}_{i}" for i in range(values.shape[1]))
+        with open(path, mode='w', newline='', encoding='utf-8') as file:
+            writer = csv.writer(file)
+            writer.writerow(header)
+            for row in zip(*(column.tolist() for column in columns)):
+                writer.writerow([value for part in row for value in part])
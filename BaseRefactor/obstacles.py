@@ -0,0 +1,164 @@
+import random
+
+import numpy as np
+
+from config import RuntimeConfig
+
+
+class ObstacleMap:
+    """Axis-aligned rectangular obstacles shared by spawning, motion and planning.
+
+    Rectangles are stored as an (k, 4) array of (x_min, y_min, x_max, y_max), so
+    point tests for many points at once are a single broadcast. Callers choose the
+    safety margin that suits them instead of hardcoding inflated rectangles.
+    """
+
+    def __init__(self, rects):
+        """
+        Args:
+            rects (array-like): Obstacle rectangles as (x_min, y_min, x_max, y_max).
+        """
+        self.rects = np.asarray(rects, dtype=float).reshape(-1, 4)
+
+    @classmethod
+    def from_config(cls, config=None):
+        """
+        Args:
+            config (RuntimeConfig, optional): Settings of the run. Defaults to the built-in ones.
+
+        Returns:
+            ObstacleMap: The obstacles of the scenario defined by `config.obstacles`.
+        """
+        return cls((config if config is not None else RuntimeConfig()).obstacles)
+
+    def __len__(self):
+        return len(self.rects)
+
+    def inflated(self, margin):
+        """
+        Args:
+            margin (float): Distance to grow every rectangle by on each side.
+
+        Returns:
+            ObstacleMap: A new map with inflated rectangles.
+        """
+        return ObstacleMap(self.rects + np.array([-margin, -margin, margin, margin]))
+
+    def contains(self, x, y, margin=0.0, inclusive=True):
+        """
+        Test which points lie inside any obstacle inflated by `margin`.
+
+        Args:
+            x (float or numpy.ndarray): x-coordinates.
+            y (float or numpy.ndarray): y-coordinates.
+            margin (float or numpy.ndarray): Inflation, either shared or one per point.
+            inclusive (bool): Whether points on the inflated boundary count as inside.
+
+        Returns:
+            bool or numpy.ndarray: True for points inside an obstacle, shaped like `x`.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        margin = np.asarray(margin, dtype=float)[..., None]
+        px, py = x[..., None], y[..., None]
+        x_min, y_min, x_max, y_max = self.rects.T
+        if inclusive:
+            inside = ((x_min - margin <= px) & (px <= x_max + margin) &
+                      (y_min - margin <= py) & (py <= y_max + margin))
+        else:
+            inside = ((x_min - margin < px) & (px < x_max + margin) &
+                      (y_min - margin < py) & (py < y_max + margin))
+        result = inside.any(axis=-1)
+        return bool(result) if result.ndim == 0 else result
+
+    def push_out(self, x, y, margin=0.0):
+        """
+        Move points out of the obstacles, inflated by `margin`, across the nearest edge.
+
+        Args:
+            x (numpy.ndarray): x-coordinates.
+            y (numpy.ndarray): y-coordinates.
+            margin (float): Inflation of the obstacles.
+
+        Returns:
+            tuple: Arrays (x, y); points outside every obstacle are unchanged. Points
+                pushed into a neighbouring obstacle are not moved again.
+        """
+        x = np.array(x, dtype=float)
+        y = np.array(y, dtype=float)
+        for x_min, y_min, x_max, y_max in self.inflated(margin).rects:
+            inside = (x_min < x) & (x < x_max) & (y_min < y) & (y < y_max)
+            if not inside.any():
+                continue
+            gaps = np.stack([x - x_min, x_max - x, y - y_min, y_max - y])[:, inside]
+            side = np.argmin(gaps, axis=0)
+            px, py = x[inside], y[inside]
+            px = np.where(side == 0, x_min, np.where(side == 1, x_max, px))
+            py = np.where(side == 2, y_min, np.where(side == 3, y_max, py))
+            x[inside], y[inside] = px, py
+        return x, y
+
+    def rasterize(self, cell_size, cols, rows, margin=0.0):
+        """
+        Mark the planning-grid cells that overlap an obstacle.
+
+        Args:
+            cell_size (float): Side length of a cell in pixels.
+            cols (int): Number of grid columns.
+            rows (int): Number of grid rows.
+            margin (float): Inflation applied to the obstacles first.
+
+        Returns:
+            numpy.ndarray: A boolean (cols, rows) array, True for blocked cells.
+        """
+        blocked = np.zeros((cols, rows), dtype=bool)
+        for x_min, y_min, x_max, y_max in self.inflated(margin).rects:
+            # cells whose open interior intersects the rectangle
+            c0 = max(int(np.floor(x_min / cell_size)), 0)
+            c1 = min(int(np.ceil(x_max / cell_size)), cols)
+            r0 = max(int(np.floor(y_min / cell_size)), 0)
+            r1 = min(int(np.ceil(y_max / cell_size)), rows)
+            blocked[c0:c1, r0:r1] = True
+        return blocked
+
+    def sample_free(self, num, x_range, y_range, margin=0.0, rng=random, max_tries=None):
+        """
+        Draw integer positions outside the obstacles by rejection sampling.
+
+        Args:
+            num (int): Number of positions to draw.
+            x_range (tuple): Inclusive (min, max) range of x.
+            y_range (tuple): Inclusive (min, max) range of y.
+            margin (float): Clearance to keep from every obstacle.
+            rng: Random number generator with a `randint` method.
+            max_tries (int, optional): Give up on a position after this many rejections.
+
+        Returns:
+            numpy.ndarray: A (n, 2) array of positions; n < num only if `max_tries` ran out.
+        """
+        points = []
+        inflated = self.inflated(margin).rects.tolist()
+        for _ in range(num):
+            tries = 0
+            while max_tries is None or tries < max_tries:
+                tries += 1
+                x = rng.randint(*x_range)
+                y = rng.randint(*y_range)
+                if not any(r[0] <= x <= r[2] and r[1] <= y <= r[3] for r in inflated):
+                    points.append((x, y))
+                    break
+        return np.array(points, dtype=float).reshape(-1, 2)
+
+    def draw(self, canvas):
+        """
+        Draw the obstacles on the canvas.
+
+        Args:
+            canvas (tk.Canvas): The canvas on which to draw the obstacles.
+        """
+        for i, (x_min, y_min, x_max, y_max) in enumerate(self.rects):
+            canvas.create_rectangle(
+                x_min, y_min,
+                x_max, y_max,
+                fill="green", width=0, tags="item" + str(i + 1)
+            )
@@ -0,0 +1,785 @@
+from collections import OrderedDict
+import bisect
+import hashlib
+import heapq
+import math
+import os
+import tempfile
+import weakref
+
+import numpy as np
+
+
+class GridMap:
+    """Blocked cells of the planning grid.
+
+    `blocked` is a boolean array indexed [col, row]. Every change bumps `version`,
+    which lets caches built on top of the map detect that they are stale. The cells
+    a change flipped are logged for the incremental planners registered with
+    `track`, so they can repair their searches; the log only keeps the changes the
+    furthest-behind of them has not applied yet.
+    """
+
+    def __init__(self, cols, rows):
+        """
+        Args:
+            cols (int): Number of grid columns.
+            rows (int): Number of grid rows.
+        """
+        self.cols = cols
+        self.rows = rows
+        self.blocked = np.zeros((cols, rows), dtype=bool)
+        self.version = 0
+        self.changes = []  # (version, (k, 2) array of the cells flipped by that version)
+        self._readers = weakref.WeakSet()
+
+    @classmethod
+    def from_obstacles(cls, obstacles, cell_size, cols, rows):
+        """
+        Create a bordered map that also blocks every cell overlapping an obstacle.
+
+        Args:
+            obstacles (ObstacleMap): The obstacles to rasterize.
+            cell_size (float): Side length of a cell in pixels.
+            cols (int): Number of grid columns.
+            rows (int): Number of grid rows.
+
+        Returns:
+            GridMap: The new map.
+        """
+        grid_map = cls.with_border(cols, rows)
+        grid_map.set_blocked(obstacles.rasterize(cell_size, cols, rows))
+        return grid_map
+
+    @classmethod
+    def with_border(cls, cols, rows):
+        """
+        Create a map whose outermost ring of cells is blocked.
+
+        Args:
+            cols (int): Number of grid columns.
+            rows (int): Number of grid rows.
+
+        Returns:
+            GridMap: The new map.
+        """
+        grid_map = cls(cols, rows)
+        # written in place: a full-size border mask would double the peak memory of large grids
+        grid_map.blocked[[0, -1], :] = True
+        grid_map.blocked[:, [0, -1]] = True
+        grid_map.version += 1
+        return grid_map
+
+    def set_blocked(self, mask):
+        """
+        Mark additional cells as blocked.
+
+        Args:
+            mask (numpy.ndarray): Boolean array of the grid's shape; True cells become blocked.
+        """
+        self._replace(self.blocked | mask)
+
+    def set_free(self, mask):
+        """
+        Unblock cells, e.g. when a temporary obstacle goes away.
+
+        Args:
+            mask (numpy.ndarray): Boolean array of the grid's shape; True cells become free.
+        """
+        self._replace(self.blocked & ~mask)
+
+    def _replace(self, blocked):
+        flipped = np.argwhere(blocked != self.blocked)
+        if len(flipped):
+            self.blocked = blocked
+            self.version += 1
+            self.changes.append((self.version, flipped))
+            # drop what every reader has applied; with no readers nothing is kept
+            oldest = min((reader.version for reader in self._readers), default=self.version)
+            del self.changes[:self._first_change_after(oldest)]
+
+    def _first_change_after(self, version):
+        return bisect.bisect_right(self.changes, version, key=lambda change: change[0])
+
+    def track(self, reader):
+        """
+        Log changes for a reader of `changes_since`.
+
+        Args:
+            reader: An object whose `version` attribute is the last version of this map
+                it has applied, e.g. a `DStarLite`. It is referenced weakly, so the log
+                stops waiting for it once it is garbage collected.
+        """
+        self._readers.add(reader)
+
+    def changes_since(self, version):
+        """
+        Args:
+            version (int): A version of this map seen earlier.
+
+        Returns:
+            numpy.ndarray: A (k, 2) array of the cells flipped since `version`, possibly
+                with repeats, or None if some of the changes were not logged.
+        """
+        logged = self.changes[self._first_change_after(version):]
+        if len(logged) != self.version - version:
+            return None
+        if not logged:
+            return np.zeros((0, 2), dtype=np.intp)
+        return np.concatenate([cells for _, cells in logged])
+
+    def digest(self):
+        """
+        Returns:
+            str: A hash of the grid shape and blocked cells, used to name persisted tables.
+        """
+        h = hashlib.sha1(f"{self.cols}x{self.rows}".encode())
+        h.update(np.packbits(self.blocked).tobytes())
+        return h.hexdigest()
+
+    def is_free(self, cell):
+        """
+        Args:
+            cell (tuple): Grid coordinates (col, row).
+
+        Returns:
+            bool: Whether the cell lies inside the grid and is not blocked.
+        """
+        col, row = cell
+        return 0 <= col < self.cols and 0 <= row < self.rows and not self.blocked[col, row]
+
+
+def a_star(grid_map, start, goal):
+    """
+    Compute the shortest 4-connected path from start to goal using the A* algorithm.
+
+    Args:
+        grid_map (GridMap): The grid to search.
+        start (tuple): The starting grid coordinates (col, row).
+        goal (tuple): The goal grid coordinates (col, row).
+
+    Returns:
+        list: A list of grid coordinates from start to goal, or [] if the goal is unreachable.
+    """
+    if not grid_map.is_free(goal):
+        return []
+
+    def heuristic(a, b):
+        return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
+
+    open_heap = [(heuristic(start, goal), 0, start)]
+    came_from = {start: None}
+    g_score = {start: 0}
+    closed_set = set()
+
+    while open_heap:
+        _, current_g, current = heapq.heappop(open_heap)
+
+        if current == goal:
+            path = []
+            while current is not None:
+                path.append(current)
+                current = came_from[current]
+            path.reverse()
+            return path
+
+        closed_set.add(current)
+
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            neighbor = (current[0] + dx, current[1] + dy)
+            if grid_map.is_free(neighbor) and neighbor not in closed_set:
+                tentative_g = current_g + 1
+                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    f_score = tentative_g + heuristic(neighbor, goal)
+                    heapq.heappush(open_heap, (f_score, tentative_g, neighbor))
+
+    return []
+
+
+# Moves on the 4-connected grid; `ShortestPathTable.next_dir` stores indices into this.
+DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+OPPOSITE = (1, 0, 3, 2)
+
+
+def breadth_first_distances(grid_map, sources):
+    """
+    Move counts from each of several cells to every cell of the grid.
+
+    All searches advance together as one batched NumPy wavefront. Blocked source cells
+    are reachable but not passable: they spread to their free neighbours and can be
+    entered from them, so dirt lying in a blocked cell is reachable.
+
+    Args:
+        grid_map (GridMap): The grid to search.
+        sources (list): Grid coordinates (col, row) of the sources.
+
+    Returns:
+        numpy.ndarray: A (len(sources), cols, rows) float array, inf where unreachable.
+    """
+    cols, rows = grid_map.cols, grid_map.rows
+    free = ~grid_map.blocked
+    dist = np.full((len(sources), cols, rows), np.inf)
+    if not sources:
+        return dist
+    index = np.arange(len(sources))
+    source_cols, source_rows = np.array(sources).T
+    frontier = np.zeros((len(sources), cols, rows), dtype=bool)
+    frontier[index, source_cols, source_rows] = True
+    dead_ends = frontier.any(axis=0) & ~free
+    visited = frontier.copy()
+    dist[frontier] = 0
+    level = 0
+    while frontier.any():
+        level += 1
+        reached = np.zeros_like(frontier)
+        for dx, dy in DIRECTIONS:
+            reached[:, max(dx, 0):cols + min(dx, 0), max(dy, 0):rows + min(dy, 0)] |= \
+                frontier[:, max(-dx, 0):cols + min(-dx, 0), max(-dy, 0):rows + min(-dy, 0)]
+        reached &= ~visited
+        entered = reached & dead_ends
+        reached &= free
+        visited |= reached | entered
+        dist[reached | entered] = level
+        frontier = reached
+    return dist
+
+
+class ShortestPathTable:
+    """All-pairs shortest-path tables for a static `GridMap`.
+
+    Cells are flattened as `col * rows + row`. `dist[t, c]` is the number of moves
+    from cell `c` to target `t` and `next_dir[t, c]` is the index into `DIRECTIONS`
+    of the first move on a shortest path, so a path query is a table walk. Tables
+    are built with one breadth-first search per target, run as a batched NumPy
+    wavefront over many targets at once. Memory is 3 bytes per cell pair, so the
+    cost grows with the fourth power of the grid side: a 10x10 grid takes 30 KB,
+    a 50x50 grid about 19 MB and 4 seconds, a 100x100 grid 300 MB and over a
+    minute. Grids of more than `MAX_CELLS` cells are refused.
+    """
+
+    UNREACHABLE = np.iinfo(np.uint16).max
+    NO_MOVE = np.iinfo(np.uint8).max
+    MAX_CELLS = 2500
+
+    def __init__(self, grid_map, dist, next_dir):
+        self.cols = grid_map.cols
+        self.rows = grid_map.rows
+        self.version = grid_map.version
+        self.free = ~grid_map.blocked
+        self.dist = dist
+        self.next_dir = next_dir
+
+    @classmethod
+    def build(cls, grid_map, batch_cells=1 << 22):
+        """
+        Run a breadth-first search from every free cell.
+
+        Args:
+            grid_map (GridMap): The grid to tabulate.
+            batch_cells (int): Rough upper bound on cells processed per NumPy operation.
+
+        Returns:
+            ShortestPathTable: The new tables.
+
+        Raises:
+            ValueError: If the grid has more than `MAX_CELLS` cells.
+        """
+        cols, rows = grid_map.cols, grid_map.rows
+        n = cols * rows
+        if n > cls.MAX_CELLS:
+            raise ValueError(f"Shortest-path tables for a {cols}x{rows} grid would take "
+                             f"{3 * n * n / 1e6:.0f} MB; at most {cls.MAX_CELLS} cells are supported")
+        free = ~grid_map.blocked
+        dist = np.full((n, n), cls.UNREACHABLE, dtype=np.uint16)
+        next_dir = np.full((n, n), cls.NO_MOVE, dtype=np.uint8)
+        targets = np.flatnonzero(free.ravel())
+        batch = max(1, batch_cells // n)
+
+        for lo in range(0, len(targets), batch):
+            chunk = targets[lo:lo + batch]
+            frontier = np.zeros((len(chunk), cols, rows), dtype=bool)
+            frontier.reshape(len(chunk), n)[np.arange(len(chunk)), chunk] = True
+            visited = frontier.copy()
+            chunk_dist = dist[chunk].reshape(len(chunk), cols, rows)
+            chunk_next = next_dir[chunk].reshape(len(chunk), cols, rows)
+            chunk_dist[frontier] = 0
+            level = 0
+            while frontier.any():
+                level += 1
+                reached = np.zeros_like(frontier)
+                for k, (dx, dy) in enumerate(DIRECTIONS):
+                    # cells one step of (dx, dy) away from the frontier; they move back by OPPOSITE[k]
+                    step = np.zeros_like(frontier)
+                    step[:, max(dx, 0):cols + min(dx, 0), max(dy, 0):rows + min(dy, 0)] = \
+                        frontier[:, max(-dx, 0):cols + min(-dx, 0), max(-dy, 0):rows + min(-dy, 0)]
+                    step &= free & ~visited
+                    chunk_next[step] = OPPOSITE[k]
+                    visited |= step
+                    reached |= step
+                chunk_dist[reached] = level
+                frontier = reached
+            dist[chunk] = chunk_dist.reshape(len(chunk), n)
+            next_dir[chunk] = chunk_next.reshape(len(chunk), n)
+        return cls(grid_map, dist, next_dir)
+
+    @classmethod
+    def load_or_build(cls, grid_map, cache_dir):
+        """
+        Load tables persisted for this exact obstacle map, or build and persist them.
+
+        Tables are written to a temporary file in `cache_dir` and renamed into place,
+        so processes sharing the directory never read a partly written file. Processes
+        racing to build the same tables each build them, and the last rename wins.
+
+        Args:
+            grid_map (GridMap): The grid to tabulate.
+            cache_dir (str): Directory holding `<digest>.npz` table files.
+
+        Returns:
+            ShortestPathTable: The tables for `grid_map`.
+        """
+        path = os.path.join(cache_dir, grid_map.digest() + ".npz")
+        if os.path.exists(path):
+            with np.load(path) as data:
+                return cls(grid_map, data["dist"], data["next_dir"])
+        table = cls.build(grid_map)
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(suffix=".npz.tmp", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.savez_compressed(file, dist=table.dist, next_dir=table.next_dir)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        return table
+
+    def _index(self, cell):
+        col, row = cell
+        if 0 <= col < self.cols and 0 <= row < self.rows and self.free[col, row]:
+            return col * self.rows + row
+        return None
+
+    def distances_from(self, cell):
+        """
+        Args:
+            cell (tuple): Grid coordinates (col, row).
+
+        Returns:
+            numpy.ndarray: A (cols, rows) array of move counts from `cell`, with
+                `UNREACHABLE` for cells that cannot be reached, or None if `cell` is blocked.
+        """
+        index = self._index(cell)
+        if index is None:
+            return None
+        # the grid is undirected, so distances to a target are distances from it
+        return self.dist[index].reshape(self.cols, self.rows)
+
+    def path(self, start, goal):
+        """
+        Walk the next-hop table from start to goal.
+
+        Args:
+            start (tuple): The starting grid coordinates (col, row).
+            goal (tuple): The goal grid coordinates (col, row).
+
+        Returns:
+            list: The path including both ends, [] if the goal is unreachable, or None if
+                the start is a blocked cell the tables do not cover.
+        """
+        target = self._index(goal)
+        if target is None:
+            return []
+        current = self._index(start)
+        if current is None:
+            return None
+        if self.dist[target, current] == self.UNREACHABLE:
+            return []
+        path = [start]
+        col, row = start
+        next_dir = self.next_dir[target]
+        while (col, row) != goal:
+            dx, dy = DIRECTIONS[next_dir[col * self.rows + row]]
+            col, row = col + dx, row + dy
+            path.append((col, row))
+        return path
+
+
+class DStarLite:
+    """Incremental shortest-path planner for one agent (D* Lite).
+
+    The search runs backwards from the goal, so when the agent moves only the
+    heuristic offset `km` changes and the previous search stays valid, and when
+    cells of the `GridMap` are blocked or freed only the vertices around them are
+    updated. `compute` then expands just the states whose costs those changes
+    affected, so replanning cost follows what changed rather than the grid size.
+    Costs and estimates live in dictionaries, so untouched parts of large grids
+    cost nothing. Moves are 4-connected with unit cost into free cells; a blocked
+    start cell may still be left, as with `a_star`.
+    """
+
+    def __init__(self, grid_map, owner=None):
+        """
+        Args:
+            grid_map (GridMap): The grid to plan on; its change log is read on every plan.
+            owner (Planner, optional): Planner whose `calls` counter this planner also bumps.
+        """
+        self.grid_map = grid_map
+        self.owner = owner
+        self.goal = None
+        self.calls = 0
+        self.expansions = 0  # vertices expanded over the planner's lifetime
+        self._reset(None, None)
+        grid_map.track(self)
+
+    def _reset(self, start, goal):
+        self.start = self.last = start
+        self.goal = goal
+        self.km = 0
+        self.g = {}
+        self.rhs = {} if goal is None else {goal: 0}
+        self.heap = []
+        self.queued = {}  # cell -> key it is queued with
+        self.version = self.grid_map.version
+        if goal is not None:
+            self._push(goal)
+
+    @staticmethod
+    def _h(a, b):
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def _key(self, cell):
+        m = min(self.g.get(cell, math.inf), self.rhs.get(cell, math.inf))
+        return m + self._h(self.start, cell) + self.km, m
+
+    def _push(self, cell):
+        key = self._key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.heap, (key, cell))
+
+    def _neighbours(self, cell):
+        cols, rows = self.grid_map.cols, self.grid_map.rows
+        for dx, dy in DIRECTIONS:
+            col, row = cell[0] + dx, cell[1] + dy
+            if 0 <= col < cols and 0 <= row < rows:
+                yield col, row
+
+    def _update_vertex(self, cell):
+        if cell != self.goal:
+            blocked = self.grid_map.blocked
+            best = math.inf
+            for nxt in self._neighbours(cell):
+                if not blocked[nxt]:
+                    best = min(best, 1 + self.g.get(nxt, math.inf))
+            self.rhs[cell] = best
+        self.queued.pop(cell, None)
+        if self.g.get(cell, math.inf) != self.rhs.get(cell, math.inf):
+            self._push(cell)
+
+    def compute(self):
+        """
+        Expand queued vertices until the start's cost is settled.
+
+        Returns:
+            int: Number of vertices expanded.
+        """
+        expanded = 0
+        heap = self.heap
+        while heap:
+            key, cell = heap[0]
+            if self.queued.get(cell) != key:
+                heapq.heappop(heap)  # superseded entry
+                continue
+            start_key = self._key(self.start)
+            if key >= start_key and self.rhs.get(self.start, math.inf) == self.g.get(self.start, math.inf):
+                break
+            heapq.heappop(heap)
+            del self.queued[cell]
+            expanded += 1
+            new_key = self._key(cell)
+            g, rhs = self.g.get(cell, math.inf), self.rhs.get(cell, math.inf)
+            if key < new_key:
+                self._push(cell)
+            elif g > rhs:
+                self.g[cell] = rhs
+                for prev in self._neighbours(cell):
+                    self._update_vertex(prev)
+            else:
+                self.g[cell] = math.inf
+                self._update_vertex(cell)
+                for prev in self._neighbours(cell):
+                    self._update_vertex(prev)
+        self.expansions += expanded
+        return expanded
+
+    def _apply_changes(self):
+        if self.grid_map.version == self.version:
+            return True
+        changed = self.grid_map.changes_since(self.version)
+        if changed is None:
+            return False
+        self.version = self.grid_map.version
+        for col, row in {(int(c), int(r)) for c, r in changed}:
+            # the cost of moving into the cell changed, which affects its neighbours
+            for prev in self._neighbours((col, row)):
+                self._update_vertex(prev)
+            self._update_vertex((col, row))
+        return True
+
+    def plan(self, start, goal):
+        """
+        Plan a path from start to goal, reusing the previous search when the goal is
+        the same.
+
+        Args:
+            start (tuple): The starting grid coordinates (col, row).
+            goal (tuple): The goal grid coordinates (col, row).
+
+        Returns:
+            list: A list of grid coordinates from start to goal, or [] if unreachable.
+                The list is owned by the caller.
+        """
+        self.calls += 1
+        if self.owner is not None:
+            self.owner.calls += 1
+        if not self.grid_map.is_free(goal):
+            return []
+        if goal != self.goal:
+            self._reset(start, goal)
+        else:
+            if start != self.start:
+                self.km += self._h(self.last, start)
+                self.last = self.start = start
+            if not self._apply_changes():
+                self._reset(start, goal)
+        self.compute()
+        return self.path()
+
+    def path(self):
+        """
+        Returns:
+            list: The current shortest path from the start to the goal, following the
+                cheapest free neighbour at every step, or [] if the goal is unreachable.
+        """
+        g = self.g
+        cell = self.start
+        if self.rhs.get(cell, math.inf) == math.inf:
+            return []
+        blocked = self.grid_map.blocked
+        path = [cell]
+        while cell != self.goal:
+            cell = min((nxt for nxt in self._neighbours(cell) if not blocked[nxt]),
+                       key=lambda nxt: g.get(nxt, math.inf))
+            path.append(cell)
+        return path
+
+
+class PathCache:
+    """Bounded LRU cache of planned paths.
+
+    Entries are keyed on (start, goal, version). Because every suffix of a shortest
+    path is itself a shortest path, a lookup that misses on its exact key is also
+    answered from any cached path to the same goal that passes through the start.
+    """
+
+    def __init__(self, maxsize=256):
+        """
+        Args:
+            maxsize (int): Maximum number of cached paths.
+        """
+        self.maxsize = maxsize
+        self.paths = OrderedDict()  # (start, goal, version) -> (path, {cell: position})
+        self.by_goal = {}  # (goal, version) -> {(start, goal, version): None}
+
+    def __len__(self):
+        return len(self.paths)
+
+    def get(self, start, goal, version):
+        """
+        Look up a path.
+
+        Args:
+            start (tuple): The starting grid coordinates.
+            goal (tuple): The goal grid coordinates.
+            version (int): Version of the grid the path must have been planned on.
+
+        Returns:
+            list: A fresh copy of the cached path (or suffix), or None on a miss.
+        """
+        key = (start, goal, version)
+        entry = self.paths.get(key)
+        if entry is not None:
+            self.paths.move_to_end(key)
+            return list(entry[0])
+        for other in self.by_goal.get((goal, version), ()):
+            path, positions = self.paths[other]
+            position = positions.get(start)
+            if position is not None:
+                self.paths.move_to_end(other)
+                return list(path[position:])
+        return None
+
+    def put(self, start, goal, version, path):
+        """
+        Store a path, evicting the least recently used one if the cache is full.
+
+        Args:
+            start (tuple): The starting grid coordinates.
+            goal (tuple): The goal grid coordinates.
+            version (int): Version of the grid the path was planned on.
+            path (list): The planned path.
+        """
+        key = (start, goal, version)
+        self.paths[key] = (tuple(path), {cell: i for i, cell in enumerate(path)})
+        self.paths.move_to_end(key)
+        self.by_goal.setdefault((goal, version), {})[key] = None
+        while len(self.paths) > self.maxsize:
+            old, _ = self.paths.popitem(last=False)
+            siblings = self.by_goal[(old[1], old[2])]
+            del siblings[old]
+            if not siblings:
+                del self.by_goal[(old[1], old[2])]
+
+    def clear(self):
+        self.paths.clear()
+        self.by_goal.clear()
+
+
+class Planner:
+    """Path planner over a `GridMap` with a memoizing path cache.
+
+    The cache is dropped whenever the grid's version changes, so replanning toward
+    the same target on an unchanged map is a dictionary lookup. After `precompute`,
+    queries are answered by walking all-pairs shortest-path tables instead of searching.
+    """
+
+    def __init__(self, grid_map, cache_size=256):
+        """
+        Args:
+            grid_map (GridMap): The grid to plan on.
+            cache_size (int): Maximum number of cached paths.
+        """
+        self.grid_map = grid_map
+        self.cache = PathCache(cache_size)
+        self.cache_version = grid_map.version
+        self.table = None
+        self.calls = 0
+        self.searches = 0
+        self.cache_hits = 0
+
+    def precompute(self, cache_dir=None):
+        """
+        Build (or load) all-pairs shortest-path tables for the current grid.
+
+        Args:
+            cache_dir (str, optional): Directory to persist tables in, keyed by the
+                obstacle-map hash. Tables are built in memory only if None.
+        """
+        if cache_dir is None:
+            self.table = ShortestPathTable.build(self.grid_map)
+        else:
+            self.table = ShortestPathTable.load_or_build(self.grid_map, cache_dir)
+
+    def _current_table(self):
+        if self.table is not None and self.table.version == self.grid_map.version:
+            return self.table
+        return None
+
+    def distances_from(self, cell):
+        """
+        Distances from a cell to every cell of the grid.
+
+        Args:
+            cell (tuple): Grid coordinates (col, row).
+
+        Returns:
+            numpy.ndarray: A (cols, rows) float array of exact move counts (inf where
+                unreachable) when tables are available for the current grid, otherwise
+                Manhattan distances.
+        """
+        table = self._current_table()
+        distances = table.distances_from(cell) if table is not None else None
+        if distances is None:
+            cols, rows = np.indices((self.grid_map.cols, self.grid_map.rows))
+            return (np.abs(cols - cell[0]) + np.abs(rows - cell[1])).astype(float)
+        return np.where(distances == ShortestPathTable.UNREACHABLE, np.inf, distances)
+
+    def distances_to(self, cell, cols, rows):
+        """
+        Distances from a cell to selected cells, without materialising the whole grid.
+
+        Args:
+            cell (tuple): Grid coordinates (col, row) of the start.
+            cols (numpy.ndarray): Columns of the cells to measure.
+            rows (numpy.ndarray): Rows of the cells to measure.
+
+        Returns:
+            numpy.ndarray: Float distances shaped like `cols`, as in `distances_from`.
+        """
+        if self._current_table() is not None:
+            return self.distances_from(cell)[cols, rows]
+        return (np.abs(np.asarray(cols) - cell[0]) + np.abs(np.asarray(rows) - cell[1])).astype(float)
+
+    def distance_matrix(self, cells):
+        """
+        Exact path lengths between every pair of the given cells.
+
+        Args:
+            cells (list): Grid coordinates (col, row).
+
+        Returns:
+            numpy.ndarray: A symmetric (n, n) float array of move counts, inf where
+                unreachable. Read from the tables when available, otherwise from a
+                batched breadth-first search.
+        """
+        if not cells:
+            return np.zeros((0, 0))
+        cols, rows = np.array(cells).T
+        if self._current_table() is not None:
+            matrix = np.stack([self.distances_from(cell)[cols, rows] for cell in cells])
+        else:
+            matrix = breadth_first_distances(self.grid_map, cells)[:, cols, rows]
+        # tables do not enter blocked cells, so keep the direction leaving them
+        return np.minimum(matrix, matrix.T)
+
+    def incremental(self):
+        """
+        Returns:
+            DStarLite: A new incremental planner over this planner's grid, for one agent.
+                Its queries also count towards `calls`.
+        """
+        return DStarLite(self.grid_map, owner=self)
+
+    def plan(self, start, goal):
+        """
+        Plan a path from start to goal.
+
+        Args:
+            start (tuple): The starting grid coordinates (col, row).
+            goal (tuple): The goal grid coordinates (col, row).
+
+        Returns:
+            list: A list of grid coordinates from start to goal, or [] if unreachable.
+                The list is owned by the caller.
+        """
+        self.calls += 1
+        version = self.grid_map.version
+        if version != self.cache_version:
+            self.cache.clear()
+            self.cache_version = version
+        path = self.cache.get(start, goal, version)
+        if path is not None:
+            self.cache_hits += 1
+            return path
+        table = self._current_table()
+        if table is not None:
+            path = table.path(start, goal)
+            if path is not None:
+                return path
+        self.searches += 1
+        path = a_star(self.grid_map, start, goal)
+        if path:
+            self.cache.put(start, goal, version, path)
+        return path
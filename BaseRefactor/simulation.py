@@ -0,0 +1,207 @@
+import random
+import time
+
+import numpy as np
+
+from bot import Bot
+from cat import Cat, CatRegistry
+from charger import Charger
+from config import RuntimeConfig
+from counter import Counter
+from dirt import DirtField
+from kinematics import Fleet, positions_of
+from allocation import TaskAllocator
+from lightfield import ChargerField
+from metrics import MetricsRecorder
+from obstacles import ObstacleMap
+from planning import GridMap, Planner
+from wifihub import WiFiHub
+
+
+class Simulation:
+    """Headless simulation engine.
+
+    Owns the object registries and advances the world one tick at a time without
+    any dependency on tkinter. Rendering is optional: observers registered with
+    `add_observer` are notified after every step and may draw the world however
+    they like.
+    """
+
+    def __init__(self, config=None, moves_max=None, path_table_dir=None, seed=None, metrics_stride=100):
+        """
+        Build and populate a new world.
+
+        Args:
+            config (RuntimeConfig, optional): Settings of the run. Defaults to the built-in ones.
+            moves_max (int, optional): Number of moves after which the run is finished.
+                Defaults to `config.bot_moves_max`.
+            path_table_dir (str, optional): If given, precompute all-pairs shortest-path
+                tables for the planning grid, persisted in this directory.
+            seed (int, optional): Seed of the run. Independent random streams for world
+                generation, bot initialisation and stochastic strategies are derived from
+                it, so equal seeds give identical worlds whatever the strategy does.
+                If None, everything draws from the global `random` module.
+            metrics_stride (int): Sample the standard metrics every this many moves.
+        """
+        self.config = config if config is not None else RuntimeConfig()
+        self.seed = seed
+        self.world_rng, self.bot_rng, self.strategy_rng = self.random_streams(seed)
+        self.moves_max = self.config.bot_moves_max if moves_max is None else moves_max
+        self.moves = 0
+        self.registry_actives = []
+        self.registry_passives = []
+        self.dirt_field = DirtField([], [], config=self.config)
+        self.obstacles = ObstacleMap.from_config(self.config)
+        self.fleet = Fleet(self.obstacles, self.config)
+        self.planner = Planner(GridMap.from_obstacles(
+            self.obstacles, self.config.cell_size, self.config.map_width, self.config.map_height))
+        if path_table_dir is not None:
+            self.planner.precompute(path_table_dir)
+        self.charger_field = None
+        if self.config.charger_field_resolution > 0:
+            self.charger_field = ChargerField(self.config.canvas_width, self.config.canvas_height,
+                                              self.config.charger_field_resolution,
+                                              self.config.charger_gain)
+        self.counter = Counter()
+        self.collected = []  # ids of the dirt collected during the last step
+        self.step_time = 0.0  # wall-clock seconds spent in step()
+        self.observers = []
+        self.populate()
+        self.allocator = None
+        if self.config.allocate_tasks:
+            self.allocator = TaskAllocator(self.dirt_field, self.planner, self.config)
+        self.metrics = MetricsRecorder.for_simulation(self, metrics_stride)
+
+    def populate(self):
+        """
+        Create and register robots, chargers, WiFi hubs, dirt and cats.
+
+        Dirt is kept out of `registry_passives`: it lives in the columnar `dirt_field`,
+        which also indexes it for collection.
+        """
+        config = self.config
+        self.dirt_field = DirtField.scatter(config.dirt_num, self.obstacles, self.world_rng, config)
+
+        for i in range(config.bot_num):
+            self.registry_actives.append(Bot("Bot" + str(i), self.dirt_field, self.fleet, self.planner,
+                                             self.bot_rng, self.strategy_rng, config))
+
+        self.registry_passives.append(Charger("Charger", self.world_rng, config))
+        self.registry_passives.append(WiFiHub("Hub1", config.canvas_width - 50, 50))
+        self.registry_passives.append(WiFiHub("Hub2", 50, config.canvas_height // 2))
+
+        for i in range(config.cat_num):
+            self.registry_passives.append(Cat("Cat" + str(i), self.world_rng, config))
+
+        for rr in self.registry_actives:
+            rr.strategy.charger_field = self.charger_field
+        self.refresh_positions()
+
+    def refresh_positions(self):
+        """
+        Gather the locations of the chargers and cats.
+
+        They are static, so this runs once after `populate`; call it again after
+        moving them. The charger light raster, if any, is rebuilt only if the
+        chargers actually moved.
+        """
+        self.chargers = positions_of(self.registry_passives, Charger)
+        self.cats = CatRegistry.from_objects(self.registry_passives, self.config.cat_avoid_distance)
+        if self.charger_field is not None:
+            self.charger_field.update(self.chargers)
+
+    @staticmethod
+    def random_streams(seed):
+        """
+        Derive the random streams of a run from its seed.
+
+        Args:
+            seed (int or None): Seed of the run.
+
+        Returns:
+            tuple: Generators for world generation, bot initialisation and stochastic
+                strategies. All three are the `random` module when `seed` is None.
+        """
+        if seed is None:
+            return random, random, random
+        children = np.random.SeedSequence(seed).spawn(3)
+        return tuple(random.Random(int.from_bytes(child.generate_state(4).tobytes(), "little"))
+                     for child in children)
+
+    def add_observer(self, observer):
+        """
+        Register an observer notified after every step.
+
+        Args:
+            observer: Any object with an `on_step(simulation)` method, e.g. a renderer.
+        """
+        self.observers.append(observer)
+
+    @property
+    def finished(self):
+        """bool: Whether the run has reached its move budget."""
+        return self.moves >= self.moves_max
+
+    def step(self, dt=1.0):
+        """
+        Advance the world by one tick: sense, think, move and collect for every robot.
+
+        With task allocation enabled, idle robots are first given target cells. All
+        robots then decide, then the whole fleet is integrated in one vectorized
+        call, then each robot collects the dirt around its new position.
+
+        Args:
+            dt (float): Time step passed to the kinematics.
+        """
+        start = time.perf_counter()
+        self.moves += 1
+
+        if self.allocator is not None:
+            self.allocator.assign(self.registry_actives)
+
+        if self.charger_field is not None:
+            lights = self.charger_field.sense(self.fleet.sensor_positions).tolist()
+        else:
+            lights = self.fleet.sense_chargers(self.chargers, self.config.charger_gain).tolist()
+        for rr, (charger_l, charger_r) in zip(self.registry_actives, lights):
+            rr.brain(charger_l, charger_r)
+
+        self.fleet.update_map(self.fleet.move(self.chargers, self.cats, dt))
+
+        self.collected = []
+        for rr in self.registry_actives:
+            self.collected.extend(rr.collect_dirt(self.dirt_field, self.counter))
+
+        self.step_time += time.perf_counter() - start
+        self.metrics.sample(self)
+
+        for observer in self.observers:
+            observer.on_step(self)
+
+    def run(self):
+        """
+        Step the world in a tight loop until the move budget is used up.
+
+        Returns:
+            Counter: The counter holding the collection total; per-tick series are in `metrics`.
+        """
+        while not self.finished:
+            self.step()
+        return self.counter
+
+    def milestones(self):
+        """
+        Returns:
+            dict: Dirt collected by each sampled move, from the ``dirt_collected`` series.
+        """
+        data = self.metrics.as_dict()
+        return dict(zip(data["tick"].tolist(), data["dirt_collected"].tolist()))
+
+    def print_results(self):
+        """
+        Print milestone and final collection results.
+        """
+        print("\nFinal results:")
+        for move, collected in self.milestones().items():
+            print(f"Move {move}: Collected {collected} dirt")
+        print(f"Total dirt collected in {self.moves} moves is {self.counter.dirt_collected}")
@@ -0,0 +1,120 @@
+import math
+
+import numpy as np
+
+
+class GridIndex:
+    """Static uniform-grid index over an array of points.
+
+    Point indices are sorted by bucket once, in a compressed (CSR) layout: `order`
+    lists point indices bucket by bucket and `starts[k]` is where bucket `k` begins.
+    A query returns the candidate indices of the buckets overlapping the query box
+    as a handful of array slices, with no per-point Python objects. Points are never
+    moved or removed here; owners track removal with their own mask.
+
+    When the buckets far outnumber the points, as on a large, sparsely filled floor,
+    `starts` is not materialised and bucket bounds are found by binary search in the
+    sorted keys instead.
+    """
+
+    # Dense `starts` is used while it has at most this many entries per point (plus a floor)
+    DENSE_BUCKETS_PER_POINT = 16
+
+    def __init__(self, x, y, bucket_size):
+        """
+        Args:
+            x (numpy.ndarray): x-coordinates of the points.
+            y (numpy.ndarray): y-coordinates of the points.
+            bucket_size (float): Side length of one bucket in pixels.
+        """
+        self.bucket_size = bucket_size
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        bx = np.floor(self.x / bucket_size).astype(np.int64)
+        by = np.floor(self.y / bucket_size).astype(np.int64)
+        if len(bx) == 0:
+            bx = by = np.zeros(1, dtype=np.int64)
+        self.min_bx, self.min_by = int(bx.min()), int(by.min())
+        self.num_bx = int(bx.max()) - self.min_bx + 1
+        self.num_by = int(by.max()) - self.min_by + 1
+
+        keys = (bx - self.min_bx) * self.num_by + (by - self.min_by)
+        self.order = np.argsort(keys, kind="stable").astype(np.int32)[:len(x)]
+        self.sorted_keys = keys[self.order]
+        buckets = self.num_bx * self.num_by
+        self.starts = None
+        if buckets <= self.DENSE_BUCKETS_PER_POINT * len(keys) + 65536:
+            self.starts = np.searchsorted(self.sorted_keys, np.arange(buckets + 1))
+
+    def _start(self, key):
+        # position in `order` where bucket `key` begins
+        if self.starts is not None:
+            return self.starts[key]
+        return np.searchsorted(self.sorted_keys, key)
+
+    def candidates(self, x, y, radius):
+        """
+        Indices of all points in buckets overlapping the square around (x, y).
+
+        Args:
+            x (float): x-coordinate of the query centre.
+            y (float): y-coordinate of the query centre.
+            radius (float): Half the side of the query square.
+
+        Returns:
+            numpy.ndarray: Candidate point indices; callers apply the exact distance test.
+        """
+        lo_x = max(int(math.floor((x - radius) / self.bucket_size)) - self.min_bx, 0)
+        hi_x = min(int(math.floor((x + radius) / self.bucket_size)) - self.min_bx, self.num_bx - 1)
+        lo_y = max(int(math.floor((y - radius) / self.bucket_size)) - self.min_by, 0)
+        hi_y = min(int(math.floor((y + radius) / self.bucket_size)) - self.min_by, self.num_by - 1)
+        if lo_x > hi_x or lo_y > hi_y:
+            return self.order[:0]
+        # buckets of one column are contiguous in key space
+        slices = [self.order[self._start(bx * self.num_by + lo_y):self._start(bx * self.num_by + hi_y + 1)]
+                  for bx in range(lo_x, hi_x + 1)]
+        return slices[0] if len(slices) == 1 else np.concatenate(slices)
+
+    def pairs(self, x, y, radius):
+        """
+        All (query, point) pairs closer than `radius`, for many query points at once.
+
+        Args:
+            x (numpy.ndarray): x-coordinates of the query points.
+            y (numpy.ndarray): y-coordinates of the query points.
+            radius (float): Search radius; points at exactly `radius` are excluded.
+
+        Returns:
+            tuple: Arrays (query_indices, point_indices) of equal length.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        span = int(math.ceil(radius / self.bucket_size))
+        qbx = np.floor(x / self.bucket_size).astype(np.int64) - self.min_bx
+        qby = np.floor(y / self.bucket_size).astype(np.int64) - self.min_by
+        lo_y = np.clip(qby - span, 0, self.num_by - 1)
+        hi_y = np.clip(qby + span, 0, self.num_by - 1)
+        rows_ok = (qby + span >= 0) & (qby - span < self.num_by)
+        found_q, found_p = [], []
+        for offset in range(-span, span + 1):
+            bx = qbx + offset
+            q = np.flatnonzero(rows_ok & (bx >= 0) & (bx < self.num_bx))
+            if len(q) == 0:
+                continue
+            # buckets of one column are contiguous in key space
+            base = bx[q] * self.num_by
+            start = self._start(base + lo_y[q])
+            counts = self._start(base + hi_y[q] + 1) - start
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            first = np.repeat(start - (np.cumsum(counts) - counts), counts)
+            found_q.append(np.repeat(q, counts))
+            found_p.append(self.order[first + np.arange(total)])
+        if not found_q:
+            empty = np.zeros(0, dtype=np.intp)
+            return empty, empty
+        qi = np.concatenate(found_q)
+        pi = np.concatenate(found_p).astype(np.intp)
+        near = (self.x[pi] - x[qi]) ** 2 + (self.y[pi] - y[qi]) ** 2 < radius * radius
+        return qi[near], pi[near]
@@ -1,31 +1,166 @@
-from collections import defaultdict
-
-from config import Config
+from config import RuntimeConfig
+from coverage import CoverageCursor, CoveragePlan
+from dirt import DirtField
+from obstacles import ObstacleMap
+from planning import GridMap, Planner
+from tour import TourCursor, TourPlanner
 import math
 import random
-import heapq
+
+import numpy as np
+
+
+class DirtChase:
+    """Drives a bot to the dirt of one grid cell, one piece at a time.
+
+    The look-ahead of the kinematics keeps a bot away from obstacles, so the bot
+    aims at the nearest point it can reach next to each piece and leaves alone dirt
+    too deep in an obstacle's shadow to be picked up from there. If it has not
+    picked up a piece in time, it gives up on the cell.
+    """
+
+    def __init__(self):
+        self.target = None  # id of the piece of dirt being approached
+        self.aim = None  # point the bot drives to in order to pick it up
+        self.ticks_left = 0
+        self.skipped = set()  # ids of dirt given up on
+
+    def step(self, bot, cell):
+        """
+        Set the wheel speeds for one tick of collecting the dirt of a cell.
+
+        Args:
+            bot: Bot
+            cell (tuple): Grid coordinates (col, row) of the cell.
+
+        Returns:
+            bool: False, leaving the wheels alone, if the cell holds no dirt the bot can
+                reach, or the last piece was not reached in time.
+        """
+        config = bot.strategy.config
+        cell_size = config.cell_size
+        speed = config.bot_v_positive_max
+        dirt = bot.strategy.dirt_list
+        if self.target is not None and (not dirt.alive[self.target] or self.ticks_left <= 0):
+            if dirt.alive[self.target]:
+                # whatever held the bot up, e.g. a cat, guards the rest of the cell too
+                self.skipped.add(self.target)
+                self.target = None
+                return False
+            self.target = None
+        if self.target is None:
+            ids = dirt.index.candidates((cell[0] + 0.5) * cell_size, (cell[1] + 0.5) * cell_size,
+                                        cell_size / 2)
+            ids = ids[dirt.alive[ids] & (dirt.cols[ids] == cell[0]) & (dirt.rows[ids] == cell[1])]
+            ids = np.array([i for i in ids.tolist() if i not in self.skipped], dtype=np.intp)
+            aim_x, aim_y = bot.fleet.obstacles.push_out(dirt.x[ids], dirt.y[ids], config.coverage_clearance)
+            reachable = np.hypot(aim_x - dirt.x[ids], aim_y - dirt.y[ids]) < 25
+            if not reachable.any():
+                return False
+            ids, aim_x, aim_y = ids[reachable], aim_x[reachable], aim_y[reachable]
+            nearest = int(np.argmin((aim_x - bot.x) ** 2 + (aim_y - bot.y) ** 2))
+            self.target = int(ids[nearest])
+            self.aim = (float(aim_x[nearest]), float(aim_y[nearest]))
+            distance = math.hypot(self.aim[0] - bot.x, self.aim[1] - bot.y)
+            self.ticks_left = int(3 * distance / speed) + 60
+        self.ticks_left -= 1
+        Strategy.drive_to(bot, self.aim[0], self.aim[1], speed)
+        return True
 
 
 class Strategy:
-    def __init__(self, dirt_list=None):
-        self.dirt_list = dirt_list or []
+    _default_planner = None
 
-    def find_nearest_dirt(self, current_grid):
+    def __init__(self, dirt_list=None, planner=None, rng=random, config=None):
+        """
+        Args:
+            dirt_list (DirtField, optional): The dirt still to be collected.
+            planner (Planner, optional): Path planner to use. Defaults to a shared planner
+                over the bordered `MAP_WIDTH x MAP_HEIGHT` grid with the configured obstacles.
+            rng: Random number generator of the stochastic strategies. Defaults to the `random` module.
+            config (RuntimeConfig, optional): Settings of the run. Defaults to the built-in ones.
+        """
+        self.config = config if config is not None else RuntimeConfig()
+        self.dirt_list = dirt_list if dirt_list is not None else DirtField([], [])
+        self.planner = planner if planner is not None else Strategy.default_planner()
+        self.charger_field = None  # ChargerField set by the simulation when light is precomputed
+        self.rng = rng
+        self.replanner = None  # this bot's DStarLite, created on first use
+
+    @staticmethod
+    def default_planner():
+        """
+        Returns:
+            Planner: The process-wide planner used when none is passed in.
+        """
+        if Strategy._default_planner is None:
+            config = RuntimeConfig()
+            Strategy._default_planner = Planner(GridMap.from_obstacles(
+                ObstacleMap.from_config(config), config.cell_size, config.map_width, config.map_height))
+        return Strategy._default_planner
+
+    @staticmethod
+    def by_name(name):
+        """
+        Args:
+            name (str): Name of a strategy, e.g. ``"a_star"`` for `a_star_strategy`.
+
+        Returns:
+            function: The strategy, called as ``strategy(bot, charger_l, charger_r)``.
+
+        Raises:
+            ValueError: If there is no strategy of that name.
+        """
+        strategy = getattr(Strategy, name + "_strategy", None)
+        if strategy is None:
+            raise ValueError(f"Unknown strategy: {name}")
+        return strategy
+
+    def plan_path(self, start, goal):
+        """
+        Plan a path for this strategy's bot.
+
+        With `incremental_planning`, the bot keeps its own D* Lite search and repairs it
+        as the bot moves or the grid changes; otherwise the shared planner is queried.
+
+        Args:
+            start (tuple): The starting grid coordinates (col, row).
+            goal (tuple): The goal grid coordinates (col, row).
+
+        Returns:
+            list: A list of grid coordinates from start to goal, or [] if unreachable.
+        """
+        if not self.config.incremental_planning:
+            return self.planner.plan(start, goal)
+        if self.replanner is None:
+            self.replanner = self.planner.incremental()
+        return self.replanner.plan(start, goal)
+
+    def find_nearest_dirt(self, current_grid, exclude=()):
         """
         Find the nearest dirt cell to the current grid position.
 
+        Distances are exact path lengths when the planner has precomputed tables,
+        otherwise Manhattan distances.
+
         Args:
             current_grid (tuple): The current grid coordinates (col, row).
+            exclude (set): Cells not to choose, e.g. those whose dirt could not be reached.
 
         Returns:
             tuple: The grid coordinates (col, row) of the nearest dirt cell, or None if no dirt is found.
         """
         if not self.dirt_list:
             return None
-        dirt_positions = [(int(d.x // Config.CELL_SIZE.value), int(d.y // Config.CELL_SIZE.value))
-                          for d in self.dirt_list]
-        dirt_positions.sort(key=lambda pos: abs(pos[0] - current_grid[0]) + abs(pos[1] - current_grid[1]))
-        return dirt_positions[0] if dirt_positions else None
+        cols, rows = self.dirt_list.cells(self.config.cell_size)
+        if exclude:
+            keep = np.array([cell not in exclude for cell in zip(cols.tolist(), rows.tolist())],
+                            dtype=bool)
+            cols, rows = cols[keep], rows[keep]
+            if len(cols) == 0:
+                return None
+        i = np.argmin(self.planner.distances_to(current_grid, cols, rows))
+        return int(cols[i]), int(rows[i])
 
     def find_farest_dirt(self, current_grid):
         """
@@ -39,138 +174,69 @@ class Strategy:
         """
         if not self.dirt_list:
             return None
-        dirt_positions = [(int(d.x // Config.CELL_SIZE.value), int(d.y // Config.CELL_SIZE.value))
-                          for d in self.dirt_list]
-        dirt_positions.sort(key=lambda pos: abs(pos[0] - current_grid[0]) + abs(pos[1] - current_grid[1]), reverse=True)
-        return dirt_positions[0] if dirt_positions else None
+        cols, rows = self.dirt_list.cells(self.config.cell_size)
+        distances = self.planner.distances_to(current_grid, cols, rows)
+        i = np.argmax(np.where(np.isfinite(distances), distances, -1))
+        return int(cols[i]), int(rows[i])
 
     def calculate_dirt_per_cell(self):
-        """计算每个网格中的灰尘数量"""
-        dirt_per_cell = defaultdict(int)
-        cell_size = Config.CELL_SIZE.value
-        for dirt in self.dirt_list:
-            col = int(dirt.x // cell_size)
-            row = int(dirt.y // cell_size)
-            dirt_per_cell[(col, row)] += 1
-        return dirt_per_cell
-
-    def find_most_dirty_cell(self, current_grid):
-        """找到灰尘最多且离当前网格最近的网格"""
-        dirt_per_cell = self.calculate_dirt_per_cell()
-        if not dirt_per_cell:
+        """计算每个网格中的灰尘数量
+
+        The counts are maintained incrementally by the dirt field, so this is a lookup
+        rather than a pass over the remaining dirt.
+
+        Returns:
+            CellCounts: Per-cell counts; use `get((col, row))` to read one cell.
+        """
+        return self.dirt_list.cell_counts
+
+    def find_most_dirty_cell(self, current_grid, exclude=()):
+        """找到灰尘最多且离当前网格最近的网格
+
+        Cells in `exclude` are passed over; if they include every dirtiest cell, the
+        dirtiest of the remaining cells are considered instead.
+        """
+        cell_counts = self.dirt_list.cell_counts
+        max_count, max_cells = cell_counts.most_dirty()
+        max_cells = [cell for cell in max_cells if cell not in exclude]
+        if not max_cells and exclude:
+            cols, rows, counts = cell_counts.nonzero()
+            keep = np.array([cell not in exclude for cell in zip(cols.tolist(), rows.tolist())],
+                            dtype=bool)
+            if keep.any():
+                top = keep & (counts == counts[keep].max())
+                max_cells = list(zip(cols[top].tolist(), rows[top].tolist()))
+        if not max_cells:
             return None
-        max_count = max(dirt_per_cell.values())
-        max_cells = [cell for cell, count in dirt_per_cell.items() if count == max_count]
-        closest_cell = None
-        min_distance = float('inf')
-        for cell in max_cells:
-            distance = abs(cell[0] - current_grid[0]) + abs(cell[1] - current_grid[1])  # 曼哈顿距离
-            if distance < min_distance:
-                min_distance = distance
-                closest_cell = cell
-        return closest_cell
+        cols, rows = np.array(max_cells).T
+        distances = self.planner.distances_to(current_grid, cols, rows)  # 路径距离，无预计算时为曼哈顿距离
+        return max_cells[int(np.argmin(distances))]
 
 
     @staticmethod
-    def compute_a_star_path(start, goal, dirt_list):
+    def compute_a_star_path(start, goal, dirt_list=None):
         """
         Compute the shortest path from start to goal using the A* algorithm.
 
+        Paths come from the shared default planner, so repeated queries are served
+        from its cache.
+
         Args:
             start (tuple): The starting grid coordinates (x, y).
             goal (tuple): The goal grid coordinates (x, y).
-            dirt_list (list): List of dirt positions to consider as potential obstacles.
+            dirt_list (list): Unused; kept for backward compatibility.
 
         Returns:
             list: A list of grid coordinates representing the path from start to goal.
         """
-        # print(f"start: {start}, goal: {goal}")
-        cols, rows = Config.MAP_WIDTH.value, Config.MAP_HEIGHT.value
-        obstacles = {(x, y) for x in range(cols) for y in range(rows)
-                     if x == 0 or y == 0 or x == cols - 1 or y == rows - 1}
-
-        def heuristic(a, b):
-            # print(f"heuristic: {abs(a[0] - b[0]) + abs(a[1] - b[1])}")
-            return math.sqrt((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2)
-
-        # 新增：计算全局路径直线的参数ax + by + c = 0（连接起点和目标点）
-        dx = goal[0] - start[0]
-        dy = goal[1] - start[1]
-        a = dy
-        b = -dx
-        c = dx * start[1] - dy * start[0]
-
-        def hybrid_heuristic(node):
-            # 点对线距离项
-            denominator = math.sqrt(a ** 2 + b ** 2)
-            h1 = abs(a * node[0] + b * node[1] + c) / denominator if denominator > 0 else 0
-            # 欧几里得距离项
-            h2 = math.sqrt((node[0] - goal[0]) ** 2 + (node[1] - goal[1]) ** 2)
-            # 可调整两个启发式的权重比例
-            return 0.3 * h1 + 0.7 * h2  # 更注重目标距离
-
-        open_heap = []
-        heapq.heappush(open_heap, (0 + heuristic(start, goal), 0, start))
-        # heapq.heappush(open_heap, (0 + hybrid_heuristic(start), 0, start))
-        came_from = {start: None}
-        g_score = {start: 0}
-        closed_set = set()
-
-        if goal in obstacles:
-            return []
-
-        while open_heap:
-            _, current_g, current = heapq.heappop(open_heap)
-
-            if current == goal:
-                path = []
-                while current is not None:
-                    path.append(current)
-                    current = came_from[current]
-                path.reverse()
-                print(f"path: {path}")
-                return path
-                # return path[1:]  # 排除起点
-
-            closed_set.add(current)
-
-            for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-                if (0 <= neighbor[0] < cols and 0 <= neighbor[1] < rows and
-                        neighbor not in obstacles and neighbor not in closed_set):
-                    tentative_g = current_g + 1
-
-                    if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                        came_from[neighbor] = current
-                        g_score[neighbor] = tentative_g
-                        f_score = tentative_g + heuristic(neighbor, goal)
-                        # f_score = tentative_g + hybrid_heuristic(neighbor)
-                        heapq.heappush(open_heap, (f_score, tentative_g, neighbor))
-
-            # for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:  # 4个方向移动
-            #     neighbor = (current[0] + dx, current[1] + dy)
-            #     if (neighbor[0] < 0 or neighbor[0] >= cols or
-            #             neighbor[1] < 0 or neighbor[1] >= rows or
-            #             neighbor in obstacles):
-            #         continue
-            #
-            #     tentative_g = current_g + 1
-            #
-            #     if neighbor in closed_set and tentative_g >= g_score.get(neighbor, float('inf')):
-            #         continue
-            #
-            #     if tentative_g < g_score.get(neighbor, float('inf')):
-            #         came_from[neighbor] = current
-            #         g_score[neighbor] = tentative_g
-            #         f_score = tentative_g + hybrid_heuristic(neighbor)
-            #         heapq.heappush(open_heap, (f_score, tentative_g, neighbor))
-
-        return []  # 没有找到路径
+        return Strategy.default_planner().plan(start, goal)
 
     @staticmethod
     def random_walk_strategy(bot, charger_l, charger_r):
         """
         Execute a random walk strategy for robot movement.
+
+        Walk lengths are drawn from the bot's strategy random number generator.
         """
         if bot.is_turning:
             return
@@ -184,14 +250,14 @@ class Strategy:
             bot.moving -= 1
 
         if bot.moving == 0 and not bot.currently_turning:
-            bot.turning = random.randrange(20, 40)
+            bot.turning = bot.strategy.rng.randrange(20, 40)
             bot.currently_turning = True
 
         if bot.turning == 0 and bot.currently_turning:
-            bot.moving = random.randrange(50, 100)
+            bot.moving = bot.strategy.rng.randrange(50, 100)
             bot.currently_turning = False
 
-        if bot.battery < 800:
+        if bot.battery < bot.strategy.config.low_battery:
             if charger_r > charger_l:
                 bot.vl = 2.0
                 bot.vr = -2.0
@@ -202,7 +268,7 @@ class Strategy:
                 bot.vl = 5.0
                 bot.vr = 5.0
 
-        if charger_l + charger_r > 200 and bot.battery < Config.BOT_BATTERY_CAPACITY.value:
+        if charger_l + charger_r > 200 and bot.battery < bot.strategy.config.bot_battery_capacity:
             bot.vl = 0.0
             bot.vr = 0.0
 
@@ -215,31 +281,28 @@ class Strategy:
         using sensor readings to orient towards the charger. Otherwise, it computes or follows
         an A* path to the nearest dirt cell in the occupancy grid. The robot adjusts its wheel
         speeds to orient and move toward each waypoint, and resets the target once reached.
+        This is the baseline steering; `chase_strategy` follows the paths cell by cell instead.
 
         Args:
             bot: Bot
             charger_l (float): Sensor reading from the left charger detector.
             charger_r (float): Sensor reading from the right charger detector.
         """
-        if bot.battery < 800:
-            if charger_r > charger_l:
-                bot.vl, bot.vr = 2.0, -2.0
-            elif charger_r < charger_l:
-                bot.vl, bot.vr = -2.0, 2.0
-            elif abs(charger_r - charger_l) < charger_l * 0.1:
-                bot.vl, bot.vr = 5.0, 5.0
+        config = bot.strategy.config
+        if bot.battery < config.low_battery:
+            Strategy.head_for_charger(bot, charger_l, charger_r)
             return
 
         if bot.is_turning:
             return
 
-        cell_size = Config.CELL_SIZE.value
+        cell_size = config.cell_size
         curr_col = int(bot.x // cell_size)
         curr_row = int(bot.y // cell_size)
         current_grid = (curr_col, curr_row)
 
         if bot.a_star_target is None:
-            strategy = Strategy(bot.dirt_list)
+            strategy = bot.strategy
             # bot.a_star_target = strategy.find_nearest_dirt(current_grid)
             # bot.a_star_target = strategy.find_farest_dirt(current_grid)
             # print(f"a_star_target: {bot.a_star_target}")
@@ -247,7 +310,7 @@ class Strategy:
             # 根据当前网格灰尘数量选择目标
             dirt_per_cell = strategy.calculate_dirt_per_cell()
             current_dirt_count = dirt_per_cell.get(current_grid, 0)
-            threshold = 10  # 可调整阈值
+            threshold = config.dirt_threshold  # 可调整阈值
             if current_dirt_count <= threshold:
                 bot.a_star_target = strategy.find_most_dirty_cell(current_grid)
             else:
@@ -263,7 +326,7 @@ class Strategy:
             # return
 
         if not bot.a_star_path or bot.a_star_path[0] != current_grid:
-            bot.a_star_path = Strategy.compute_a_star_path(current_grid, bot.a_star_target, bot.dirt_list)
+            bot.a_star_path = bot.strategy.plan_path(current_grid, bot.a_star_target)
 
         if bot.a_star_path:
             next_cell = bot.a_star_path[0]
@@ -287,3 +350,307 @@ class Strategy:
                     bot.a_star_target = None
         else:
             bot.vl = bot.vr = 5.0
+
+    @staticmethod
+    def chase_strategy(bot, charger_l, charger_r):
+        """
+        Drive to target cells along planner paths and collect their dirt.
+
+        Targets are chosen as in `a_star_strategy`, or handed out by the fleet's
+        `TaskAllocator`. The robot follows the path cell by cell (see `follow_path`) at
+        `bot_v_positive_max`, and in the target cell its `DirtChase` collects the dirt.
+        The target is kept until the cell is empty, and a target cell whose remaining dirt
+        cannot be reached is not chosen again. With no dirt left to chase, the robot
+        explores unvisited cells (see `explore_strategy`).
+
+        Args:
+            bot: Bot
+            charger_l (float): Sensor reading from the left charger detector.
+            charger_r (float): Sensor reading from the right charger detector.
+        """
+        config = bot.strategy.config
+        if bot.battery < config.low_battery:
+            Strategy.head_for_charger(bot, charger_l, charger_r)
+            return
+
+        cell_size = config.cell_size
+        curr_col = int(bot.x // cell_size)
+        curr_row = int(bot.y // cell_size)
+        current_grid = (curr_col, curr_row)
+
+        if bot.is_turning:
+            bot.a_star_detour = current_grid  # the straight leg ran into an obstacle
+            return
+
+        if bot.a_star_target is None:
+            strategy = bot.strategy
+            # bot.a_star_target = strategy.find_nearest_dirt(current_grid)
+            # bot.a_star_target = strategy.find_farest_dirt(current_grid)
+            # print(f"a_star_target: {bot.a_star_target}")
+
+            # 根据当前网格灰尘数量选择目标
+            dirt_per_cell = strategy.calculate_dirt_per_cell()
+            current_dirt_count = dirt_per_cell.get(current_grid, 0)
+            threshold = config.dirt_threshold  # 可调整阈值
+            if current_dirt_count <= threshold:
+                bot.a_star_target = strategy.find_most_dirty_cell(current_grid, bot.a_star_done)
+            else:
+                bot.a_star_target = strategy.find_nearest_dirt(current_grid, bot.a_star_done)
+
+
+            if bot.a_star_target is None:
+                Strategy.explore_strategy(bot, charger_l, charger_r)
+                return
+            bot.a_star_path.clear()
+        # else:
+            # print("a_star_target: exists")
+            # return
+
+        path = Strategy.follow_path(bot, current_grid, bot.a_star_target)
+        if not path or (len(path) == 1 and not bot.chase.step(bot, bot.a_star_target)):
+            bot.a_star_done.add(bot.a_star_target)
+            bot.a_star_target = None
+            bot.a_star_path.clear()
+
+    @staticmethod
+    def follow_path(bot, current_grid, goal):
+        """
+        Steer for one tick along the bot's planner path to a goal cell.
+
+        The bot heads for the centre of the next cell of `bot.a_star_path`, or of its own
+        cell after a boundary turn or when an obstacle corner is in the way, since that
+        centre is clear of obstacles in line with the next one. Cells it has passed are
+        dropped, and the path is only replanned once the bot strays off it or the goal
+        changes. The bot has three times the path's length at cruising speed, plus 60
+        ticks, to reach a new goal.
+
+        Args:
+            bot: Bot
+            current_grid (tuple): The bot's grid coordinates (col, row).
+            goal (tuple): The goal grid coordinates (col, row).
+
+        Returns:
+            list: The rest of the path, starting at the bot's cell, or [] if the goal is
+                unreachable or was not reached in time, e.g. because a cat sits in the
+                way. The wheels are only set if it holds more than one cell.
+        """
+        config = bot.strategy.config
+        cell_size = config.cell_size
+        speed = config.bot_v_positive_max
+        if goal != bot.path_goal:
+            bot.path_goal = goal
+            bot.path_ticks_left = None
+            bot.a_star_path = []
+        path = bot.a_star_path
+        if current_grid in path:
+            del path[:path.index(current_grid)]  # cells already passed
+        else:
+            path = bot.a_star_path = bot.strategy.plan_path(current_grid, goal)
+        if bot.path_ticks_left is None and path:
+            bot.path_ticks_left = int(3 * len(path) * cell_size / speed) + 60
+
+        if len(path) > 1:
+            if bot.path_ticks_left <= 0:
+                return []
+            bot.path_ticks_left -= 1
+            next_cell = path[bot.a_star_detour != current_grid]
+            # the centres of border cells may lie outside the area the bots can drive in
+            target_x = min(max((next_cell[0] + 0.5) * cell_size, config.bot_x_min), config.bot_x_max)
+            target_y = min(max((next_cell[1] + 0.5) * cell_size, config.bot_y_min), config.bot_y_max)
+            if math.hypot(bot.x - target_x, bot.y - target_y) < speed:
+                bot.a_star_detour = None
+            if not Strategy.drive_to(bot, target_x, target_y, speed):
+                bot.a_star_detour = current_grid
+        return path
+
+    @staticmethod
+    def explore_strategy(bot, charger_l, charger_r):
+        """
+        Explore the cells no bot of the fleet has visited yet, nearest first.
+
+        The fleet shares one occupancy map, so a cell explored by any bot is done for
+        all of them and the bots spread out. The bot follows a planner path to the
+        nearest unexplored cell and picks the next one once that cell has been
+        visited. Cells the planner cannot reach are left out, and the bot stops
+        once nothing is left to explore. `chase_strategy` falls back to this when
+        there is no dirt left to chase.
+
+        Args:
+            bot: Bot
+            charger_l (float): Sensor reading from the left charger detector.
+            charger_r (float): Sensor reading from the right charger detector.
+        """
+        config = bot.strategy.config
+        if bot.battery < config.low_battery:
+            Strategy.head_for_charger(bot, charger_l, charger_r)
+            return
+
+        cell_size = config.cell_size
+        current_grid = (int(bot.x // cell_size), int(bot.y // cell_size))
+        if bot.is_turning:
+            bot.a_star_detour = current_grid
+            return
+
+        shared = bot.fleet.map.shared
+        while True:
+            if bot.explore_target is None or shared[bot.explore_target]:
+                bot.explore_target = bot.find_nearest_unexplored(shared | bot.explore_skipped)
+                bot.a_star_path.clear()
+                if bot.explore_target is None:
+                    bot.vl = bot.vr = 0.0
+                    return
+            if Strategy.follow_path(bot, current_grid, bot.explore_target):
+                return
+            bot.explore_skipped.set(*bot.explore_target)
+            bot.explore_target = None
+
+    @staticmethod
+    def head_for_charger(bot, charger_l, charger_r):
+        """
+        Turn towards the brighter charger sensor, and drive on once facing the charger.
+
+        Args:
+            bot: Bot
+            charger_l (float): Sensor reading from the left charger detector.
+            charger_r (float): Sensor reading from the right charger detector.
+        """
+        if charger_r > charger_l:
+            bot.vl, bot.vr = 2.0, -2.0
+        elif charger_r < charger_l:
+            bot.vl, bot.vr = -2.0, 2.0
+        elif abs(charger_r - charger_l) < charger_l * 0.1:
+            bot.vl, bot.vr = 5.0, 5.0
+
+    @staticmethod
+    def coverage_strategy(bot, charger_l, charger_r):
+        """
+        Sweep the free space along the scenario's boustrophedon route.
+
+        The route is precomputed once per scenario (see `CoveragePlan`) and split into
+        one contiguous share of lanes per bot of the fleet. The bot turns on the spot
+        towards its next waypoint, drives straight at `bot_v_positive_max` and slows
+        down on approach so the obstacle look-ahead does not fire at lane ends. A bot
+        pushed off the route so that an obstacle blocks its way goes round through the
+        free cells (see `CoverageCursor.detour`), and a waypoint that cannot be reached
+        in time is skipped. Once its share is done, the bot falls back to
+        `chase_strategy` to collect the remaining dirt.
+
+        Args:
+            bot: Bot
+            charger_l (float): Sensor reading from the left charger detector.
+            charger_r (float): Sensor reading from the right charger detector.
+        """
+        config = bot.strategy.config
+        if bot.battery < config.low_battery:
+            Strategy.head_for_charger(bot, charger_l, charger_r)
+            return
+
+        if bot.is_turning:
+            return
+
+        speed = config.bot_v_positive_max
+        cursor = bot.coverage
+        if cursor is None:
+            plan = CoveragePlan.for_config(config)
+            first, stop = plan.shares(len(bot.fleet.x))[bot.index]
+            cursor = bot.coverage = CoverageCursor(plan.waypoints(bot.x, bot.y, first, stop))
+            cursor.advance(bot.x, bot.y, speed)
+
+        target = cursor.target
+        while target is not None and (math.hypot(target[0] - bot.x, target[1] - bot.y) < 4
+                                      or cursor.ticks_left <= 0):
+            target = cursor.advance(bot.x, bot.y, speed)
+        if target is None:
+            Strategy.chase_strategy(bot, charger_l, charger_r)
+            return
+        cursor.ticks_left -= 1
+
+        if not Strategy.drive_to(bot, target[0], target[1], speed):
+            cursor.detour(CoveragePlan.for_config(config), bot.x, bot.y, speed)
+
+    @staticmethod
+    def drive_to(bot, x, y, speed):
+        """
+        Set the wheel speeds for one tick of driving towards a point.
+
+        The bot turns on the spot while the point is well off its heading, otherwise it
+        drives along an arc with a proportional heading correction. The forward speed is
+        the fastest at which the obstacle look-ahead of the kinematics stays quiet, so the
+        bot slows down past obstacle corners and next to points close to an obstacle
+        instead of setting off a boundary turn. A bot too close to an obstacle to move
+        forward at all backs away first; one that cannot back away either drives on and
+        lets the boundary turn of the kinematics free it. Wheel speeds stay within `speed`.
+
+        Args:
+            bot: Bot
+            x (float): x-coordinate of the point.
+            y (float): y-coordinate of the point.
+            speed (float): Cruising wheel speed.
+
+        Returns:
+            bool: False if the bot could not drive towards the point at all.
+        """
+        fleet = bot.fleet
+        distance = math.hypot(x - bot.x, y - bot.y)
+        desired_angle = math.atan2(y - bot.y, x - bot.x)
+        angle_diff = (desired_angle - bot.theta + math.pi) % (2 * math.pi) - math.pi
+        if abs(angle_diff) > 1.0:
+            # turn on the spot; the heading changes by (vl - vr) / ll per tick
+            turn = min(speed, max(1.0, abs(angle_diff) * bot.ll / 2))
+            bot.vl, bot.vr = (turn, -turn) if angle_diff > 0 else (-turn, turn)
+            return True
+        cruise = min(speed, max(2.5, distance / 5))
+        forward = fleet.clear_speed(bot.index, cruise)
+        if forward == 0:
+            # back away, or if even that is blocked leave it to the kinematics' boundary turn
+            bot.vl = bot.vr = fleet.clear_speed(bot.index, -speed / 2) or cruise
+            return False
+        forward *= math.cos(angle_diff)
+        steer = angle_diff * bot.ll / 2
+        bot.vl = max(-speed, min(speed, forward + steer))
+        bot.vr = max(-speed, min(speed, forward - steer))
+        return True
+
+    @staticmethod
+    def tour_strategy(bot, charger_l, charger_r):
+        """
+        Visit the dirty cells along an optimised tour, emptying each before moving on.
+
+        The bot's `TourCursor` orders the cells it was given with a `TourPlanner`
+        (exact grid distances, nearest neighbour improved by 2-opt and Or-opt within
+        `tour_time_budget` seconds) and re-optimises the rest whenever a cell empties.
+        Between cells the bot follows planner paths (see `follow_path`); inside the
+        target cell its `DirtChase` collects the dirt piece by piece. Cells it cannot
+        reach, or not in time, are left out of the tour.
+
+        Args:
+            bot: Bot
+            charger_l (float): Sensor reading from the left charger detector.
+            charger_r (float): Sensor reading from the right charger detector.
+        """
+        strategy = bot.strategy
+        config = strategy.config
+        if bot.battery < config.low_battery:
+            Strategy.head_for_charger(bot, charger_l, charger_r)
+            return
+
+        cell_size = config.cell_size
+        current = (int(bot.x // cell_size), int(bot.y // cell_size))
+        if bot.is_turning:
+            bot.a_star_detour = current
+            return
+
+        cursor = bot.tour
+        if cursor is None:
+            cursor = bot.tour = TourCursor(TourPlanner(strategy.planner, config.tour_time_budget))
+        fleet = bot.fleet
+        bot_cells = list(zip((fleet.x // cell_size).astype(int).tolist(),
+                             (fleet.y // cell_size).astype(int).tolist()))
+        target = cursor.target_cell(current, strategy.dirt_list.cell_counts, bot_cells, bot.index)
+        if target is None:
+            bot.vl = bot.vr = 0.0
+            return
+
+        path = Strategy.follow_path(bot, current, target)
+        if not path or (len(path) == 1 and not bot.chase.step(bot, target)):
+            cursor.done.add(target)
@@ -0,0 +1,247 @@
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from batch import run_one
+from config import RuntimeConfig
+
+# Two-sided 95% critical values of Student's t distribution by degrees of freedom
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365, 8: 2.306,
+    9: 2.262, 10: 2.228, 11: 2.201, 12: 2.179, 13: 2.160, 14: 2.145, 15: 2.131,
+    16: 2.120, 17: 2.110, 18: 2.101, 19: 2.093, 20: 2.086, 21: 2.080, 22: 2.074,
+    23: 2.069, 24: 2.064, 25: 2.060, 26: 2.056, 27: 2.052, 28: 2.048, 29: 2.045,
+    30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980,
+}
+
+
+def t_critical(df):
+    """
+    Args:
+        df (int): Degrees of freedom.
+
+    Returns:
+        float: The two-sided 95% critical value, conservatively rounded down to a tabulated df.
+    """
+    if df < 1:
+        return math.inf
+    return T_CRITICAL_95[max(k for k in T_CRITICAL_95 if k <= df)] if df <= 120 else 1.960
+
+
+def grid(space):
+    """
+    Expand a parameter grid into its points.
+
+    Args:
+        space (dict): Config field name -> list of values.
+
+    Returns:
+        list: One dict of field values per combination.
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[n] for n in names))]
+
+
+def random_points(space, samples, rng=random):
+    """
+    Draw points from a random-search space.
+
+    Args:
+        space (dict): Config field name -> list of choices, or a (low, high) tuple
+            sampled uniformly (as integers if both bounds are integers).
+        samples (int): Number of points.
+        rng: Random number generator.
+
+    Returns:
+        list: One dict of field values per point.
+    """
+    points = []
+    for _ in range(samples):
+        point = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    point[name] = rng.randint(low, high)
+                else:
+                    point[name] = rng.uniform(low, high)
+            else:
+                point[name] = rng.choice(values)
+        points.append(point)
+    return points
+
+
+@dataclass
+class PointSummary:
+    """Dirt collected at one sweep point, over all of its seeds."""
+
+    params: dict
+    runs: int
+    mean: float
+    std: float
+    ci_low: float  # 95% confidence interval of the mean
+    ci_high: float
+
+    @classmethod
+    def of(cls, params, values):
+        n = len(values)
+        mean = sum(values) / n
+        std = math.sqrt(sum((v - mean) ** 2 for v in values) / (n - 1)) if n > 1 else 0.0
+        half = t_critical(n - 1) * std / math.sqrt(n) if n > 1 else math.inf
+        return cls(params, n, mean, std, mean - half, mean + half)
+
+
+class Sweep:
+    """Runs every point of a parameter sweep on the same seeds across worker processes.
+
+    Each (point, seed) run is headless and seeded, so points are compared on
+    identical worlds. Completed runs are appended to a JSON-lines cache keyed by
+    the full config and seed, and are not run again when the sweep is repeated or
+    extended.
+    """
+
+    def __init__(self, points, seeds, base=None, moves_max=None, cache_path=None, workers=None):
+        """
+        Args:
+            points (list): Dicts of config overrides, one per point.
+            seeds (list): Seeds every point is run with.
+            base (RuntimeConfig, optional): Config the overrides apply to.
+            moves_max (int, optional): Move budget of every run.
+            cache_path (str, optional): JSON-lines file of completed runs.
+            workers (int, optional): Number of worker processes. Defaults to the CPU count.
+        """
+        self.points = points
+        self.seeds = list(seeds)
+        self.base = base if base is not None else RuntimeConfig()
+        self.moves_max = moves_max
+        self.cache_path = cache_path
+        self.workers = workers
+        self.results = self._load_cache()  # run key -> dirt collected
+
+    def _key(self, config, seed):
+        payload = json.dumps([config.to_dict(), seed, self.moves_max], sort_keys=True)
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def _load_cache(self):
+        results = {}
+        if self.cache_path and os.path.exists(self.cache_path):
+            with open(self.cache_path, encoding="utf-8") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        results[entry["key"]] = entry["dirt_collected"]
+        return results
+
+    def _store(self, key, params, seed, result):
+        self.results[key] = result.dirt_collected
+        if self.cache_path:
+            directory = os.path.dirname(self.cache_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.cache_path, "a", encoding="utf-8") as file:
+                file.write(json.dumps({"key": key, "params": params, "seed": seed,
+                                       "dirt_collected": result.dirt_collected,
+                                       "duration": result.duration}) + "\n")
+
+    def run(self, progress=True):
+        """
+        Run every (point, seed) pair that is not cached yet.
+
+        Args:
+            progress (bool): Print a line as each run finishes.
+
+        Returns:
+            list: A `PointSummary` per point, best mean first.
+        """
+        configs = [self.base.with_overrides(**point) for point in self.points]
+        pending = {}
+        for point, config in zip(self.points, configs):
+            for seed in self.seeds:
+                key = self._key(config, seed)
+                if key not in self.results and key not in pending:
+                    pending[key] = (point, config, seed)
+
+        if pending:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(run_one, 0, seed, config, self.moves_max): key
+                           for key, (point, config, seed) in pending.items()}
+                for done, future in enumerate(as_completed(futures), 1):
+                    key = futures[future]
+                    point, _, seed = pending[key]
+                    result = future.result()
+                    self._store(key, point, seed, result)
+                    if progress:
+                        print(f"[{done}/{len(pending)}] {point} seed {seed}: "
+                              f"collected {result.dirt_collected} dirt")
+
+        summaries = [
+            PointSummary.of(point, [self.results[self._key(config, seed)] for seed in self.seeds])
+            for point, config in zip(self.points, configs)
+        ]
+        summaries.sort(key=lambda summary: summary.mean, reverse=True)
+        return summaries
+
+
+def _parse_value(name, text):
+    """A command-line value, typed like the config field `name` (see `RuntimeConfig.with_overrides`)."""
+    return getattr(RuntimeConfig().with_overrides(**{name: text}), name)
+
+
+def _parse_space(entries, ranges=False):
+    space = {}
+    for entry in entries:
+        name, sep, values = entry.partition("=")
+        if not sep:
+            raise ValueError(f"Expected name=values, got: {entry}")
+        name = name.strip()
+        if ranges and ":" in values:
+            low, high = (_parse_value(name, v) for v in values.split(":", 1))
+            space[name] = (low, high)
+        else:
+            space[name] = [_parse_value(name, v) for v in values.split(",")]
+    return space
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sweep config parameters over seeded headless runs")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help="grid axis, e.g. --grid dirt_threshold=5,10,20")
+    parser.add_argument("--random", action="append", default=[], metavar="NAME=LOW:HIGH",
+                        help="random-search axis, a range LOW:HIGH or choices V1,V2,...")
+    parser.add_argument("--samples", type=int, default=20, help="points drawn for random search")
+    parser.add_argument("--seeds", type=int, default=10, help="seeds per point")
+    parser.add_argument("--seed", type=int, default=0, help="first seed; also seeds the random search")
+    parser.add_argument("--config", metavar="FILE", help="TOML or JSON file of base config fields")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a base config field")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all cores)")
+    parser.add_argument("--cache", default="logging/sweep_cache.jsonl",
+                        help="JSON-lines file of completed runs")
+    parser.add_argument("--top", type=int, default=5, help="number of best points to report")
+    args = parser.parse_args()
+
+    try:
+        grid_space = _parse_space(args.grid)
+        random_space = _parse_space(args.random, ranges=True)
+    except ValueError as error:
+        parser.error(str(error))
+    points = grid(grid_space) if grid_space else [{}]
+    if random_space:
+        extra = random_points(random_space, args.samples, random.Random(args.seed))
+        points = [{**p, **q} for p in points for q in extra]
+
+    sweep = Sweep(points, range(args.seed, args.seed + args.seeds),
+                  base=RuntimeConfig.from_args(args.config, args.set),
+                  cache_path=args.cache, workers=args.workers)
+    summaries = sweep.run()
+
+    print(f"\nBest {min(args.top, len(summaries))} of {len(summaries)} points "
+          f"(dirt collected, mean and 95% CI over {len(sweep.seeds)} seeds):")
+    for summary in summaries[:args.top]:
+        print(f"{summary.mean:8.1f}  [{summary.ci_low:7.1f}, {summary.ci_high:7.1f}]  {summary.params}")
@@ -0,0 +1,32 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from allocation import linear_assignment
+
+
+def brute_force(cost):
+    """Minimum total cost over every way of pairing min(n, m) rows and columns."""
+    n, m = cost.shape
+    if n <= m:
+        return min(cost[np.arange(n), list(cols)].sum() for cols in itertools.permutations(range(m), n))
+    return min(cost[list(rows), np.arange(m)].sum() for rows in itertools.permutations(range(n), m))
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (1, 4), (3, 3), (4, 2), (4, 6), (6, 6), (7, 5)])
+def test_linear_assignment_matches_brute_force(shape):
+    rng = np.random.default_rng(sum(shape))
+    for trial in range(30):
+        # integer costs give many ties, real ones exercise the potentials
+        cost = rng.integers(0, 5, shape) if trial % 2 else rng.uniform(-10, 10, shape)
+        rows, cols = linear_assignment(cost)
+        assert len(rows) == len(cols) == min(shape)
+        assert list(rows) == sorted(set(rows.tolist()))
+        assert len(set(cols.tolist())) == len(cols)
+        assert cost[rows, cols].sum() == pytest.approx(brute_force(cost))
+
+
+def test_linear_assignment_empty():
+    rows, cols = linear_assignment(np.zeros((0, 3)))
+    assert len(rows) == len(cols) == 0
@@ -0,0 +1,32 @@
+import pytest
+
+from config import RuntimeConfig
+
+
+@pytest.mark.parametrize("text, expected", [("true", True), ("True", True), ("FALSE", False), ("false", False)])
+def test_boolean_overrides(text, expected):
+    assert RuntimeConfig.from_args(overrides=[f"allocate_tasks={text}"]).allocate_tasks is expected
+
+
+def test_overrides_are_parsed_by_field_type():
+    config = RuntimeConfig().with_overrides(bot_num="3", charger_gain="1e5", strategy="tour",
+                                            obstacles="[[0, 0, 10, 10]]", dirt_threshold=12.0)
+    assert config.bot_num == 3
+    assert config.charger_gain == 1e5
+    assert config.strategy == "tour"
+    assert config.obstacles == ((0, 0, 10, 10),)
+    assert config.dirt_threshold == 12 and isinstance(config.dirt_threshold, int)
+
+
+@pytest.mark.parametrize("name, value", [
+    ("bot_num", '"3"'), ("bot_num", 2.5), ("bot_num", True), ("allocate_tasks", "maybe"),
+    ("allocate_tasks", 1), ("strategy", 3), ("obstacles", "5"), ("charger_gain", "abc"),
+])
+def test_mistyped_overrides_are_rejected(name, value):
+    with pytest.raises(ValueError, match=name):
+        RuntimeConfig().with_overrides(**{name: value})
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError, match="Unknown config field"):
+        RuntimeConfig().with_overrides(bot_count=3)
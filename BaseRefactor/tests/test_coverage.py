@@ -0,0 +1,116 @@
+import numpy as np
+import pytest
+
+from config import RuntimeConfig
+from coverage import CoverageCursor, CoveragePlan
+from obstacles import ObstacleMap
+
+CLEARANCE = 20.0
+SPACING = 50.0
+
+
+def scenarios():
+    config = RuntimeConfig()
+    yield config.obstacles, (config.bot_x_min, config.bot_x_max), (config.bot_y_min, config.bot_y_max)
+    rng = np.random.default_rng(6)
+    for _ in range(4):
+        corners = rng.uniform(0, 800, (6, 2))
+        sizes = rng.uniform(20, 200, (6, 2))
+        yield np.hstack([corners, corners + sizes]).tolist(), (0.0, 900.0), (0.0, 700.0)
+
+
+@pytest.fixture(params=list(scenarios()), ids=lambda s: f"{len(s[0])}-obstacles")
+def scenario(request):
+    rects, x_range, y_range = request.param
+    obstacles = ObstacleMap(rects)
+    return CoveragePlan(obstacles, x_range, y_range, SPACING, CLEARANCE), obstacles
+
+
+def in_cells(plan, x, y):
+    """Number of open cells holding each point."""
+    hits = np.zeros(len(x), dtype=int)
+    for x0, x1, y0, y1 in plan.cells:
+        hits += (x0 < x) & (x < x1) & (y0 < y) & (y < y1)
+    return hits
+
+
+def test_cells_are_exactly_the_free_space(scenario):
+    plan, obstacles = scenario
+    for x0, x1, y0, y1 in plan.cells:
+        assert plan.x_range[0] <= x0 < x1 <= plan.x_range[1]
+        assert plan.y_range[0] <= y0 < y1 <= plan.y_range[1]
+
+    # sample points off every cell edge, so each is inside or outside the cells
+    rng = np.random.default_rng(7)
+    x = rng.uniform(*plan.x_range, 20000)
+    y = rng.uniform(*plan.y_range, 20000)
+    hits = in_cells(plan, x, y)
+    assert hits.max() <= 1
+    assert (hits == 1).tolist() == (~obstacles.contains(x, y, margin=CLEARANCE)).tolist()
+
+
+def test_lanes_cover_every_cell(scenario):
+    plan, _ = scenario
+    assert sorted(plan.order) == list(range(len(plan.cells)))
+    for cell, (x0, x1, y0, y1) in enumerate(plan.cells):
+        lanes = sorted(x for c, x, _, _ in plan.lanes if c == cell)
+        assert lanes and x0 < lanes[0] and lanes[-1] < x1
+        # every point of the cell is within half a lane spacing of a lane
+        gaps = np.diff([x0] + lanes + [x1]) * np.array([2] + [1] * (len(lanes) - 1) + [2])
+        assert gaps.max() <= SPACING + 1e-9
+    for cell, _, start, end in plan.lanes:
+        _, _, y0, y1 = plan.cells[cell]
+        assert sorted((start, end)) == [y0, y1]
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 7, 200])
+def test_shares_partition_the_lanes(scenario, count):
+    plan, _ = scenario
+    shares = plan.shares(count)
+    assert len(shares) == count
+    assert shares[0][0] == 0 and shares[-1][1] == len(plan.lanes)
+    for (_, stop), (first, _) in zip(shares, shares[1:]):
+        assert stop == first
+    assert all(first <= stop for first, stop in shares)
+
+
+def segment_is_free(plan, a, b):
+    """Whether the segment a-b stays in the union of the (closed) cells."""
+    t = np.linspace(0, 1, 200)
+    x, y = a[0] + t * (b[0] - a[0]), a[1] + t * (b[1] - a[1])
+    inside = np.zeros(len(t), dtype=bool)
+    for x0, x1, y0, y1 in plan.cells:
+        inside |= (x0 - 1e-9 <= x) & (x <= x1 + 1e-9) & (y0 - 1e-9 <= y) & (y <= y1 + 1e-9)
+    return inside.all()
+
+
+def test_waypoint_legs_stay_in_free_rectangles(scenario):
+    plan, _ = scenario
+    rng = np.random.default_rng(8)
+    starts = [(plan.x_range[0], plan.y_range[0])] + rng.uniform(0, 700, (3, 2)).tolist()
+    for (first, stop), (x, y) in zip(plan.shares(len(starts)), starts):
+        points = list(plan.waypoints(x, y, first, stop))
+        assert points[0] == plan.locate(x, y)[1]
+        for a, b in zip(points, points[1:]):
+            assert segment_is_free(plan, a, b)
+        # every lane of the share is driven end to end
+        for _, lane_x, start, end in plan.lanes[first:stop]:
+            assert any(points[i] == (lane_x, start) and points[i + 1] == (lane_x, end)
+                       for i in range(len(points) - 1))
+
+
+def test_detour_goes_round_an_obstacle():
+    config = RuntimeConfig()
+    x_range, y_range = (config.bot_x_min, config.bot_x_max), (config.bot_y_min, config.bot_y_max)
+    plan = CoveragePlan(ObstacleMap(config.obstacles), x_range, y_range, SPACING, CLEARANCE)
+    # pushed below the obstacle (500, 700, 600, 800) on the way to a lane above it
+    x, y = 550.0, 810.0
+    cursor = CoverageCursor(iter([(550.0, 650.0), (650.0, 650.0)]))
+    cursor.advance(x, y, 10.0)
+    cursor.detour(plan, x, y, 10.0)
+    assert cursor.target == plan.locate(x, y)[1]
+    cursor.detour(plan, x, y, 10.0)
+    points = [(x, y), cursor.target] + list(cursor.waypoints)
+    assert points[-2:] == [(550.0, 650.0), (650.0, 650.0)]
+    for a, b in zip(points[1:], points[2:-1]):
+        assert segment_is_free(plan, a, b)
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from dirt import CellCounts
+
+
+def reference_counts(cols, rows, collected):
+    counts = {}
+    for col, row in zip(cols.tolist(), rows.tolist()):
+        counts[col, row] = counts.get((col, row), 0) + 1
+    for col, row in collected:
+        counts[col, row] -= 1
+    return counts
+
+
+@pytest.mark.parametrize("dense", [True, False])
+def test_cell_counts_track_collection(dense, monkeypatch):
+    if not dense:
+        monkeypatch.setattr(CellCounts, "DENSE_MAX_CELLS", 0)
+    rng = np.random.default_rng(5)
+    cols, rows = rng.integers(0, 12, 400), rng.integers(0, 9, 400)
+    counts = CellCounts(cols, rows)
+    assert (counts.grid is not None) == dense
+
+    order = rng.permutation(len(cols))
+    collected = []
+    for batch in np.array_split(order, 40):
+        counts.decrement(cols[batch], rows[batch])
+        collected += list(zip(cols[batch].tolist(), rows[batch].tolist()))
+        expected = reference_counts(cols, rows, collected)
+
+        nz_cols, nz_rows, nz_counts = counts.nonzero()
+        left = {cell: count for cell, count in sorted(expected.items()) if count}
+        assert list(zip(nz_cols.tolist(), nz_rows.tolist())) == list(left)
+        assert nz_counts.tolist() == list(left.values())
+        for cell, count in expected.items():
+            assert counts.get(cell) == count
+        assert counts.get((50, 50), -1) == -1
+
+        top, cells = counts.most_dirty()
+        best = max(expected.values())
+        assert top == best
+        if best:
+            assert sorted(cells) == sorted(cell for cell, count in expected.items() if count == best)
+        else:
+            assert cells == []
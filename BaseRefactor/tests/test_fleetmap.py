@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from fleetmap import BitGrid, FleetMap
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (5, 8), (7, 13), (16, 3)])
+def test_bit_grid_matches_boolean_array(shape):
+    rng = np.random.default_rng(shape[1])
+    a, b = rng.random(shape) < 0.3, rng.random(shape) < 0.6
+    grid_a, grid_b = BitGrid.from_mask(a), BitGrid.from_mask(b)
+    assert np.array_equal(np.asarray(grid_a), a)
+    assert np.array_equal(np.asarray(grid_a | grid_b), a | b)
+    assert np.array_equal(np.asarray(grid_a & grid_b), a & b)
+    assert np.array_equal(np.asarray(~grid_a), ~a)
+    assert (~grid_a).count() == (~a).sum()
+
+    cols, rows = rng.integers(0, shape[0], 10), rng.integers(0, shape[1], 10)
+    grid_a.set(cols, rows)
+    a[cols, rows] = True
+    assert np.array_equal(grid_a.get(cols, rows), a[cols, rows])
+    assert grid_a[int(cols[0]), int(rows[0])] is True
+    assert grid_a.count() == a.sum()
+    c0, r0 = rng.integers(0, shape[0]), rng.integers(0, shape[1])
+    assert np.array_equal(grid_a.window(c0, shape[0], r0, shape[1]), a[c0:, r0:])
+
+
+def test_fleet_map_merges_bot_maps():
+    fleet_map = FleetMap(6, 5, 10)
+    first, second = fleet_map.add_bot(), fleet_map.add_bot()
+    fleet_map.mark([first, second], np.array([5.0, 55.0]), np.array([5.0, 45.0]))
+    assert np.array_equal(np.argwhere(np.asarray(fleet_map.view(second))), [[5, 4]])
+    assert np.array_equal(np.asarray(fleet_map.merged([first, second])), np.asarray(fleet_map.merged()))
+    assert fleet_map.coverage() == pytest.approx(2 / 30)
+
+
+def test_nearest_unexplored_matches_brute_force():
+    rng = np.random.default_rng(4)
+    cols, rows, cell_size = 40, 30, 10.0
+    for _ in range(20):
+        blocked = rng.random((cols, rows)) < 0.2
+        explored = rng.random((cols, rows)) < rng.uniform(0.5, 1.0)
+        fleet_map = FleetMap(cols, rows, cell_size, blocked)
+        x, y = rng.uniform(0, cols * cell_size, 8), rng.uniform(0, rows * cell_size, 8)
+        found = fleet_map.nearest_unexplored(x, y, explored)
+
+        free = np.argwhere(~explored & ~blocked)
+        centres = (free + 0.5) * cell_size
+        for i in range(len(x)):
+            if not len(free):
+                assert tuple(found[i]) == (-1, -1)
+                continue
+            d2 = (centres[:, 0] - x[i]) ** 2 + (centres[:, 1] - y[i]) ** 2
+            col, row = found[i]
+            assert not explored[col, row] and not blocked[col, row]
+            assert ((col + 0.5) * cell_size - x[i]) ** 2 + ((row + 0.5) * cell_size - y[i]) ** 2 \
+                == pytest.approx(d2.min())
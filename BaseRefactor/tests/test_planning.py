@@ -0,0 +1,131 @@
+import gc
+
+import numpy as np
+import pytest
+
+from planning import DStarLite, GridMap, ShortestPathTable, a_star
+
+
+def random_grid(rng, cols=12, rows=10, density=0.25):
+    grid_map = GridMap.with_border(cols, rows)
+    grid_map.set_blocked(rng.random((cols, rows)) < density)
+    return grid_map
+
+
+def random_free_cell(rng, grid_map):
+    cols, rows = np.nonzero(~grid_map.blocked)
+    i = rng.integers(len(cols))
+    return int(cols[i]), int(rows[i])
+
+
+def assert_valid_path(grid_map, path, start, goal):
+    assert path[0] == start and path[-1] == goal
+    for (c0, r0), (c1, r1) in zip(path, path[1:]):
+        assert abs(c0 - c1) + abs(r0 - r1) == 1
+        assert grid_map.is_free((c1, r1))
+
+
+def test_dstar_lite_matches_a_star():
+    rng = np.random.default_rng(0)
+    for _ in range(100):
+        grid_map = random_grid(rng)
+        start, goal = random_free_cell(rng, grid_map), random_free_cell(rng, grid_map)
+        expected = a_star(grid_map, start, goal)
+        path = DStarLite(grid_map).plan(start, goal)
+        assert len(path) == len(expected)
+        if path:
+            assert_valid_path(grid_map, path, start, goal)
+
+
+def test_dstar_lite_repairs_after_moves_and_grid_changes():
+    rng = np.random.default_rng(1)
+    for _ in range(30):
+        grid_map = random_grid(rng, density=0.2)
+        start, goal = random_free_cell(rng, grid_map), random_free_cell(rng, grid_map)
+        planner = DStarLite(grid_map)
+        path = planner.plan(start, goal)
+        for _ in range(8):
+            if len(path) > 1:
+                start = path[1]
+            toggle = np.zeros_like(grid_map.blocked)
+            toggle[1:-1, 1:-1] = rng.random((grid_map.cols - 2, grid_map.rows - 2)) < 0.05
+            toggle[start] = toggle[goal] = False
+            freed = toggle & grid_map.blocked
+            grid_map.set_blocked(toggle & ~grid_map.blocked)
+            grid_map.set_free(freed)
+            path = planner.plan(start, goal)
+            expected = a_star(grid_map, start, goal)
+            assert len(path) == len(expected)
+            if path:
+                assert_valid_path(grid_map, path, start, goal)
+
+
+def test_change_log_is_trimmed_to_the_oldest_reader():
+    grid_map = GridMap.with_border(6, 6)
+    mask = np.zeros((6, 6), dtype=bool)
+    mask[2, 2] = True
+    grid_map.set_blocked(mask)
+    assert grid_map.changes == []  # nobody reads the log
+
+    planner = DStarLite(grid_map)
+    planner.plan((1, 1), (4, 4))
+    for cell in [(2, 3), (3, 2)]:
+        mask[:] = False
+        mask[cell] = True
+        grid_map.set_blocked(mask)
+    assert [version for version, _ in grid_map.changes] == [grid_map.version - 1, grid_map.version]
+    assert len(grid_map.changes_since(planner.version)) == 2
+
+    planner.plan((1, 1), (4, 4))  # applies both changes
+    mask[:] = False
+    mask[3, 3] = True
+    grid_map.set_blocked(mask)
+    assert [version for version, _ in grid_map.changes] == [grid_map.version]
+    assert grid_map.changes_since(grid_map.version - 2) is None  # trimmed
+
+    del planner
+    gc.collect()
+    grid_map.set_free(mask)
+    assert grid_map.changes == []
+
+
+@pytest.mark.parametrize("goal", [(0, 0), (2, 2)])
+def test_dstar_lite_blocked_goal(goal):
+    grid_map = GridMap.with_border(5, 5)
+    mask = np.zeros((5, 5), dtype=bool)
+    mask[2, 2] = True
+    grid_map.set_blocked(mask)
+    assert DStarLite(grid_map).plan((1, 1), goal) == []
+
+
+def test_shortest_path_table_matches_a_star():
+    rng = np.random.default_rng(2)
+    for _ in range(5):
+        grid_map = random_grid(rng)
+        table = ShortestPathTable.build(grid_map, batch_cells=500)
+        for _ in range(40):
+            start, goal = random_free_cell(rng, grid_map), random_free_cell(rng, grid_map)
+            expected = a_star(grid_map, start, goal)
+            path = table.path(start, goal)
+            assert len(path) == len(expected)
+            distance = table.distances_from(start)[goal]
+            if path:
+                assert_valid_path(grid_map, path, start, goal)
+                assert distance == len(path) - 1
+            else:
+                assert distance == ShortestPathTable.UNREACHABLE
+
+
+def test_shortest_path_table_is_persisted_atomically(tmp_path):
+    grid_map = random_grid(np.random.default_rng(3))
+    built = ShortestPathTable.load_or_build(grid_map, str(tmp_path))
+    assert [p.name for p in tmp_path.iterdir()] == [grid_map.digest() + ".npz"]
+    loaded = ShortestPathTable.load_or_build(grid_map, str(tmp_path))
+    assert np.array_equal(loaded.dist, built.dist)
+    assert np.array_equal(loaded.next_dir, built.next_dir)
+
+
+def test_shortest_path_table_refuses_large_grids():
+    side = int(ShortestPathTable.MAX_CELLS ** 0.5) + 1
+    with pytest.raises(ValueError):
+        ShortestPathTable.build(GridMap.with_border(side, side))
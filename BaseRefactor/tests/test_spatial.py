@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from dirt import DirtField
+from spatial import GridIndex
+
+
+def within(x, y, px, py, radius):
+    return set(np.flatnonzero((x - px) ** 2 + (y - py) ** 2 < radius * radius).tolist())
+
+
+@pytest.mark.parametrize("extent, dense", [(1000.0, True), (1e7, False)])
+def test_candidates_cover_every_point_in_range(extent, dense):
+    rng = np.random.default_rng(2)
+    x, y = rng.uniform(-extent / 2, extent, 500), rng.uniform(0, extent, 500)
+    index = GridIndex(x, y, bucket_size=25.0)
+    assert (index.starts is not None) == dense
+
+    for qx, qy in rng.uniform(-extent, 2 * extent, (200, 2)).tolist() + list(zip(x[:50], y[:50])):
+        radius = float(rng.choice([0.0, 10.0, 40.0, 300.0]))
+        found = index.candidates(qx, qy, radius).tolist()
+        assert len(found) == len(set(found))
+        assert within(x, y, qx, qy, radius) <= set(found)
+        # candidates come from the buckets overlapping the query square only
+        assert all(abs(x[i] - qx) <= radius + 25 and abs(y[i] - qy) <= radius + 25 for i in found)
+
+
+@pytest.mark.parametrize("extent", [1000.0, 1e7])
+def test_pairs_match_brute_force(extent):
+    rng = np.random.default_rng(3)
+    x, y = rng.uniform(0, extent, 400), rng.uniform(0, extent, 400)
+    qx, qy = rng.uniform(-50, extent + 50, 100), rng.uniform(-50, extent + 50, 100)
+    qx[:20], qy[:20] = x[:20], y[:20]
+    index = GridIndex(x, y, bucket_size=20.0)
+    for radius in (5.0, 30.0, 200.0):
+        found = set(zip(*(a.tolist() for a in index.pairs(qx, qy, radius))))
+        expected = {(q, p) for q in range(len(qx)) for p in within(x, y, qx[q], qy[q], radius)}
+        assert found == expected
+
+
+def test_empty_index():
+    index = GridIndex(np.zeros(0), np.zeros(0), bucket_size=10.0)
+    assert len(index.candidates(5.0, 5.0, 100.0)) == 0
+    assert all(len(a) == 0 for a in index.pairs(np.array([5.0]), np.array([5.0]), 100.0))
+
+
+def test_dirt_field_collect_matches_brute_force():
+    rng = np.random.default_rng(4)
+    x, y = rng.uniform(0, 1000, 2000), rng.uniform(0, 600, 2000)
+    field = DirtField(x, y)
+    alive = np.ones(len(x), dtype=bool)
+    for px, py in rng.uniform(0, 1000, (300, 2)):
+        expected = sorted(i for i in within(x, y, px, py, 30.0) if alive[i])
+        assert field.collect(px, py, 30.0).tolist() == expected
+        alive[expected] = False
+        assert len(field) == int(alive.sum())
+    assert field.alive_ids().tolist() == np.flatnonzero(alive).tolist()
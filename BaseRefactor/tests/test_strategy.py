@@ -0,0 +1,59 @@
+import pytest
+
+from config import RuntimeConfig
+from simulation import Simulation
+
+
+def collected(seed, **overrides):
+    simulation = Simulation(RuntimeConfig().with_overrides(**overrides), seed=seed)
+    simulation.run()
+    return simulation.counter.dirt_collected
+
+
+@pytest.mark.parametrize("bots, expected", [(1, [176, 216, 282, 208]), (4, [656, 713, 759, 700])])
+def test_default_strategy_reproduces_baseline_results(bots, expected):
+    assert [collected(seed, bot_num=bots) for seed in range(4)] == expected
+
+
+def test_allocated_targets_are_kept_by_chase_bots():
+    chase = sum(collected(seed, bot_num=4, strategy="chase") for seed in range(2))
+    allocated = sum(collected(seed, bot_num=4, strategy="chase", allocate_tasks=True) for seed in range(2))
+    assert allocated > chase
+
+
+def keeps_collecting(seed, **overrides):
+    """Whether every 500 moves up to move 2000, when batteries run low, collect some dirt."""
+    simulation = Simulation(RuntimeConfig().with_overrides(bot_moves_max=2000, **overrides), seed=seed)
+    simulation.run()
+    collected = {0: 0, **simulation.milestones()}
+    return all(collected[move] > collected[move - 500] for move in range(500, 2001, 100))
+
+
+@pytest.mark.parametrize("strategy", ["a_star", "chase"])
+@pytest.mark.parametrize("seed", [4, 5])
+def test_bots_keep_collecting_among_cats(strategy, seed):
+    assert keeps_collecting(seed, bot_num=3, cat_num=5, strategy=strategy)
+
+
+def test_coverage_bots_do_not_set_off_boundary_turns():
+    config = RuntimeConfig().with_overrides(bot_num=4, strategy="coverage", bot_moves_max=1000)
+    simulation = Simulation(config, seed=0)
+    turning = 0
+    while not simulation.finished:
+        simulation.step()
+        turning += int(simulation.fleet.is_turning.sum())
+    assert turning == 0
+
+
+@pytest.mark.parametrize("strategy, seed", [("coverage", 2), ("coverage", 4), ("tour", 4), ("tour", 5)])
+def test_route_following_bots_keep_collecting_among_cats(strategy, seed):
+    assert keeps_collecting(seed, bot_num=3, cat_num=5, strategy=strategy)
+
+
+@pytest.mark.parametrize("seed", [2, 3])
+def test_explore_covers_the_arena_among_cats(seed):
+    config = RuntimeConfig().with_overrides(strategy="explore", cat_num=3, bot_moves_max=2000)
+    simulation = Simulation(config, seed=seed)
+    simulation.run()
+    assert all(bot.explore_target is None for bot in simulation.registry_actives)
+    assert simulation.fleet.map.coverage() > 0.5
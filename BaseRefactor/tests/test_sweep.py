@@ -0,0 +1,16 @@
+import pytest
+
+from sweep import _parse_space
+
+
+def test_values_are_typed_like_their_config_fields():
+    space = _parse_space(["strategy=a_star,tour", "allocate_tasks=True,false", "dirt_threshold=5,10"])
+    assert space == {"strategy": ["a_star", "tour"], "allocate_tasks": [True, False],
+                     "dirt_threshold": [5, 10]}
+    assert _parse_space(["dirt_threshold=5:20"], ranges=True) == {"dirt_threshold": (5, 20)}
+
+
+@pytest.mark.parametrize("entry", ["dirt_threshold=five", "no_such_field=1", "strategy"])
+def test_bad_entries_raise_value_error(entry):
+    with pytest.raises(ValueError):
+        _parse_space([entry])
@@ -0,0 +1,94 @@
+import itertools
+import time
+
+import numpy as np
+import pytest
+
+from planning import GridMap, Planner
+from tour import TourPlanner, improve, nearest_neighbour, path_length
+
+
+def euclidean(points):
+    return np.sqrt(((points[:, None] - points[None]) ** 2).sum(axis=-1))
+
+
+def manhattan(points):
+    return np.abs(points[:, None] - points[None]).sum(axis=-1).astype(float)
+
+
+def neighbourhood(order):
+    """Every order one 2-opt reversal or Or-opt segment move away."""
+    path = [0] + list(order)
+    n = len(path)
+    for i in range(1, n - 1):
+        for j in range(i + 1, n):
+            yield path[1:i] + path[i:j + 1][::-1] + path[j + 1:]
+    for length in range(1, 4):
+        for i in range(1, n - length + 1):
+            segment = path[i:i + length]
+            rest = path[:i] + path[i + length:]
+            for k in range(len(rest)):
+                for moved in (segment, segment[::-1]):
+                    yield (rest[:k + 1] + moved + rest[k + 1:])[1:]
+
+
+def instances():
+    rng = np.random.default_rng(9)
+    for size in (2, 3, 5, 8, 12, 30):
+        yield euclidean(rng.uniform(0, 100, (size, 2)))
+        yield manhattan(rng.integers(0, 6, (size, 2)))
+
+
+@pytest.mark.parametrize("dist", list(instances()), ids=lambda d: f"n{len(d)}")
+def test_improve_reaches_a_local_optimum(dist):
+    start = nearest_neighbour(dist)
+    order = improve(dist, start, time.perf_counter() + 10)
+    assert sorted(order) == list(range(1, len(dist)))
+    length = path_length(dist, order)
+    assert length <= path_length(dist, start) + 1e-9
+    for other in neighbourhood(order):
+        assert path_length(dist, other) >= length - 1e-9
+
+
+@pytest.mark.parametrize("dist", [d for d in instances() if len(d) <= 8], ids=lambda d: f"n{len(d)}")
+def test_improve_is_close_to_the_optimum(dist):
+    optimum = min(path_length(dist, p) for p in itertools.permutations(range(1, len(dist))))
+    order = improve(dist, nearest_neighbour(dist), time.perf_counter() + 10)
+    length = path_length(dist, order)
+    assert optimum - 1e-9 <= length <= 1.25 * optimum + 1e-9
+
+
+def test_improve_stops_at_the_deadline():
+    dist = euclidean(np.random.default_rng(10).uniform(0, 100, (40, 2)))
+    start = nearest_neighbour(dist)
+    assert improve(dist, start, time.perf_counter() - 1) == start
+
+
+@pytest.fixture
+def planner():
+    grid_map = GridMap.with_border(12, 10)
+    wall = np.zeros((12, 10), dtype=bool)
+    wall[5, :8] = True
+    # walls in cell (9, 3) so nobody can reach it
+    wall[[9, 10, 9, 8], [2, 3, 4, 3]] = True
+    grid_map.set_blocked(wall)
+    return Planner(grid_map)
+
+
+def test_tour_planner_plans_and_updates(planner):
+    tours = TourPlanner(planner, time_budget=1.0)
+    start = (1, 1)
+    cells = [(2, 7), (7, 1), (9, 3), (3, 3), (10, 8), (7, 6), (2, 2)]
+    planned = list(tours.plan(start, cells))
+    assert sorted(planned) == sorted(set(cells) - {(9, 3)})
+    dist = planner.distance_matrix([start] + planned)
+    assert tours.length(start) == path_length(dist, range(1, len(planned) + 1))
+
+    remaining = [cell for cell in planned if cell not in {(3, 3), (10, 8)}] + [(9, 3)]
+    kept = [cell for cell in planned if cell in remaining]
+    start = kept[0]
+    updated = list(tours.update(start, remaining))
+    assert sorted(updated) == sorted(kept)
+    dist = planner.distance_matrix([start] + kept)
+    assert tours.length(start) <= path_length(dist, range(1, len(kept) + 1))
+    assert tours.updates == 2
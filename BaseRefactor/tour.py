@@ -0,0 +1,245 @@
+import time
+
+import numpy as np
+
+# Stand-in for unreachable legs, so tour lengths stay comparable
+UNREACHABLE_COST = 1e6
+
+
+def path_length(dist, order):
+    """
+    Args:
+        dist (numpy.ndarray): A (n, n) distance matrix; node 0 is the start.
+        order (list): The other nodes in visiting order.
+
+    Returns:
+        float: Length of the open path from node 0 through `order`.
+    """
+    path = [0] + list(order)
+    return float(dist[path[:-1], path[1:]].sum())
+
+
+def nearest_neighbour(dist):
+    """
+    Build a tour by always moving to the nearest unvisited node.
+
+    Args:
+        dist (numpy.ndarray): A (n, n) distance matrix; node 0 is the start.
+
+    Returns:
+        list: Nodes 1..n-1 in visiting order.
+    """
+    n = len(dist)
+    visited = np.zeros(n, dtype=bool)
+    visited[0] = True
+    order, current = [], 0
+    for _ in range(n - 1):
+        current = int(np.argmin(np.where(visited, np.inf, dist[current])))
+        visited[current] = True
+        order.append(current)
+    return order
+
+
+def _two_opt_pass(dist, path, deadline):
+    """Apply improving segment reversals; returns whether any was found."""
+    n = len(path)
+    improved = False
+    for i in range(1, n - 1):
+        if time.perf_counter() > deadline:
+            break
+        a, b = path[i - 1], path[i]
+        ends = np.array(path[i + 1:])
+        # reversing path[i..j] swaps edges (a, b), (c, d) for (a, c), (b, d)
+        after = np.array(path[i + 2:] + [-1])
+        has_after = after >= 0
+        delta = dist[a, ends] - dist[a, b]
+        delta += np.where(has_after, dist[b, after] - dist[ends, after], 0.0)
+        j = int(np.argmin(delta))
+        if delta[j] < -1e-9:
+            j += i + 1
+            path[i:j + 1] = path[i:j + 1][::-1]
+            improved = True
+    return improved
+
+
+def _or_opt_pass(dist, path, deadline, max_segment=3):
+    """Move short segments, possibly reversed, to their best position; returns whether any moved."""
+    improved = False
+    for length in range(1, max_segment + 1):
+        i = 1
+        while i + length <= len(path):
+            if time.perf_counter() > deadline:
+                return improved
+            segment = path[i:i + length]
+            first, last = segment[0], segment[-1]
+            before = path[i - 1]
+            after = path[i + length] if i + length < len(path) else None
+            removal = dist[before, first]
+            if after is not None:
+                removal += dist[last, after] - dist[before, after]
+            rest = path[:i] + path[i + length:]
+            left = np.array(rest)
+            right = np.array(rest[1:] + [-1])
+            has_right = right >= 0
+            old = np.where(has_right, dist[left, right], 0.0)
+            forward = dist[left, first] + np.where(has_right, dist[last, right], 0.0) - old
+            backward = dist[left, last] + np.where(has_right, dist[first, right], 0.0) - old
+            k_forward, k_backward = int(np.argmin(forward)), int(np.argmin(backward))
+            reverse = backward[k_backward] < forward[k_forward]
+            k = k_backward if reverse else k_forward
+            gain = removal - (backward[k] if reverse else forward[k])
+            if gain > 1e-9:
+                path[:] = rest[:k + 1] + (segment[::-1] if reverse else segment) + rest[k + 1:]
+                improved = True
+            else:
+                i += 1
+    return improved
+
+
+def improve(dist, order, deadline):
+    """
+    Improve a tour with 2-opt and Or-opt moves until no move helps or time runs out.
+
+    Args:
+        dist (numpy.ndarray): A (n, n) distance matrix; node 0 is the start.
+        order (list): Nodes 1..n-1 in visiting order.
+        deadline (float): `time.perf_counter()` value to stop at.
+
+    Returns:
+        list: The improved order.
+    """
+    path = [0] + list(order)
+    while time.perf_counter() <= deadline:
+        improved = _two_opt_pass(dist, path, deadline)
+        improved = _or_opt_pass(dist, path, deadline) or improved
+        if not improved:
+            break
+    return path[1:]
+
+
+class TourPlanner:
+    """Orders dirty cells into an open tour from a bot's cell.
+
+    Legs are exact path lengths on the planning grid. A fresh tour is seeded by
+    nearest neighbour, and every tour is improved with 2-opt and Or-opt moves
+    within `time_budget` seconds. When cells empty, `update` drops them and
+    improves the remaining order from where it was instead of starting over.
+    """
+
+    def __init__(self, planner, time_budget=0.005):
+        """
+        Args:
+            planner (Planner): Planner supplying grid distances.
+            time_budget (float): Seconds allowed for improvement per update.
+        """
+        self.planner = planner
+        self.time_budget = time_budget
+        self.cells = []  # the tour, next cell first
+        self.updates = 0
+
+    def _distances(self, start, cells):
+        dist = self.planner.distance_matrix([start] + list(cells))
+        return np.where(np.isfinite(dist), dist, UNREACHABLE_COST)
+
+    def _reachable(self, start, cells):
+        """The cells reachable from `start` and their distance matrix, start first."""
+        dist = self._distances(start, cells)
+        keep = np.flatnonzero(dist[0, 1:] < UNREACHABLE_COST)
+        nodes = np.concatenate([[0], keep + 1])
+        return [cells[i] for i in keep], dist[np.ix_(nodes, nodes)]
+
+    def plan(self, start, cells):
+        """
+        Plan a new tour.
+
+        Args:
+            start (tuple): Grid coordinates (col, row) of the bot.
+            cells (list): Cells to visit; those unreachable from `start` are left out.
+
+        Returns:
+            list: The cells in visiting order.
+        """
+        cells, dist = self._reachable(start, list(cells))
+        order = improve(dist, nearest_neighbour(dist), time.perf_counter() + self.time_budget)
+        self.cells = [cells[node - 1] for node in order]
+        self.updates += 1
+        return self.cells
+
+    def update(self, start, cells):
+        """
+        Re-optimise the tour for a new start and the cells still to visit.
+
+        Cells no longer listed are dropped, the rest keep their order, and any new
+        cells are appended before improvement.
+
+        Args:
+            start (tuple): Grid coordinates (col, row) of the bot.
+            cells (iterable): Cells still to visit; those unreachable from `start` are left out.
+
+        Returns:
+            list: The cells in visiting order.
+        """
+        remaining = set(cells)
+        kept = [cell for cell in self.cells if cell in remaining]
+        kept += sorted(remaining.difference(kept))
+        kept, dist = self._reachable(start, kept)
+        order = improve(dist, list(range(1, len(kept) + 1)), time.perf_counter() + self.time_budget)
+        self.cells = [kept[node - 1] for node in order]
+        self.updates += 1
+        return self.cells
+
+    def length(self, start):
+        """
+        Args:
+            start (tuple): Grid coordinates (col, row) of the bot.
+
+        Returns:
+            float: Number of moves of the current tour from `start`.
+        """
+        dist = self._distances(start, self.cells)
+        return path_length(dist, range(1, len(self.cells) + 1))
+
+
+class TourCursor:
+    """A bot's progress along its dirt tour."""
+
+    def __init__(self, planner):
+        """
+        Args:
+            planner (TourPlanner): The bot's tour planner.
+        """
+        self.planner = planner
+        self.cells = None  # cells the tour was last optimised for
+        self.own = None  # cells this bot was given when the fleet split the dirt
+        self.done = set()  # cells whose remaining dirt could not be reached
+
+    def target_cell(self, start, counts, bot_cells, index):
+        """
+        The next cell of the tour, re-optimising it first if cells have emptied.
+
+        On the first call the dirty cells are split among the fleet, each going to
+        the bot nearest to it; a bot that has emptied its own cells tours all the rest.
+
+        Args:
+            start (tuple): Grid coordinates (col, row) of the bot.
+            counts (CellCounts): Dirt left per cell.
+            bot_cells (list): Grid cells of every bot of the fleet.
+            index (int): This bot's index in `bot_cells`.
+
+        Returns:
+            tuple: The cell to head for, or None if no dirt is left.
+        """
+        cols, rows, _ = counts.nonzero()
+        dirty = set(zip(cols.tolist(), rows.tolist())) - self.done
+        if self.own is None:
+            owners = np.array(bot_cells)
+            self.own = {cell for cell in dirty
+                        if int(np.argmin(np.abs(owners - cell).sum(axis=1))) == index}
+        cells = frozenset(dirty & self.own or dirty)
+        if cells != self.cells:
+            if self.cells is None or not cells <= self.cells:
+                self.planner.plan(start, sorted(cells))
+            else:
+                self.planner.update(start, cells)
+            self.cells = cells
+        return self.planner.cells[0] if self.planner.cells else None
@@ -1,28 +1,32 @@
 import random
 
 from canvas_object import CanvasObject
-from config import Config
+from config import RuntimeConfig
 
 
 class WiFiHub(CanvasObject):
     """WiFi Hub class for network connectivity"""
 
-    def __init__(self, name, x=None, y=None):
+    def __init__(self, name, x=None, y=None, rng=random, config=None):
         """Initialize the WiFi hub
 
         Args:
             name: The name of the WiFi hub
             x: x-coordinate (optional)
             y: y-coordinate (optional)
+            rng: Random number generator for missing coordinates (optional)
+            config: Settings of the run (optional)
         """
+        if config is None:
+            config = RuntimeConfig()
         super().__init__()
         self.name = name
         self.x = x
         self.y = y
         if x is None:
-            self.x = random.randint(Config.WIFI_HUB_X_MIN.value, Config.WIFI_HUB_X_MAX.value)
+            self.x = rng.randint(config.wifi_hub_x_min, config.wifi_hub_x_max)
         if y is None:
-            self.y = random.randint(Config.WIFI_HUB_Y_MIN.value, Config.WIFI_HUB_Y_MAX.value)
+            self.y = rng.randint(config.wifi_hub_y_min, config.wifi_hub_y_max)
 
     def draw(self, canvas):
         """Draw the WiFi hub on the canvas